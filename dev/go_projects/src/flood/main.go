@@ -0,0 +1,12 @@
+package main
+
+import (
+	"fmt"
+	"time"
+)
+
+func main() {
+	for {
+		fmt.Printf("%s request handled\n", time.Now().Format(time.RFC3339Nano))
+	}
+}
@@ -2,6 +2,7 @@ package good
 
 import (
 	"testing"
+	"unicode/utf8"
 )
 
 func TestRuneLen(t *testing.T) {
@@ -22,3 +23,18 @@ func TestRuneLen(t *testing.T) {
 		}
 	}
 }
+
+func BenchmarkRuneLen(b *testing.B) {
+	for i := 0; i < b.N; i++ {
+		RuneLen("résumé – new")
+	}
+}
+
+func FuzzRuneLen(f *testing.F) {
+	f.Add("résumé – new")
+	f.Fuzz(func(t *testing.T, s string) {
+		if RuneLen(s) != utf8.RuneCountInString(s) {
+			t.Errorf("RuneLen(%q) = %d, want %d", s, RuneLen(s), utf8.RuneCountInString(s))
+		}
+	})
+}
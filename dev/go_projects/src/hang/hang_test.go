@@ -0,0 +1,21 @@
+package hang
+
+import (
+	"sync"
+	"testing"
+)
+
+func worker(c chan int, wg *sync.WaitGroup) {
+	defer wg.Done()
+	<-c
+}
+
+func TestHang(t *testing.T) {
+	c := make(chan int)
+	var wg sync.WaitGroup
+	for i := 0; i < 5; i++ {
+		wg.Add(1)
+		go worker(c, &wg)
+	}
+	wg.Wait()
+}
@@ -0,0 +1,13 @@
+package main
+
+import (
+	"fmt"
+	"time"
+)
+
+func main() {
+	for i := 0; i < 10000; i++ {
+		fmt.Printf("%s request handled\n", time.Now().Format(time.RFC3339Nano))
+	}
+	fmt.Println("Done.")
+}
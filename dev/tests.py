@@ -16,12 +16,17 @@ import shellenv
 import package_events
 
 if sys.version_info < (3,):
-    from Queue import Queue
+    from Queue import Queue, Empty
 else:
-    from queue import Queue
+    from queue import Queue, Empty
 
 from .mocks import GolangBuildMock
 
+if sys.version_info < (3,):
+    golang_build = sys.modules['golang_build']
+else:
+    golang_build = sys.modules['Golang Build.golang_build']
+
 
 TEST_GOPATH = path.join(path.dirname(__file__), 'go_projects')
 TEST_GOPATH2 = path.join(path.dirname(__file__), 'go_projects2')
@@ -41,7 +46,7 @@ class GolangBuildTests(unittest.TestCase):
 
     def setUp(self):
         skip_entries = {}
-        skip_entries[TEST_GOPATH] = set(['.git-keep', 'good', 'bad', 'runnable'])
+        skip_entries[TEST_GOPATH] = set(['.git-keep', 'good', 'bad', 'runnable', 'noisy'])
         skip_entries[TEST_GOPATH2] = set(['.git-keep', 'runnable2'])
 
         for gopath in (TEST_GOPATH, TEST_GOPATH2):
@@ -96,6 +101,43 @@ class GolangBuildTests(unittest.TestCase):
             self.assertEqual('success', result)
             self.assertTrue(confirm_user('Did "go build" succeed and print all commands?'))
 
+    def test_build_size_report(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'runnable', 'main.go')
+
+        with GolangBuildMock(sublime_settings={'build:size_report': True}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build')
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user(
+                'Were the largest packages in the "runnable" binary displayed, with runtime first?'
+            ))
+
+    def test_build_output_limit(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        with GolangBuildMock(sublime_settings={'build:flags': ['-v', '-x', '-a'], 'output:max_lines': 20}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build')
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user('Did "go build" succeed and show a note about trimmed lines?'))
+
+            def _open_full_output():
+                sublime.active_window().run_command('golang_build_open_full_output')
+            sublime.set_timeout(_open_full_output, 1)
+
+            time.sleep(0.4)
+            self.assertTrue(confirm_user('Was the full output opened in a new tab?'))
+
     def test_install_flags_from_view_settings(self):
         ensure_not_ui_thread()
 
@@ -138,6 +180,116 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('success', result)
         self.assertTrue(confirm_user('Did "go test" succeed?'))
 
+    def test_test_events(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        events = []
+        subscription = golang_build.subscribe(
+            lambda event_name, payload: events.append((event_name, payload)),
+            ['build_started', 'test_event', 'build_complete'],
+            ['test']
+        )
+        try:
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'test'})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('success', result)
+            time.sleep(0.2)
+        finally:
+            golang_build.unsubscribe(subscription)
+
+        self.assertEqual('build_started', events[0][0])
+        self.assertEqual('build_complete', events[-1][0])
+        self.assertEqual('test', events[-1][1].task)
+        if sys.platform != 'win32':
+            self.assertTrue(events[-1][1].resources.max_rss > 0)
+        test_events = [(payload.action, payload.test) for name, payload in events if name == 'test_event']
+        self.assertIn(('run', 'TestRuneLen'), test_events)
+        self.assertIn(('pass', 'TestRuneLen'), test_events)
+
+    def test_flaky(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len_test.go')
+
+        with GolangBuildMock(sublime_settings={'flaky:count': 8, 'flaky:shuffle': True}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'flaky'})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue, timeout=30)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user('Did all 8 runs pass, with the spread of their durations displayed?'))
+
+    def test_fuzz(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len_test.go')
+
+        with GolangBuildMock(sublime_settings={'fuzz:time': '5s'}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'fuzz'})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue, timeout=60)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user('Were the FuzzRuneLen executions shown in the status bar and summarized?'))
+
+    def test_test_watchdog(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'hang', 'hang_test.go')
+
+        with GolangBuildMock(sublime_settings={'test:idle_timeout': 3}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'test', 'flags': ['-v']})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue, timeout=30)
+            self.assertEqual('error', result)
+            self.assertTrue(confirm_user(
+                'Was a goroutine summary displayed, with 5 goroutines blocked in hang.worker?'
+            ))
+
+    def test_startup_report(self):
+        ensure_not_ui_thread()
+
+        sublime.set_timeout(lambda: sublime.active_window().run_command('golang_build_startup_report'), 1)
+        time.sleep(0.5)
+        self.assertTrue(confirm_user(
+            'Did a tab open showing the module initialization time and dependency import times?'
+        ))
+
+    def test_memory_report(self):
+        ensure_not_ui_thread()
+
+        sublime.set_timeout(lambda: sublime.active_window().run_command('golang_build_memory_report'), 1)
+        time.sleep(0.5)
+        self.assertTrue(confirm_user('Did a tab open showing the windows, processes, queued output and threads?'))
+
+    def test_job(self):
+        ensure_not_ui_thread()
+
+        jobs = []
+        for _ in range(3):
+            job = golang_build.start_job(
+                sublime.active_window(),
+                ['test', '-v'],
+                path.join(TEST_GOPATH, 'src', 'good')
+            )
+            self.assertNotEqual(None, job)
+            jobs.append(job)
+
+        for job in jobs:
+            self.assertEqual('success', job.wait(10))
+            self.assertEqual(0, job.exit_code)
+            self.assertIn('--- PASS: TestRuneLen', '\n'.join(job.lines()))
+            self.assertIn(('pass', 'TestRuneLen'), [(event.action, event.test) for event in job.test_events()])
+
     def test_run(self):
         ensure_not_ui_thread()
 
@@ -151,6 +303,106 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('success', result)
         self.assertTrue(confirm_user('Did "go run" succeed?'))
 
+    def test_run_cache(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'runnable', 'main.go')
+
+        with GolangBuildMock(sublime_settings={'run:cache': True}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'run'})
+
+            for _ in range(2):
+                result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+                result = wait_build(result_queue)
+                self.assertEqual('success', result)
+                # Allow the first run to execute the binary once it is built
+                time.sleep(1)
+            self.assertTrue(confirm_user(
+                'Was "Hello, world." printed by the cached binary, without running "go build"?'
+            ))
+
+    def test_run_reload(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'runnable', 'main.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'run_reload'})
+
+        def _save(view, result_queue):
+            view.run_command('save')
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue)
+        self.assertEqual('success', result)
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _save)
+        result = wait_build(result_queue, timeout=10)
+        self.assertEqual('success', result)
+        self.assertTrue(confirm_user('Was "Hello, world." printed twice, followed by "version 2 ready"?'))
+
+        sublime.set_timeout(lambda: sublime.active_window().run_command('golang_build_cancel'), 1)
+
+    def test_run_reload_watch(self):
+        ensure_not_ui_thread()
+
+        package_dir = path.join(TEST_GOPATH, 'src', 'runnable')
+        file_path = path.join(package_dir, 'main.go')
+        gitignore_path = path.join(package_dir, '.gitignore')
+        ignored_dir = path.join(package_dir, 'ignored')
+        vendor_dir = path.join(package_dir, 'vendor', 'example.com', 'lib')
+
+        with open(gitignore_path, 'wb') as f:
+            f.write(b'ignored/\n')
+
+        try:
+            with GolangBuildMock(sublime_settings={'run:reload_watch': True}):
+                def _run_build(view, result_queue):
+                    view.window().run_command('golang_build', {'task': 'run_reload'})
+
+                def _save(view, result_queue):
+                    view.run_command('save')
+
+                result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+                result = wait_build(result_queue)
+                self.assertEqual('success', result)
+
+                # Changes to ignored and vendored files must not rebuild
+                os.makedirs(ignored_dir)
+                os.makedirs(vendor_dir)
+                for dir_path in [ignored_dir, vendor_dir]:
+                    with open(path.join(dir_path, 'lib.go'), 'wb') as f:
+                        f.write(b'package lib\n')
+                self.assertRaises(Empty, wait_build, Queue(), 3)
+
+                result_queue = open_file(file_path, VIEW_SETTINGS, _save)
+                result = wait_build(result_queue, timeout=10)
+                self.assertEqual('success', result)
+                self.assertTrue(confirm_user(
+                    'Was "version 2 ready" printed once, after the save and not after the ignored files were written?'
+                ))
+
+                sublime.set_timeout(lambda: sublime.active_window().run_command('golang_build_cancel'), 1)
+        finally:
+            os.remove(gitignore_path)
+            shutil.rmtree(ignored_dir, True)
+            shutil.rmtree(path.join(package_dir, 'vendor'), True)
+
+    def test_run_fold_repeats(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'noisy', 'main.go')
+
+        with GolangBuildMock(sublime_settings={'output:fold_repeats': True, 'output:max_lines_per_second': 100}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build', {'task': 'run'})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user('Did "go run" succeed with the repeated lines folded into a count?'))
+
     def test_run_with_file_path_flag_absolute(self):
         ensure_not_ui_thread()
 
@@ -200,6 +452,76 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('success', result)
         self.assertTrue(confirm_user('Did "go run" succeed for runnable2/main.go?'))
 
+    def test_cover(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'cover'})
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue)
+        self.assertEqual('success', result)
+
+        time.sleep(0.4)
+        self.assertTrue(confirm_user('Was 100% coverage reported and the body of RuneLen highlighted as covered?'))
+
+    def test_bench(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'bench'})
+
+        for _ in range(2):
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue, timeout=30)
+            self.assertEqual('success', result)
+        self.assertTrue(confirm_user('Did the benchmarks run and display a comparison to the first run?'))
+
+    def test_profile_cpu(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'profile_cpu', 'flags': ['-v', '-bench', '.']})
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue, timeout=30)
+        self.assertEqual('success', result)
+        self.assertTrue(confirm_user('Were the top CPU profile entries displayed, with RuneLen among them?'))
+
+    def test_profile_build(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'profile_build', 'flags': ['-v', '-a']})
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue, timeout=120)
+        self.assertEqual('success', result)
+        self.assertTrue(confirm_user('Were the slowest actions and the critical path, ending with "good", displayed?'))
+
+    def test_optimizations(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'runnable', 'main.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'optimizations'})
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue)
+        self.assertEqual('success', result)
+
+        time.sleep(0.4)
+        self.assertTrue(confirm_user('Were lines 5 and 6 of main.go marked with optimization icons?'))
+
     def test_install(self):
         ensure_not_ui_thread()
 
@@ -293,6 +615,60 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('success', result)
         self.assertTrue(confirm_user('Did "go get" succeed for "github.com/golang/example/hello"?'))
 
+    def test_get_urls(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build_get', {'urls': [
+                'github.com/golang/example/hello',
+                'github.com/golang/example/stringutil'
+            ]})
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue, timeout=30)
+        self.assertEqual('success', result)
+        self.assertTrue(confirm_user('Were both packages fetched, with a line for each and a summary?'))
+
+    def test_get_mirror_offline(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _update_mirror(view, result_queue):
+            view.window().run_command('golang_build_mirror_update')
+
+        open_file(file_path, VIEW_SETTINGS, _update_mirror)
+        self.assertTrue(confirm_user('Did the status bar report that the module mirror was updated?'))
+
+        with GolangBuildMock(sublime_settings={'mirror:use': 'offline'}):
+            def _run_build(view, result_queue):
+                view.window().run_command('golang_build_get', {'url': 'github.com/golang/example/hello'})
+
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('success', result)
+            self.assertTrue(confirm_user('Did "go get" succeed using only the module mirror?'))
+
+    def test_cache_trim(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'good', 'rune_len.go')
+
+        def _report(view, result_queue):
+            view.window().run_command('golang_build_cache_report')
+
+        open_file(file_path, VIEW_SETTINGS, _report)
+        self.assertTrue(confirm_user('Did a tab open with the size and age of GOCACHE and GOMODCACHE?'))
+
+        with GolangBuildMock(sublime_settings={'cache:gocache_size': 1, 'cache:modcache_size': 1}):
+            def _trim(view, result_queue):
+                view.window().run_command('golang_build_cache_trim')
+
+            open_file(file_path, VIEW_SETTINGS, _trim)
+            self.assertTrue(confirm_user('Did the status bar report the number of entries trimmed from each cache?'))
+
     def test_terminal(self):
         ensure_not_ui_thread()
 
@@ -317,6 +693,44 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('error', result)
         self.assertTrue(confirm_user('Did "go build" fail?'))
 
+    def test_build_bad_annotations(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'bad', 'hello.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build')
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue)
+        self.assertEqual('error', result)
+
+        time.sleep(0.4)
+        self.assertTrue(confirm_user('Was line 4 of hello.go marked with an error icon?'))
+
+        def _next_error():
+            sublime.active_window().run_command('golang_build_next_error')
+        sublime.set_timeout(_next_error, 1)
+
+        time.sleep(0.4)
+        self.assertTrue(confirm_user('Was the cursor moved to line 4 of hello.go?'))
+
+    def test_build_bad_twice(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'bad', 'hello.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build')
+
+        for _ in range(2):
+            result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+            result = wait_build(result_queue)
+            self.assertEqual('error', result)
+        self.assertTrue(confirm_user(
+            'Did "go build" fail with a summary of 0 new, 0 fixed and 1 unchanged diagnostics?'
+        ))
+
     def test_build_cancel(self):
         ensure_not_ui_thread()
 
@@ -340,6 +754,43 @@ class GolangBuildTests(unittest.TestCase):
         self.assertEqual('cancelled', result)
         self.assertTrue(confirm_user('Was "go build" successfully cancelled?'))
 
+    def test_run_cancel_discards_output(self):
+        ensure_not_ui_thread()
+
+        file_path = path.join(TEST_GOPATH, 'src', 'flood', 'main.go')
+
+        def _run_build(view, result_queue):
+            view.window().run_command('golang_build', {'task': 'run'})
+
+            # Cancel once the program's output starts arriving, while most of
+            # it is still waiting to be written to the panel
+            def _cancel_build():
+                panel = view.window().find_output_panel('golang_build')
+                if panel is None or 'request handled' not in panel.substr(sublime.Region(0, panel.size())):
+                    sublime.set_timeout(_cancel_build, 10)
+                    return
+                view.window().run_command('golang_build_cancel')
+
+            sublime.set_timeout(_cancel_build, 10)
+
+        result_queue = open_file(file_path, VIEW_SETTINGS, _run_build)
+        result = wait_build(result_queue, timeout=10)
+        self.assertEqual('cancelled', result)
+
+        sizes = []
+
+        def _panel_size():
+            sizes.append(sublime.active_window().find_output_panel('golang_build').size())
+
+        sublime.set_timeout(_panel_size, 1)
+        time.sleep(1.0)
+        sublime.set_timeout(_panel_size, 1)
+        time.sleep(0.2)
+        self.assertEqual(sizes[0], sizes[1])
+        self.assertTrue(confirm_user(
+            'Did the panel stop filling at once and show "Cancelled: N bytes of output discarded"?'
+        ))
+
     def test_build_reopen(self):
         ensure_not_ui_thread()
 
@@ -1,16 +1,34 @@
 # coding: utf-8
 from __future__ import unicode_literals, division, absolute_import, print_function
 
-import sys
-import os
-import threading
-import subprocess
 import time
-import re
-import textwrap
-import collections
 
-import signal
+# The time the module started loading, before the other imports, so that the
+# startup report includes their cost
+_MODULE_STARTED = time.time()
+
+import sys  # noqa: E402
+import os  # noqa: E402
+import threading  # noqa: E402
+import subprocess  # noqa: E402
+import re  # noqa: E402
+import textwrap  # noqa: E402
+import collections  # noqa: E402
+import tempfile  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import hashlib  # noqa: E402
+import math  # noqa: E402
+import shutil  # noqa: E402
+import calendar  # noqa: E402
+import socket  # noqa: E402
+import fnmatch  # noqa: E402
+import struct  # noqa: E402
+import select  # noqa: E402
+import errno  # noqa: E402
+import traceback  # noqa: E402
+
+import signal  # noqa: E402
 
 if sys.version_info < (3,):
     import Queue as queue
@@ -19,13 +37,51 @@ else:
     import queue
     str_cls = str
 
-import sublime
-import sublime_plugin
+import sublime  # noqa: E402
+import sublime_plugin  # noqa: E402
 
-import shellenv
-import golangconfig
-import newterm
-import package_events
+# A dict of unicode string dependency names to floats of the number of seconds
+# their import took, populated as each is first used
+_IMPORT_TIMES = {}
+
+# A float of the number of seconds the module took to initialize, including
+# the standard library imports. Set by the last statement of the module.
+_MODULE_INITIALIZED = None
+
+
+class _LazyModule():
+
+    """
+    Stands in for a dependency, importing it the first time one of its
+    attributes is used, so that Sublime Text does not pay for the import at
+    startup if no build is run
+    """
+
+    def __init__(self, name):
+        """
+        :param name:
+            A unicode string of the name of the module to import
+        """
+
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, name):
+        module = self._module
+        if module is None:
+            start = time.time()
+            __import__(self._name)
+            module = sys.modules[self._name]
+            if self._name not in _IMPORT_TIMES:
+                _IMPORT_TIMES[self._name] = time.time() - start
+            self._module = module
+        return getattr(module, name)
+
+
+shellenv = _LazyModule('shellenv')
+golangconfig = _LazyModule('golangconfig')
+newterm = _LazyModule('newterm')
+package_events = _LazyModule('package_events')
 
 
 # A list of the environment variables to pull from settings when creating a
@@ -44,10 +100,157 @@ GO_ENV_VARS = set([
     'GORACE',
 ])
 
+# Regular expressions used by GolangOutputFilter() to detect lines with
+# file positions and numbers that may vary between repeated lines
+_POSITION_RE = re.compile('\\.go:\\d+')
+_NUMBER_RE = re.compile('0x[0-9a-fA-F]+|\\d+')
+
+# A regular expression to parse diagnostics with a file position from build,
+# vet and test output
+_DIAGNOSTIC_RE = re.compile('^\\s*((?:[a-zA-Z]:)?[^\\s:][^:]*\\.go):(\\d+):(?:(\\d+):)?(.*)$')
+
+# A regular expression to remove line and column numbers from diagnostic
+# messages when comparing them between builds
+_LINE_NUMBER_RE = re.compile(':\\d+(:\\d+)?')
+
+# Flags, the HTML template and support detection for annotations in views
+_ANNOTATION_FLAGS = getattr(sublime, 'DRAW_NO_FILL', 0) | getattr(sublime, 'DRAW_NO_OUTLINE', 0)
+_PHANTOMS_SUPPORTED = hasattr(sublime, 'Phantom')
+_PHANTOM_TEMPLATE = '''
+    <body id="golang-build">
+        <div style="padding: 0.2rem 0.5rem; border-left: 2px solid color(var(--%s));">%s</div>
+    </body>
+'''
+
+# References to any existing GolangDiagnostics() for a sublime.Window.id(),
+# and sublime.PhantomSet() objects for (sublime.View.id(), key) tuples
+_DIAGNOSTICS = {}
+_PHANTOM_SETS = {}
+
+# References to any existing GolangCoverage() and GolangOptimizations() for
+# a sublime.Window.id()
+_COVERAGE = {}
+_OPTIMIZATIONS = {}
+
+# A regular expression to find the compiler optimization decisions to display
+_OPTIMIZATION_RE = re.compile('escapes to heap|moved to heap|can inline')
+
+# The diagnostics from the last completed run of a (task, working dir) tuple
+# in a sublime.Window.id(), used to determine which diagnostics are new.
+# Values are dicts with tuple keys and values that are two-element tuples of
+# the GolangDiagnosticParser() current and current_descriptions attributes.
+_DIAGNOSTIC_HISTORY = {}
+
+# Regular expressions to parse a line of "go test -bench" results and the
+# measurements in it
+_BENCHMARK_RE = re.compile('^(Benchmark\\S+)\\s+\\d+\\s+(.*)$')
+_BENCHMARK_MEASUREMENT_RE = re.compile('([0-9.]+(?:e[+-]?[0-9]+)?) (\\S+)')
+
+# The profiling tasks, mapped to the "go test" flag, the profile name and the
+# pprof sample index to display
+_PROFILE_TASKS = {
+    'profile_cpu': ('-cpuprofile', 'cpu', None),
+    'profile_mem': ('-memprofile', 'mem', 'alloc_space'),
+    'profile_block': ('-blockprofile', 'block', None),
+    'profile_mutex': ('-mutexprofile', 'mutex', None),
+}
+
+# A regular expression to parse an entry from "go tool pprof -top -lines"
+_PPROF_LINE_RE = re.compile(
+    '^\\s*(\\S+\\s+\\S+%\\s+\\S+%\\s+\\S+\\s+\\S+%)'
+    '\\s+(.+?)\\s+(\\S+\\.go):(\\d+)(?:\\s+\\(inline\\))?$'
+)
+
+# A regular expression to parse a block from a coverage profile
+_COVER_LINE_RE = re.compile('^(.+):(\\d+)\\.(\\d+),(\\d+)\\.(\\d+) (\\d+) (\\d+)\\s*$')
+
+# The number of compile times stored per package for "profile_build"
+_BUILD_TIMES_KEPT = 20
+
+# Flags of "go build" that do not take a value
+_BOOLEAN_BUILD_FLAGS = set([
+    'a', 'asan', 'cover', 'i', 'linkshared', 'modcacherw', 'msan', 'n', 'race',
+    'trimpath', 'v', 'work', 'x', 'buildvcs'
+])
+
+# The number of runs of benchmark results stored per directory
+_BENCHMARK_RUNS_KEPT = 50
+
+# The 97.5th percentile of the Student's t-distribution for 1 to 30 degrees
+# of freedom, used for 95% confidence intervals
+_T_DISTRIBUTION_975 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+# The key of the stored benchmark results the user selected to compare
+# against. Keys are sublime.Window.id() and values are dicts mapping working
+# directories to the key.
+_BENCHMARK_BASELINES = {}
+
+# The tasks that run "go test", and so have their output parsed for
+# "test_event" events
+_TEST_TASKS = set(['test', 'cover', 'bench', 'profile_cpu', 'profile_mem', 'profile_block', 'profile_mutex'])
+
+# Regular expressions for the output of "go test -v"
+_TEST_RUN_RE = re.compile('^=== RUN\\s+(\\S+)')
+_TEST_RESULT_RE = re.compile('^\\s*--- (PASS|FAIL|SKIP): (\\S+)(?: \\(([0-9.]+)s\\))?')
+_PACKAGE_RESULT_RE = re.compile('^(ok|FAIL)\\s+(\\S+)\\s+(?:([0-9.]+)s|\\(cached\\))')
+
+# Matches the name of a function or method declaration
+_FUNCTION_RE = re.compile('^func\\s+(?:\\([^)]*\\)\\s*)?(\\w+)', re.M)
+
+# Matches the seed a test binary prints when run with -test.shuffle=on
+_SHUFFLE_SEED_RE = re.compile('^-test\\.shuffle (\\d+)$', re.M)
+
+# Regular expressions for the output of "go test -fuzz"
+_FUZZ_TARGET_RE = re.compile('^func (Fuzz\\w*)\\(\\w+ \\*testing\\.F\\)', re.M)
+_FUZZ_STATS_RE = re.compile(
+    '^fuzz: elapsed: \\S+, execs: (\\d+) \\((\\d+)/sec\\), '
+    'new interesting: (\\d+) \\(total: (\\d+)\\)'
+)
+_FUZZ_WORKERS_RE = re.compile('now fuzzing with (\\d+) workers')
+_FUZZ_INPUT_RE = re.compile('Failing input written to (\\S+)')
+_FUZZ_FRAME_RE = re.compile('^\\s+(\\S+\\.go):(\\d+) \\+0x', re.M)
+
+# Regular expressions for the goroutine dump a Go program prints on SIGQUIT
+_GOROUTINE_RE = re.compile('^goroutine \\d+(?: [^\\[]*)? \\[([^\\]]*)\\]:$')
+_GOROUTINE_FUNCTION_RE = re.compile('^(.+?)(?:\\([^()]*\\))?(?: in goroutine \\d+)?$')
+_GOROUTINE_LOCATION_RE = re.compile('^\\t(.+?:\\d+)(?: \\+0x[0-9a-f]+)?')
+
+# The number of seconds the watchdog waits for a process to exit after
+# requesting a goroutine dump, before killing the process group
+_WATCHDOG_GRACE = 10
+
 # References to any existing GolangProcess() for a sublime.Window.id(). For
 # basic get and set operations, the dict is threadsafe.
 _PROCS = {}
 
+# A dict with keys of sublime.Window.id() and values of the GolangReloader()
+# for the "run_reload" task
+_RELOADERS = {}
+
+# A dict with keys of unicode string module directories that "go mod
+# download" is running in, and boolean values of if go.mod has been saved
+# since it started
+_PREFETCHES = {}
+_PREFETCH_LOCK = threading.Lock()
+
+# Prevents the usage file of the module mirror from being updated by more
+# than one thread at once
+_MIRROR_LOCK = threading.Lock()
+
+# Prevents more than one update of the module mirror from running at once,
+# while still letting builds record usage during an update
+_MIRROR_UPDATE_LOCK = threading.Lock()
+
+# An integer of the number of go tool invocations the package has started
+# that have not yet exited, used to only trim the go caches while nothing uses
+# them. Programs being run are not counted.
+_SUBPROCESSES = 0
+_SUBPROCESSES_LOCK = threading.Lock()
+
 # References to any existing GolangPanel() for a sublime.Window.id(). For
 # basic get and set operations, the dict is threadsafe.
 _PANELS = {}
@@ -66,8 +269,10 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
         command palette or sublime.Window.run_command()
 
         :param task:
-            A unicode string of "build", "test", "install", "clean"
-            or "cross_compile"
+            A unicode string of "build", "run", "run_reload", "test", "flaky",
+            "fuzz", "bench", "cover", "profile_cpu", "profile_mem", "profile_block", "profile_mutex",
+            "profile_build", "optimizations", "install", "clean" or
+            "cross_compile"
 
         :param flags:
             A list of unicode strings of flags to send to the command-line go
@@ -96,7 +301,7 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
 
         if flags is None:
             flags, _ = golangconfig.setting_value(
-                '%s:flags' % task,
+                '%s:flags' % ('run' if task == 'run_reload' else task),
                 view=self.window.active_view(),
                 window=self.window
             )
@@ -104,7 +309,10 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
         if flags is None:
             flags = ['-v']
 
-        if task == 'run':
+        _apply_mirror(self.window, env, working_dir)
+        _CACHE_TRIMMER.schedule(self.window, go_bin, env)
+
+        if task in set(['run', 'run_reload']):
             # Allow the user to set a file path into the flags settings,
             # thus requiring that the flags be checked to ensure a second
             # filename is not added
@@ -141,6 +349,139 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
             if not found_filename:
                 flags.append(self.window.active_view().file_name())
 
+        if task == 'run':
+            cache, _ = golangconfig.setting_value(
+                'run:cache',
+                view=self.window.active_view(),
+                window=self.window
+            )
+            if cache:
+                _task_run_cached(self.window, go_bin, flags, working_dir, env)
+                return
+
+        if task == 'run_reload':
+            _task_run_reload(self.window, go_bin, flags, working_dir, env)
+            return
+
+        if task == 'flaky':
+            _task_flaky(self.window, go_bin, flags, working_dir, env)
+            return
+
+        if task == 'fuzz':
+            _task_fuzz(self.window, go_bin, flags, working_dir, env)
+            return
+
+        if task == 'bench':
+            count = _positive_int_setting('bench:count', self.window) or 5
+            baseline = _BENCHMARK_BASELINES.get(self.window.id(), {}).get(working_dir)
+            if baseline is None:
+                baseline, _ = golangconfig.setting_value(
+                    'bench:baseline',
+                    view=self.window.active_view(),
+                    window=self.window
+                )
+
+            args = [go_bin, 'test', '-run', '^$', '-bench', '.', '-benchmem', '-count', str_cls(count)]
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            proc = _run_process(
+                task,
+                self.window,
+                args,
+                working_dir,
+                env,
+                [GolangBenchmarkHandler(baseline)]
+            )
+            _set_proc(self.window, proc)
+            return
+
+        if task in _PROFILE_TASKS:
+            profile_flag, profile_name, sample_index = _PROFILE_TASKS[task]
+            profile_dir = _new_profile_dir(profile_name, self.window)
+            binary_path = os.path.join(profile_dir, 'pkg.test')
+            if sys.platform == 'win32':
+                binary_path += '.exe'
+            profile_path = os.path.join(profile_dir, '%s.pprof' % profile_name)
+
+            args = [go_bin, 'test', '-o', binary_path, profile_flag, profile_path]
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            handler = GolangProfileHandler(
+                go_bin,
+                binary_path,
+                profile_path,
+                sample_index,
+                _positive_int_setting('profile:top', self.window) or 20
+            )
+            proc = _run_process(
+                task,
+                self.window,
+                args,
+                working_dir,
+                env,
+                [handler]
+            )
+            _set_proc(self.window, proc)
+            return
+
+        if task == 'profile_build':
+            graph_path = os.path.join(_new_profile_dir('build', self.window), 'actiongraph.json')
+            args = [go_bin, 'build', '-debug-actiongraph=%s' % graph_path]
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            handler = GolangActionGraphHandler(
+                graph_path,
+                _positive_int_setting('profile:top', self.window) or 20
+            )
+            proc = _run_process(
+                task,
+                self.window,
+                args,
+                working_dir,
+                env,
+                [handler]
+            )
+            _set_proc(self.window, proc)
+            return
+
+        if task == 'optimizations':
+            args = [go_bin, 'build', '-gcflags', '-m -m', '-o', os.devnull]
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            proc = _run_process(
+                task,
+                self.window,
+                args,
+                working_dir,
+                env,
+                [GolangOptimizationHandler(_get_optimizations(self.window), working_dir)],
+                index_diagnostics=False
+            )
+            _set_proc(self.window, proc)
+            return
+
+        if task == 'cover':
+            profile_path = os.path.join(_new_profile_dir('cover', self.window), 'cover.out')
+            merge, _ = golangconfig.setting_value(
+                'cover:merge',
+                view=self.window.active_view(),
+                window=self.window
+            )
+
+            args = [go_bin, 'test', '-coverprofile', profile_path]
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            proc = _run_process(
+                task,
+                self.window,
+                args,
+                working_dir,
+                env,
+                [GolangCoverageHandler(_get_coverage(self.window), profile_path, bool(merge))]
+            )
+            _set_proc(self.window, proc)
+            return
+
         if task == 'cross_compile':
             _task_cross_compile(
                 self,
@@ -151,6 +492,16 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
             )
             return
 
+        handlers = None
+        if task in set(['build', 'install']):
+            size_report, _ = golangconfig.setting_value(
+                '%s:size_report' % task,
+                view=self.window.active_view(),
+                window=self.window
+            )
+            if size_report:
+                handlers = [GolangBinarySizeHandler(go_bin, task, flags)]
+
         args = [go_bin, task]
         if flags and isinstance(flags, list):
             args.extend(flags)
@@ -159,23 +510,28 @@ class GolangBuildCommand(sublime_plugin.WindowCommand):
             self.window,
             args,
             working_dir,
-            env
+            env,
+            handlers
         )
         _set_proc(self.window, proc)
 
 
-def _task_cross_compile(command, go_bin, flags, working_dir, env):
+def _task_run_cached(window, go_bin, flags, working_dir, env):
     """
-    Prompts the user to select the OS and ARCH to use for a cross-compile
+    Runs a program by building it into the run cache, keyed by a fingerprint
+    of its sources, build flags and environment, and then executing the
+    binary. When the sources have not changed, the cached binary is executed
+    without invoking the go tool to compile or link.
 
-    :param command:
-        A sublime_plugin.WindowCommand object
+    :param window:
+        A sublime.Window object of the window to display the output panel in
 
     :param go_bin:
         A unicode string with the path to the "go" executable
 
     :param flags:
-        A list of unicode string of flags to pass to the "go" executable
+        A list of unicode string of flags, files and program arguments, as
+        would be passed to "go run"
 
     :param working_dir:
         A unicode string with the working directory for the "go" executable
@@ -184,740 +540,5586 @@ def _task_cross_compile(command, go_bin, flags, working_dir, env):
         A dict of environment variables to use with the "go" executable
     """
 
-    valid_combinations = [
-        ('darwin', '386'),
-        ('darwin', 'amd64'),
-        ('darwin', 'arm'),
-        ('darwin', 'arm64'),
-        ('dragonfly', 'amd64'),
-        ('freebsd', '386'),
-        ('freebsd', 'amd64'),
-        ('freebsd', 'arm'),
-        ('linux', '386'),
-        ('linux', 'amd64'),
-        ('linux', 'arm'),
-        ('linux', 'arm64'),
-        ('linux', 'ppc64'),
-        ('linux', 'ppc64le'),
-        ('netbsd', '386'),
-        ('netbsd', 'amd64'),
-        ('netbsd', 'arm'),
-        ('openbsd', '386'),
-        ('openbsd', 'amd64'),
-        ('openbsd', 'arm'),
-        ('plan9', '386'),
-        ('plan9', 'amd64'),
-        ('solaris', 'amd64'),
-        ('windows', '386'),
-        ('windows', 'amd64'),
-    ]
+    target = _split_run_flags(flags, working_dir)
+    if target is None:
+        proc = _run_process('run', window, [go_bin, 'run'] + flags, working_dir, env)
+        _set_proc(window, proc)
+        return
+    options, sources, arguments, name = target
 
-    def on_done(index):
-        """
-        Processes the user's input and launch the build process
+    budget = (_positive_int_setting('run:cache_size', window) or 500) * 1024 * 1024
 
-        :param index:
-            The index of the option the user selected, or -1 if cancelled
+    # Fingerprinting reads every source file, so the window is marked as
+    # running a build until the real process is started
+    pending = GolangPendingProcess([go_bin, 'run'] + flags, working_dir, env, 'run')
+    _set_proc(window, pending)
+
+    def start(key):
+        """
+        Builds or runs the program, unless it was cancelled while being
+        fingerprinted
         """
 
-        if index == -1:
+        if pending.finished or _get_proc(window) is not pending:
             return
 
-        env['GOOS'], env['GOARCH'] = valid_combinations[index]
+        if key is None:
+            _set_proc(window, _run_process('run', window, [go_bin, 'run'] + flags, working_dir, env))
+            return
 
-        args = [go_bin, 'build']
-        if flags and isinstance(flags, list):
-            args.extend(flags)
-        proc = _run_process(
-            'cross_compile',
-            command.window,
-            args,
-            working_dir,
-            env
+        cache_dir = _data_dir('run-cache')
+        binary_path = os.path.join(cache_dir, key, name)
+
+        if os.path.exists(binary_path):
+            # The modification time of the entry tracks its last use
+            os.utime(os.path.dirname(binary_path), None)
+            _set_proc(window, _run_process('run', window, [binary_path] + arguments, working_dir, env))
+            return
+
+        temp_dir = tempfile.mkdtemp(prefix='%s-' % key, dir=cache_dir)
+        handler = GolangRunCacheHandler(
+            window,
+            os.path.join(temp_dir, name),
+            binary_path,
+            arguments,
+            budget
         )
-        _set_proc(command.window, proc)
+        args = [go_bin, 'build', '-o', handler.temp_path] + options + sources
+        _set_proc(window, _run_process('run', window, args, working_dir, env, [handler]))
 
-    quick_panel_options = []
-    for os_, arch in valid_combinations:
-        quick_panel_options.append('OS: %s, ARCH: %s' % (os_, arch))
+    def fingerprint():
+        """
+        Determines the fingerprint of the program and then builds or runs it
 
-    command.window.show_quick_panel(
-        quick_panel_options,
-        on_done
-    )
+        RUNS IN A THREAD
+        """
 
+        key = _run_fingerprint(go_bin, options, sources, working_dir, env)
+        sublime.set_timeout(lambda: start(key), 1)
+
+    thread = threading.Thread(target=fingerprint)
+    thread.start()
 
-class GolangBuildCancelCommand(sublime_plugin.WindowCommand):
+
+class GolangPendingProcess():
 
     """
-    Terminates any existing "go" process that is running for the current window
+    Has the same attributes as GolangProcess(), and stands in for one while
+    the work needed before starting it is done in a thread, so that other
+    builds see the window as busy and may cancel it
     """
 
-    def run(self):
-        proc = _get_proc(self.window)
-        if proc and not proc.finished:
-            proc.terminate()
-        if proc is not None:
-            _set_proc(self.window, None)
+    # A unicode string of the build task the process will be for
+    task = None
 
-    def is_enabled(self):
-        proc = _get_proc(self.window)
-        if not proc:
-            return False
-        return not proc.finished
+    # A float of the unix timestamp of when the work was started
+    started = None
 
+    # A list of strings of the process path and arguments
+    args = None
 
-class GolangBuildReopenCommand(sublime_plugin.WindowCommand):
+    # A unicode string of the working directory of the process
+    cwd = None
 
-    """
-    Reopens the output from the last build command
-    """
+    # A dict of the env the process will be passed
+    env = None
 
-    def run(self):
-        self.window.run_command('show_panel', {'panel': 'output.golang_build'})
+    # Always None, since no subprocess has been started
+    proc = None
 
+    # A queue.Queue object, which is always empty
+    output = None
 
-class GolangBuildGetCommand(sublime_plugin.WindowCommand):
+    # None, or "cancelled" once terminated
+    result = None
 
-    """
-    Prompts the use to enter the URL of a Go package to get
-    """
+    # Always None
+    returncode = None
+
+    # False until terminated, then a float of the unix timestamp
+    finished = False
 
-    def run(self, url=None, flags=None):
+    def __init__(self, args, cwd, env, task):
         """
-        Runs the "golang_build_get" command - invoked by Sublime Text via the
-        command palette or sublime.Window.run_command()
+        :param args:
+            A list of strings of the process path and arguments
 
-        :param url:
-            A unicode string of the URL to download, instead of prompting the
-            user
+        :param cwd:
+            A unicode string of the working directory
 
-        :param flags:
-            A list of unicode strings of flags to send to the command-line go
-            tool. Execute "go help" on the command line to learn about available
-            flags.
+        :param env:
+            A dict of the environment variables for the process
+
+        :param task:
+            A unicode string of the build task the process will be for
         """
 
-        if _yield_to_running_build(self.window):
-            return
+        self.task = task
+        self.args = args
+        self.cwd = cwd
+        self.env = env
+        self.output = queue.Queue()
+        self.started = time.time()
 
-        working_dir = _determine_working_dir(self.window)
-        if working_dir is None:
-            return
+    def terminate(self):
+        """
+        Prevents the process from being started
+        """
 
-        go_bin, env = _get_config(
-            'go',
-            set(['GOPATH']),
-            GO_ENV_VARS - set(['GOPATH']),
-            view=self.window.active_view(),
-            window=self.window,
-        )
-        if (go_bin, env) == (None, None):
-            return
+        self.result = 'cancelled'
+        self.finished = time.time()
 
-        if flags is None:
-            flags, _ = golangconfig.setting_value(
-                'get:flags',
-                view=self.window.active_view(),
-                window=self.window
-            )
 
-        if flags is None:
-            flags = ['-v']
+def _split_run_flags(flags, working_dir):
+    """
+    Splits the flags for "go run" into build flags, the files or package to
+    build and the arguments for the program
 
-        def on_done(get_url):
-            """
-            Processes the user's input and launches the "go get" command
+    :param flags:
+        A list of unicode string of flags, files and program arguments, as
+        would be passed to "go run"
 
-            :param get_url:
-                A unicode string of the URL to get
-            """
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
 
-            args = [go_bin, 'get']
-            if flags and isinstance(flags, list):
-                args.extend(flags)
-            args.append(get_url)
-            proc = _run_process(
-                'get',
-                self.window,
-                args,
-                working_dir,
-                env
-            )
-            _set_proc(self.window, proc)
+    :return:
+        None if no files or package were found, otherwise a four-element
+        tuple of (list of unicode string build flags, list of unicode string
+        files or package, list of unicode string program arguments, unicode
+        string file name for the binary)
+    """
 
-        if url is not None:
-            on_done(url)
-            return
+    options, _, remaining = _split_build_flags(flags)
+    if not remaining:
+        return None
 
-        self.window.show_input_panel(
-            'go get',
-            '',
-            on_done,
-            None,
-            None
-        )
+    if remaining[0].endswith('.go'):
+        sources = []
+        for argument in remaining:
+            if not argument.endswith('.go'):
+                break
+            sources.append(argument)
+    else:
+        sources = remaining[:1]
+    arguments = remaining[len(sources):]
 
+    name = os.path.basename(sources[0].rstrip('/\\'))
+    if name.endswith('.go'):
+        name = name[:-3]
+    if not name or name == '.':
+        name = os.path.basename(working_dir)
+    if sys.platform == 'win32':
+        name += '.exe'
 
-class GolangBuildTerminalCommand(sublime_plugin.WindowCommand):
+    return (options, sources, arguments, name)
 
+
+def _task_run_reload(window, go_bin, flags, working_dir, env):
     """
-    Opens a terminal for the user to the directory containing the open file,
-    setting any necessary environment variables
-    """
+    Runs a program, and rebuilds and restarts it whenever a Go file is saved
 
-    def run(self):
-        """
-        Runs the "golang_build_terminal" command - invoked by Sublime Text via
-        the command palette or sublime.Window.run_command()
-        """
+    :param window:
+        A sublime.Window object of the window to display the output panel in
 
-        working_dir = _determine_working_dir(self.window)
-        if working_dir is None:
-            return
+    :param go_bin:
+        A unicode string with the path to the "go" executable
 
-        relevant_sources = set([
-            'project file',
-            'project file (os-specific)',
-            'golang.sublime-settings',
-            'golang.sublime-settings (os-specific)'
-        ])
+    :param flags:
+        A list of unicode string of flags, files and program arguments, as
+        would be passed to "go run"
 
-        env_overrides = {}
-        for var_name in GO_ENV_VARS:
-            value, source = golangconfig.setting_value(var_name, window=self.window)
-            # Only set overrides that are not coming from the user's shell
-            if source in relevant_sources:
-                env_overrides[var_name] = value
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
 
-        # Get the PATH from the shell environment and then prepend any custom
-        # value so the user's terminal searches all locations
-        value, source = golangconfig.setting_value('PATH', window=self.window)
-        if source in relevant_sources:
-            shell, env = shellenv.get_env()
-            env_overrides['PATH'] = value + os.pathsep + env.get('PATH', '')
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
 
-        newterm.launch_terminal(working_dir, env=env_overrides)
+    target = _split_run_flags(flags, working_dir)
+    if target is None:
+        proc = _run_process('run', window, [go_bin, 'run'] + flags, working_dir, env)
+        _set_proc(window, proc)
+        return
+
+    _stop_reloader(window)
+    watch, _ = golangconfig.setting_value(
+        'run:reload_watch',
+        view=window.active_view(),
+        window=window
+    )
+    reloader = GolangReloader(
+        window,
+        go_bin,
+        target,
+        working_dir,
+        env,
+        _positive_int_setting('run:reload_port', window),
+        bool(watch)
+    )
+    _RELOADERS[window.id()] = reloader
+    window.run_command('show_panel', {'panel': 'output.golang_build'})
+    reloader.rebuild(time.time())
 
 
-def _yield_to_running_build(window):
+def _stop_reloader(window):
     """
-    Check if a build is already running, and if so, allow the user to stop it,
-    or cancel the new build
+    Stops the GolangReloader() for a window, if there is one
 
     :param window:
-        A sublime.Window of the window the build is being run in
-
-    :return:
-        A boolean - if the new build should be abandoned
+        A sublime.Window object
     """
 
-    proc = _get_proc(window)
-    if proc and not proc.finished:
-        message = _format_message("""
-            Golang Build
-
-            There is already a build running. Would you like to stop it?
-        """)
-        if not sublime.ok_cancel_dialog(message, 'Stop Running Build'):
-            return True
-        proc.terminate()
-        _set_proc(window, None)
+    reloader = _RELOADERS.pop(window.id(), None)
+    if reloader:
+        reloader.stop()
 
-    return False
 
+class GolangReloader():
 
-def _determine_working_dir(window):
     """
-    Determine the working directory for a command based on the user's open file
-    or open folders
+    Keeps a program running, rebuilding it in the background when a Go file
+    is saved. The running version is only replaced once a build succeeds.
+    """
 
-    :param window:
-        The sublime.Window object of the window the command was run on
+    # A sublime.Window object of the window the program is run for
+    window = None
 
-    :return:
-        A unicode string of the working directory, or None if no working
-        directory was found
-    """
+    # A unicode string with the path to the "go" executable
+    go_bin = None
 
-    view = window.active_view()
-    working_dir = None
+    # Lists of unicode strings of the build flags, the files or package to
+    # build and the arguments for the program
+    options = None
+    sources = None
+    arguments = None
 
-    # If a file is open, get the folder from the file, and error if the file
-    # has not been saved yet
-    if view:
-        if view.file_name():
-            working_dir = os.path.dirname(view.file_name())
+    # A unicode string of the file name for the binary
+    name = None
 
-    # If no file is open, then get the list of folders and grab the first one
-    else:
-        folders = window.folders()
-        if len(folders) > 0:
-            working_dir = folders[0]
+    # A unicode string of the working directory and a dict of the environment
+    # variables for the build and the program
+    cwd = None
+    env = None
 
-    if working_dir is None or not os.path.exists(working_dir):
-        message = _format_message("""
-            Golang Build
+    # None or an integer of a local TCP port that the program listens on once
+    # it is ready
+    port = None
 
-            No files or folders are open, or the open file or folder does not exist on disk
-        """)
-        sublime.error_message(message)
-        return None
+    # A unicode string of the directory binaries are built into
+    build_dir = None
 
-    return working_dir
+    # None or a GolangWatcher() of the working directory, used instead of
+    # save events to trigger builds
+    watcher = None
+
+    # None or the GolangProcess() of the running version of the program
+    proc = None
 
+    # A boolean - if the reloader has been stopped
+    stopped = False
 
-def _get_config(executable_name, required_vars, optional_vars=None, view=None, window=None):
-    """
-    :param executable_name:
-        A unicode string of the executable to locate, e.g. "go" or "gofmt"
+    # A threading.Lock() protecting _building and _pending
+    _lock = None
 
-    :param required_vars:
-        A list of unicode strings of the environment variables that are
-        required, e.g. "GOPATH". Obtains values from setting_value().
+    # A boolean - if a build is in progress
+    _building = False
 
-    :param optional_vars:
-        A list of unicode strings of the environment variables that are
-        optional, but should be pulled from setting_value() if available - e.g.
-        "GOOS", "GOARCH". Obtains values from setting_value().
+    # None or a float of the unix timestamp of the earliest save that
+    # happened during the current build
+    _pending = None
 
-    :param view:
-        A sublime.View object to use in finding project-specific settings. This
-        should be passed whenever available.
+    # An integer of the number of builds started
+    _generation = 0
 
-    :param window:
-        A sublime.Window object to use in finding project-specific settings.
-        This will only work for Sublime Text 3, and should only be passed if
-        no sublime.View object is available to pass via the view parameter.
+    def __init__(self, window, go_bin, target, cwd, env, port=None, watch=False):
+        """
+        :param window:
+            A sublime.Window object of the window the program is run for
 
-    :return:
-        A two-element tuple.
+        :param go_bin:
+            A unicode string with the path to the "go" executable
 
-        If there was an error finding the executable or required vars:
+        :param target:
+            A tuple in the format returned by _split_run_flags()
 
-         - [0] None
-         - [1] None
+        :param cwd:
+            A unicode string of the working directory for the build
 
-        Otherwise:
+        :param env:
+            A dict of environment variables for the build and program
 
-         - [0] A string of the path to the executable
-         - [1] A dict of environment variables for the executable
-    """
+        :param port:
+            None or an integer of a local TCP port to wait for connections on
+            before the program is considered ready
 
-    try:
-        return golangconfig.subprocess_info(
-            executable_name,
-            required_vars,
-            optional_vars,
-            view=view,
-            window=window
-        )
+        :param watch:
+            If the working directory should be watched for changes, instead
+            of relying on files being saved in Sublime Text
+        """
 
-    except (golangconfig.ExecutableError) as e:
-        error_message = '''
-            Golang Build
+        self.window = window
+        self.go_bin = go_bin
+        self.options, self.sources, self.arguments, self.name = target
+        self.cwd = cwd
+        self.env = env
+        self.port = port
+        self.build_dir = tempfile.mkdtemp(dir=_data_dir('reload'))
+        self._lock = threading.Lock()
 
-            The %s executable could not be found. Please ensure it is
-            installed and available via your PATH.
+        if watch:
+            self.watcher = GolangWatcher(cwd, self._on_change)
+            self.watcher.start()
 
-            Would you like to view documentation for setting a custom PATH?
-        '''
+    def _on_change(self, files, packages, first_change):
+        """
+        Rebuilds the program when the GolangWatcher() reports a change to a
+        Go file or the module definition
 
-        prompt = error_message % e.name
+        :param files:
+            A set of unicode string paths of the files that changed
 
-        if sublime.ok_cancel_dialog(_format_message(prompt), 'Open Documentation'):
-            window.run_command(
-                'open_url',
-                {'url': 'https://github.com/golang/sublime-build/blob/master/docs/configuration.md'}
-            )
+        :param packages:
+            A set of unicode string paths of the package directories that had
+            a .go file change
 
-    except (golangconfig.EnvVarError) as e:
-        error_message = '''
-            Golang Build
+        :param first_change:
+            A float of the unix timestamp of the first change
+        """
 
-            The setting%s %s could not be found in your Sublime Text
-            settings or your shell environment.
+        if packages or [path for path in files if os.path.basename(path) in set(['go.mod', 'go.sum'])]:
+            self.rebuild(first_change)
 
-            Would you like to view the configuration documentation?
-        '''
+    def rebuild(self, saved):
+        """
+        Starts a build in the background, or queues one if a build is running
 
-        plural = 's' if len(e.missing) > 1 else ''
-        setting_names = ', '.join(e.missing)
-        prompt = error_message % (plural, setting_names)
+        :param saved:
+            A float of the unix timestamp of the save that triggered the build
+        """
 
-        if sublime.ok_cancel_dialog(_format_message(prompt), 'Open Documentation'):
-            window.run_command(
-                'open_url',
-                {'url': 'https://github.com/golang/sublime-build/blob/master/docs/configuration.md'}
-            )
+        self._lock.acquire()
+        try:
+            if self.stopped:
+                return
+            if self._building:
+                if self._pending is None:
+                    self._pending = saved
+                return
+            self._building = True
+        finally:
+            self._lock.release()
 
-    return (None, None)
+        thread = threading.Thread(target=self._build, args=(saved,))
+        thread.start()
 
+    def stop(self):
+        """
+        Stops the running program and removes the built binaries
+        """
 
-class GolangProcess():
+        self._lock.acquire()
+        try:
+            self.stopped = True
+            proc = self.proc
+            if self.watcher:
+                self.watcher.stop()
+        finally:
+            self._lock.release()
+        if proc and not proc.finished:
+            proc.terminate()
+        if not self._building:
+            shutil.rmtree(self.build_dir, True)
 
-    """
-    A wrapper around subprocess.Popen() that provides information about how
-    the process was started and finished, plus a queue.Queue of output
-    """
+    def _build(self, saved):
+        """
+        Builds the program and swaps it in, repeating while saves happened
+        during the build
 
-    # A float of the unix timestamp of when the process was started
-    started = None
+        RUNS IN A THREAD
 
-    # A list of strings (unicode for Python 3, byte string for Python 2) of
-    # the process path and any arguments passed to it
-    args = None
+        :param saved:
+            A float of the unix timestamp of the save that triggered the build
+        """
 
-    # A unicode string of the process working directory
-    cwd = None
+        panel = _get_panel(self.window)
+        while True:
+            self._generation += 1
+            binary_path = os.path.join(self.build_dir, '%d-%s' % (self._generation, self.name))
+            returncode, output = _run_capture(
+                [self.go_bin, 'build', '-o', binary_path] + self.options + self.sources,
+                self.cwd,
+                self.env,
+                merge_stderr=True
+            )
 
-    # A dict of the env passed to the process
-    env = None
+            if self.stopped:
+                break
 
-    # A subprocess.Popen() object of the running process
-    proc = None
+            # The diagnostics depend on view settings, so are updated in
+            # the UI thread
+            sublime.set_timeout(
+                lambda returncode=returncode, output=output: self._update_diagnostics(returncode, output),
+                1
+            )
+            if returncode != 0:
+                status = 'build failed'
+                if self.proc and not self.proc.finished:
+                    status += ', the previous version is still running'
+                panel.write('> Reload: %s\n%s' % (status, output), content_separator='\n')
+                sublime.set_timeout(lambda: sublime.status_message('Golang Build: reload failed'), 1)
+            else:
+                self._swap(binary_path, saved)
 
-    # A queue.Queue object of output from the process
-    output = None
+            self._lock.acquire()
+            try:
+                if self._pending is None or self.stopped:
+                    self._building = False
+                    break
+                saved = self._pending
+                self._pending = None
+            finally:
+                self._lock.release()
 
-    # The result of the process, a unicode string of "cancelled", "success" or "error"
-    result = None
+        if self.stopped:
+            shutil.rmtree(self.build_dir, True)
 
-    # A float of the unix timestamp of when the process ended
-    finished = None
+    def _update_diagnostics(self, returncode, output):
+        """
+        Replaces the diagnostics of the window with those from a build
 
-    # A threading.Lock() used to prevent the stdout and stderr handlers from
-    # both trying to perform process cleanup at the same time
-    _cleanup_lock = None
+        :param returncode:
+            An integer of the exit code of "go build"
 
-    def __init__(self, args, cwd, env):
+        :param output:
+            A unicode string of the output of "go build"
         """
-        :param args:
-            A list of strings (unicode for Python 3, byte string for Python 2)
-            of the process path and any arguments passed to it
 
-        :param cwd:
-            A unicode string of the working directory for the process
+        diagnostics = _get_diagnostics(self.window)
+        diagnostics.clear()
+        if returncode != 0:
+            parser = GolangDiagnosticParser(diagnostics, self.cwd)
+            parser.feed(output)
+            parser.flush()
 
-        :param env:
-            A dict of strings (unicode for Python 3, byte string for Python 2)
-            to pass to the process as the environment variables
+    def _swap(self, binary_path, saved):
         """
+        Replaces the running program with a newly-built binary and waits for
+        it to become ready
 
-        self.args = args
-        self.cwd = cwd
-        self.env = env
+        RUNS IN A THREAD
 
-        startupinfo = None
-        preexec_fn = None
-        if sys.platform == 'win32':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        else:
-            # On posix platforms we create a new process group by executing
-            # os.setsid() after the fork before the go binary is executed. This
-            # allows us to use os.killpg() to kill the whole process group.
-            preexec_fn = os.setsid
+        :param binary_path:
+            A unicode string of the path to the new binary
 
-        self._cleanup_lock = threading.Lock()
-        self.started = time.time()
-        self.proc = subprocess.Popen(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=cwd,
-            env=env,
-            startupinfo=startupinfo,
-            preexec_fn=preexec_fn
-        )
-        self.finished = False
+        :param saved:
+            A float of the unix timestamp of the save that triggered the build
+        """
 
-        self.output = queue.Queue()
+        old_proc = self.proc
+        if old_proc and not old_proc.finished:
+            old_proc.terminate()
+            # The new version may need the port the old one was listening on
+            deadline = time.time() + 5
+            while not old_proc.finished and time.time() < deadline:
+                time.sleep(0.05)
+
+        started = threading.Event()
+
+        def start():
+            self._lock.acquire()
+            try:
+                self.proc = None
+                if not self.stopped:
+                    self.proc = _run_process(
+                        'run',
+                        self.window,
+                        [binary_path] + self.arguments,
+                        self.cwd,
+                        self.env,
+                        index_diagnostics=False
+                    )
+                    _set_proc(self.window, self.proc)
+            finally:
+                self._lock.release()
+                # Set even if the process could not be started, so the build
+                # thread does not wait forever
+                started.set()
+
+        sublime.set_timeout(start, 1)
+        started.wait()
+
+        proc = self.proc
+        if self.stopped:
+            return
+        if proc is None:
+            message = 'version %d could not be started' % self._generation
+            _get_panel(self.window).write('> Reload: %s\n' % message, content_separator='\n')
+            sublime.set_timeout(lambda: sublime.status_message('Golang Build: ' + message), 1)
+            return
 
-        self._stdout_thread = threading.Thread(
-            target=self._read_output,
-            args=(
-                self.output,
-                self.proc.stdout.fileno(),
-                'stdout'
-            )
-        )
-        self._stdout_thread.start()
+        for file_name in os.listdir(self.build_dir):
+            if os.path.join(self.build_dir, file_name) != binary_path:
+                try:
+                    os.remove(os.path.join(self.build_dir, file_name))
+                except (OSError):
+                    # Windows does not allow removing a running executable
+                    pass
+
+        ready = True
+        if self.port:
+            ready = _wait_for_port(self.port, proc, 30)
+
+        if ready:
+            message = 'version %d ready %0.3fs after save' % (self._generation, time.time() - saved)
+        elif proc.finished:
+            message = 'version %d exited before it was ready' % self._generation
+        else:
+            message = 'version %d is not listening on port %d' % (self._generation, self.port)
+        _get_panel(self.window).write('> Reload: %s\n' % message, content_separator='\n')
+        sublime.set_timeout(lambda: sublime.status_message('Golang Build: ' + message), 1)
 
-        self._stderr_thread = threading.Thread(
-            target=self._read_output,
-            args=(
-                self.output,
-                self.proc.stderr.fileno(),
-                'stderr'
-            )
-        )
-        self._stderr_thread.start()
 
-        self._cleanup_thread = threading.Thread(target=self._cleanup)
-        self._cleanup_thread.start()
+def _wait_for_port(port, proc, timeout):
+    """
+    Waits for a process to accept connections on a local TCP port
 
-    def wait(self):
-        """
-        Blocks waiting for the subprocess to complete
-        """
+    :param port:
+        An integer of the port number
 
-        self._cleanup_thread.wait()
+    :param proc:
+        The GolangProcess() that should be listening
 
-    def terminate(self):
-        """
-        Terminates the subprocess
-        """
+    :param timeout:
+        A number of seconds to wait
 
-        self._cleanup_lock.acquire()
+    :return:
+        A boolean - if a connection was accepted
+    """
+
+    deadline = time.time() + timeout
+    while time.time() < deadline and not proc.finished:
         try:
-            if not self.proc:
-                return
+            connection = socket.create_connection(('127.0.0.1', port), 0.5)
+            connection.close()
+            return True
+        except (socket.error):
+            time.sleep(0.05)
+    return False
 
-            if sys.platform != 'win32':
-                # On posix platforms we send SIGTERM to the whole process
-                # group to ensure both go and the compiled temporary binary
-                # are killed.
-                os.killpg(os.getpgid(self.proc.pid), signal.SIGTERM)
-            else:
-                # On Windows, there is no API to get the child processes
-                # of a process and send signals to them all. Attempted to use
-                # startupinfo.dwFlags with CREATE_NEW_PROCESS_GROUP and then
-                # calling self.proc.send_signal(signal.CTRL_BREAK_EVENT),
-                # however that did not kill the temporary binary. taskkill is
-                # part of Windows XP and newer, so we use that.
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                kill_proc = subprocess.Popen(
-                    ['taskkill', '/F', '/T', '/PID', str_cls(self.proc.pid)],
-                    startupinfo=startupinfo
-                )
-                kill_proc.wait()
 
-            self.result = 'cancelled'
-            self.finished = time.time()
-            self.proc = None
-        finally:
-            self._cleanup_lock.release()
+class GolangBuildReloadListener(sublime_plugin.EventListener):
 
-    def _read_output(self, output_queue, fileno, output_type):
-        """
-        Handler to process output from stdout/stderr
+    """
+    Rebuilds the program run by the "run_reload" task when a Go file is saved
+    """
 
-        RUNS IN A THREAD
+    def on_post_save(self, view):
+        window = view.window()
+        if not window or window.id() not in _RELOADERS or _RELOADERS[window.id()].watcher:
+            return
+        file_name = os.path.basename(view.file_name() or '')
+        if file_name.endswith('.go') or file_name in set(['go.mod', 'go.sum']):
+            _RELOADERS[window.id()].rebuild(time.time())
 
-        :param output_queue:
-            The queue.Queue object to add the output to
 
-        :param fileno:
-            The fileno to read output from
+class GolangWatcher():
 
-        :param output_type:
-            A unicode string of "stdout" or "stderr"
-        """
+    """
+    Watches a directory tree for changes, using inotify on Linux and
+    otherwise comparing snapshots of file modification times. Directories
+    named "vendor", "testdata" or starting with "." or "_", plus anything
+    excluded by .gitignore files, are not watched. Changes are batched: the
+    callback is called once no changes have happened for the debounce period.
+    """
 
-        while self.proc and self.proc.poll() is None:
-            chunk = os.read(fileno, 32768)
-            if len(chunk) == 0:
-                break
-            output_queue.put((output_type, chunk.decode('utf-8')))
+    # A unicode string of the directory being watched
+    root = None
 
-    def _cleanup(self):
-        """
-        Cleans up the subprocess and marks the state of self appropriately
+    # A callable accepting three arguments: a set of unicode string paths of
+    # the files that changed, a set of unicode string paths of the directories
+    # of Go packages that had a .go file change, and a float of the unix
+    # timestamp of the first change in the batch. Called in the watcher thread.
+    callback = None
 
-        RUNS IN A THREAD
-        """
+    # A float of the number of seconds without changes before a batch of
+    # changes is reported
+    debounce = 0.2
 
-        self._stdout_thread.join()
-        self._stderr_thread.join()
+    # A float of the minimum number of seconds between snapshots when inotify
+    # is not available
+    interval = 1.0
 
-        self._cleanup_lock.acquire()
-        try:
-            if not self.proc:
-                return
-            # Get the returncode to prevent a zombie/defunct child process
-            self.proc.wait()
-            self.result = 'success' if self.proc.returncode == 0 else 'error'
-            self.finished = time.time()
-            self.proc = None
-        finally:
-            self._cleanup_lock.release()
-            self.output.put(('eof', None))
+    # A unicode string of "inotify" or "snapshot"
+    backend = None
 
+    # A threading.Event() that is set when the watcher should stop
+    _stopped = None
 
-class GolangProcessPrinter():
+    # An _IgnoreRules() object of the paths to exclude
+    _ignore = None
 
-    """
-    Describes a Go process, the environment it was started in and its result
-    """
+    def __init__(self, root, callback, debounce=0.2, interval=1.0):
+        """
+        :param root:
+            A unicode string of the directory to watch
 
-    # The GolangProcess() object the printer is displaying output from
-    proc = None
+        :param callback:
+            A callable to pass changes to, see the callback attribute
 
-    # The GolangPanel() object the information is written to
-    panel = None
+        :param debounce:
+            A float of the number of seconds without changes before a batch
+            of changes is reported
 
-    def __init__(self, proc, panel):
+        :param interval:
+            A float of the minimum number of seconds between snapshots when
+            inotify is not available
         """
-        :param proc:
-            A GolangProcess() object
 
-        :param panel:
-            A GolangPanel() object to write information to
+        self.root = os.path.abspath(root)
+        self.callback = callback
+        self.debounce = debounce
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._ignore = _IgnoreRules(self.root)
+
+    def start(self):
+        """
+        Starts watching in a background thread
         """
 
-        self.proc = proc
-        self.panel = panel
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
 
-        self.thread = threading.Thread(
-            target=self._run
-        )
-        self.thread.start()
+    def stop(self):
+        """
+        Stops watching
+        """
+
+        self._stopped.set()
 
     def _run(self):
         """
-        GolangProcess() output queue processor
+        Watches using the best available backend
 
         RUNS IN A THREAD
         """
 
-        self.panel.printer_lock.acquire()
-        self.panel.set_base_dir(self.proc.cwd)
+        result = 'unavailable'
+        if sys.platform.startswith('linux'):
+            try:
+                inotify = _Inotify()
+            except (OSError):
+                inotify = None
+            if inotify:
+                try:
+                    self.backend = 'inotify'
+                    result = self._watch_inotify(inotify)
+                    if result == 'stopped':
+                        return
+                finally:
+                    inotify.close()
+
+        self.backend = 'snapshot'
+        self._watch_snapshots(result == 'lost')
+
+    def _walk(self, start=None):
+        """
+        Yields the directories and files under the root that are not excluded
 
-        try:
-            self._write_header()
+        :param start:
+            None or a unicode string of a directory under the root to walk,
+            instead of the root
 
-            while True:
-                message_type, message = self.proc.output.get()
+        :return:
+            A generator of two-element tuples of (unicode string directory
+            path, list of two-element tuples of (unicode string file path,
+            stat result or None))
+        """
 
-                if message_type == 'eof':
-                    break
+        pending = [start or self.root]
+        while pending:
+            directory = pending.pop()
+            self._ignore.load(directory)
+            files = []
+            try:
+                if hasattr(os, 'scandir'):
+                    for entry in os.scandir(directory):
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self._ignore.excluded(entry.path, True):
+                                pending.append(entry.path)
+                        elif not self._ignore.excluded(entry.path, False):
+                            files.append((entry.path, entry))
+                else:
+                    for name in os.listdir(directory):
+                        path = os.path.join(directory, name)
+                        if os.path.isdir(path) and not os.path.islink(path):
+                            if not self._ignore.excluded(path, True):
+                                pending.append(path)
+                        elif not self._ignore.excluded(path, False):
+                            files.append((path, None))
+            except (OSError):
+                continue
+            yield (directory, files)
+
+    def _snapshot(self):
+        """
+        :return:
+            A dict of unicode string file paths to two-element tuples of
+            (modification time, size)
+        """
 
-                if message_type == 'stdout':
-                    output = message
+        snapshot = {}
+        for _, files in self._walk():
+            for path, entry in files:
+                try:
+                    stat = entry.stat() if entry is not None else os.stat(path)
+                except (OSError):
+                    continue
+                snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def _watch_snapshots(self, lost=False):
+        """
+        Compares snapshots of the tree until stopped. The time between
+        snapshots grows with the time a snapshot takes, so that large trees
+        do not keep a CPU busy.
 
-                if message_type == 'stderr':
-                    output = message
+        :param lost:
+            A boolean - if changes made before the first snapshot may have
+            been missed, in which case every file is reported as changed once
+        """
 
-                self.panel.write(output)
+        start = time.time()
+        previous = self._snapshot()
+        duration = time.time() - start
 
-            self._write_footer()
+        if lost:
+            self._report(set(previous), start)
 
-        finally:
-            self.panel.printer_lock.release()
+        changed = set()
+        first_change = None
+        while True:
+            self._stopped.wait(max(self.interval, duration * 10))
+            if self._stopped.is_set():
+                break
 
-    def _write_header(self):
+            start = time.time()
+            current = self._snapshot()
+            duration = time.time() - start
+
+            new_changes = set()
+            for path in set(current) | set(previous):
+                if current.get(path) != previous.get(path):
+                    new_changes.add(path)
+            previous = current
+
+            # Snapshots are far enough apart to serve as the debounce, so a
+            # batch is reported once a snapshot finds no further changes
+            if new_changes:
+                changed.update(new_changes)
+                if first_change is None:
+                    first_change = start
+                continue
+            if changed:
+                self._report(changed, first_change)
+                changed = set()
+                first_change = None
+
+    def _watch_inotify(self, inotify):
         """
-        Displays startup information about the process
-        """
-
-        title = ''
+        Receives events from inotify until stopped
 
-        env_vars = []
-        for var_name in GO_ENV_VARS:
-            var_key = var_name if sys.version_info >= (3,) else var_name.encode('ascii')
-            if var_key in self.proc.env:
-                value = self.proc.env.get(var_key)
-                if sys.version_info < (3,):
-                    value = value.decode('utf-8')
-                env_vars.append((var_name, value))
-        if env_vars:
-            title += '> Environment:\n'
-            for var_name, value in env_vars:
-                title += '>   %s=%s\n' % (var_name, value)
+        :param inotify:
+            An _Inotify() object
 
-        title += '> Directory: %s\n' % self.proc.cwd
-        title += '> Command: %s\n' % subprocess.list2cmdline(self.proc.args)
-        title += '> Output:\n'
+        :return:
+            A unicode string of "stopped" once stopped, "unavailable" if
+            inotify could not watch the whole tree, or "lost" if events were
+            lost or a new directory could not be watched after starting.
+            Snapshots are used instead unless stopped.
+        """
 
-        self.panel.write(title, content_separator='\n\n')
+        directories = {}
+        changed = set()
+        first_change = None
+
+        def add(directory):
+            for path, files in self._walk(directory):
+                descriptor = inotify.add_watch(path)
+                if descriptor is None:
+                    return False
+                # The directory was removed before it could be watched
+                if descriptor is False:
+                    continue
+                directories[descriptor] = path
+                # Files may be written to a new directory before it is watched
+                if directory != self.root:
+                    changed.update([file_path for file_path, _ in files])
+            return True
 
-    def _write_footer(self):
-        """
-        Displays result information about the process, blocking until the
-        write is completed
+        if not add(self.root):
+            return 'unavailable'
+
+        while not self._stopped.is_set():
+            events = inotify.read(self.debounce if changed else 0.5)
+            if events is None:
+                return 'lost'
+            if not events:
+                if changed:
+                    self._report(changed, first_change)
+                    changed = set()
+                    first_change = None
+                continue
+            if first_change is None:
+                first_change = time.time()
+            for descriptor, mask, name in events:
+                directory = directories.get(descriptor)
+                if directory is None:
+                    continue
+                if mask & _Inotify.IN_IGNORED:
+                    del directories[descriptor]
+                    continue
+                path = os.path.join(directory, name) if name else directory
+                is_dir = bool(mask & _Inotify.IN_ISDIR)
+                if name == '.gitignore':
+                    self._ignore.load(directory, True)
+                if self._ignore.excluded(path, is_dir):
+                    continue
+                if is_dir:
+                    if mask & (_Inotify.IN_CREATE | _Inotify.IN_MOVED_TO) and not add(path):
+                        return 'lost'
+                    continue
+                changed.add(path)
+        return 'stopped'
+
+    def _report(self, changed, first_change):
         """
+        Calls the callback with a batch of changes
 
-        formatted_result = self.proc.result.title()
-        runtime = self.proc.finished - self.proc.started
+        :param changed:
+            A set of unicode string paths of the files that changed
 
-        output = '> Elapsed: %0.3fs\n> Result: %s' % (runtime, formatted_result)
+        :param first_change:
+            A float of the unix timestamp of the first change
+        """
 
-        event = threading.Event()
-        self.panel.write(output, content_separator='\n', event=event)
-        event.wait()
+        packages = set()
+        for path in changed:
+            if path.endswith('.go'):
+                packages.add(os.path.dirname(path))
+        self.callback(changed, packages, first_change)
 
-        package_events.notify(
-            'Golang Build',
-            'build_complete',
-            BuildCompleteEvent(
-                task='',
-                args=list(self.proc.args),
-                working_dir=self.proc.cwd,
-                env=self.proc.env.copy(),
-                runtime=runtime,
-                result=self.proc.result
-            )
-        )
 
+class _IgnoreRules():
 
-BuildCompleteEvent = collections.namedtuple(
-    'BuildCompleteEvent',
-    [
-        'task',
-        'args',
-        'working_dir',
-        'env',
-        'runtime',
-        'result',
-    ]
-)
+    """
+    Decides which paths a GolangWatcher() excludes, using .gitignore files
+    """
 
+    # A unicode string of the directory being watched
+    root = None
 
-class GolangPanel():
+    # A dict of unicode string directory paths to lists of four-element
+    # tuples of (unicode string pattern, negated boolean, directory-only
+    # boolean, anchored boolean) from the .gitignore in the directory
+    _rules = None
 
-    """
-    Holds a reference to an output panel used by the Golang Build package,
-    and provides synchronization features to ensure output is printed in proper
-    order
-    """
+    def __init__(self, root):
+        """
+        :param root:
+            A unicode string of the directory being watched
+        """
 
-    # A sublime.View object of the output panel being printed to
-    panel = None
+        self.root = root
+        self._rules = {}
 
-    # A queue.Queue() that holds all of the info to be written to the panel
-    queue = None
+    def load(self, directory, reload=False):
+        """
+        Reads the .gitignore file in a directory
 
-    # A lock used to ensure only on GolangProcessPrinter() is using the panel
-    # at any given time
-    printer_lock = None
+        :param directory:
+            A unicode string of the directory
 
-    def __init__(self, window):
+        :param reload:
+            If the file should be read even if it was read before
         """
-        :param window:
-            The sublime.Window object the output panel is contained within
+
+        if directory in self._rules and not reload:
+            return
+        rules = []
+        try:
+            with io.open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except (IOError, OSError):
+            lines = []
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            rules.append((line.lstrip('/'), negated, dir_only, anchored))
+        self._rules[directory] = rules
+
+    def excluded(self, path, is_dir):
         """
+        :param path:
+            A unicode string of the path to check
 
-        self.printer_lock = threading.Lock()
-        self.reset(window)
+        :param is_dir:
+            A boolean - if the path is a directory
 
-    def reset(self, window):
+        :return:
+            A boolean - if the path should not be watched
         """
-        Creates a new, fresh output panel and output Queue object
 
-        :param window:
-            The sublime.Window object the output panel is contained within
-        """
+        name = os.path.basename(path)
+        if is_dir and (name in set(['vendor', 'testdata', 'node_modules']) or name[:1] in set(['.', '_'])):
+            return True
 
-        if not isinstance(threading.current_thread(), threading._MainThread):
-            raise RuntimeError('GolangPanel.reset() must be run in the UI thread')
+        excluded = False
+        directory = os.path.dirname(path)
+        ancestors = []
+        while True:
+            ancestors.append(directory)
+            if directory == self.root or len(directory) <= len(self.root):
+                break
+            directory = os.path.dirname(directory)
 
-        self.queue = queue.Queue()
-        self.panel = window.get_output_panel('golang_build')
+        for directory in reversed(ancestors):
+            relative = path[len(directory) + 1:].replace(os.sep, '/')
+            for pattern, negated, dir_only, anchored in self._rules.get(directory, []):
+                if dir_only and not is_dir:
+                    continue
+                if fnmatch.fnmatchcase(relative if anchored else name, pattern):
+                    excluded = not negated
+        return excluded
 
-        st_settings = sublime.load_settings('Preferences.sublime-settings')
-        panel_settings = self.panel.settings()
+
+class _Inotify():
+
+    """
+    A minimal wrapper around the Linux inotify API using ctypes
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    # The events that are watched for
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    # The ctypes module and the ctypes.CDLL() object for libc
+    _ctypes = None
+    _libc = None
+
+    # An integer of the inotify file descriptor
+    _fd = None
+
+    def __init__(self):
+        # Some builds of Sublime Text 2 do not include ctypes
+        try:
+            import ctypes
+            import ctypes.util
+        except (ImportError):
+            raise OSError('ctypes is not available')
+
+        self._ctypes = ctypes
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(self._libc, 'inotify_init'):
+            raise OSError('inotify is not available')
+        self._fd = self._libc.inotify_init()
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+
+    def add_watch(self, path):
+        """
+        :param path:
+            A unicode string of the directory to watch
+
+        :return:
+            None if the watch limit has been reached, False if the path is
+            not a directory or no longer exists, otherwise an integer watch
+            descriptor
+        """
+
+        encoded = path.encode(sys.getfilesystemencoding() or 'utf-8')
+        descriptor = self._libc.inotify_add_watch(self._fd, encoded, self.MASK | self.IN_ONLYDIR)
+        if descriptor < 0:
+            # A directory that was removed before it could be watched is
+            # not an error
+            if self._ctypes.get_errno() in set([errno.ENOENT, errno.ENOTDIR]):
+                return False
+            return None
+        return descriptor
+
+    def read(self, timeout):
+        """
+        Waits for events
+
+        :param timeout:
+            A float of the number of seconds to wait
+
+        :return:
+            None if events were lost, otherwise a list of three-element tuples
+            of (integer watch descriptor, integer mask, unicode string name)
+        """
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        data = os.read(self._fd, 65536)
+        events = []
+        offset = 0
+        while offset + 16 <= len(data):
+            descriptor, mask, _, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\x00')
+            offset += 16 + length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            events.append((
+                descriptor,
+                mask,
+                name.decode(sys.getfilesystemencoding() or 'utf-8', 'replace')
+            ))
+        return events
+
+    def close(self):
+        """
+        Closes the inotify file descriptor, removing all watches
+        """
+
+        os.close(self._fd)
+
+
+def _run_fingerprint(go_bin, options, sources, working_dir, env):
+    """
+    Calculates a fingerprint of the inputs to building a program: the size and
+    modification time of every non-standard-library source file it depends on,
+    the build flags, the environment and the go executable
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param options:
+        A list of unicode string build flags
+
+    :param sources:
+        A list of unicode strings of the .go files or the package to build
+
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+
+    :return:
+        None if the dependencies could not be listed, otherwise a unicode
+        string of the hex fingerprint
+    """
+
+    file_fields = ['GoFiles', 'CgoFiles', 'CFiles', 'CXXFiles', 'HFiles', 'SFiles', 'SysoFiles']
+    template = '{{if not .Standard}}{{.Dir}}%s{{end}}'
+    for fields in [file_fields + ['EmbedFiles'], file_fields]:
+        returncode, output = _run_capture(
+            [go_bin, 'list', '-deps', '-f', template % ''.join(
+                '{{range .%s}}|{{.}}{{end}}' % field for field in fields
+            )] + options + sources,
+            working_dir,
+            env
+        )
+        # Versions of Go before 1.16 do not have the EmbedFiles field
+        if returncode == 0:
+            break
+    if returncode != 0:
+        return None
+
+    hasher = hashlib.sha1()
+    for value in [go_bin, working_dir] + options + sources:
+        hasher.update(value.encode('utf-8') + b'\x00')
+    for key, value in sorted(env.items()):
+        if not isinstance(key, bytes):
+            key = key.encode('utf-8')
+        if not isinstance(value, bytes):
+            value = value.encode('utf-8')
+        hasher.update(key + b'=' + value + b'\x00')
+
+    try:
+        stat = os.stat(go_bin)
+        hasher.update(('%d %r\x00' % (stat.st_size, stat.st_mtime)).encode('utf-8'))
+
+        for line in output.splitlines():
+            parts = line.split('|')
+            for file_name in parts[1:]:
+                file_path = os.path.join(parts[0], file_name)
+                stat = os.stat(file_path)
+                hasher.update(('%s %d %r\x00' % (file_path, stat.st_size, stat.st_mtime)).encode('utf-8'))
+    except (OSError):
+        return None
+
+    return hasher.hexdigest()
+
+
+class GolangRunCacheHandler():
+
+    """
+    A GolangProcessPrinter() handler that, once a program has been built for
+    the run cache, moves the binary into place, evicts the least-recently
+    used binaries and starts the program
+    """
+
+    # A sublime.Window object of the window the build was run for
+    window = None
+
+    # A unicode string of the path "go build" writes the binary to
+    temp_path = None
+
+    # A unicode string of the path of the binary in the run cache
+    binary_path = None
+
+    # A list of unicode strings of arguments for the program
+    arguments = None
+
+    # An integer of the number of bytes the run cache may use
+    budget = None
+
+    def __init__(self, window, temp_path, binary_path, arguments, budget):
+        """
+        :param window:
+            A sublime.Window object of the window the build was run for
+
+        :param temp_path:
+            A unicode string of the path "go build" writes the binary to
+
+        :param binary_path:
+            A unicode string of the path of the binary in the run cache
+
+        :param arguments:
+            A list of unicode strings of arguments for the program
+
+        :param budget:
+            An integer of the number of bytes the run cache may use
+        """
+
+        self.window = window
+        self.temp_path = temp_path
+        self.binary_path = binary_path
+        self.arguments = arguments
+        self.budget = budget
+
+    def feed(self, output):
+        """
+        The output of the build is not used
+
+        :param output:
+            A unicode string of output
+        """
+
+        pass
+
+    def finish(self, proc):
+        """
+        Moves the binary into the cache and starts it. The program's output
+        is written after the footer of the build since this printer holds the
+        panel until it returns.
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            An empty unicode string
+        """
+
+        temp_dir = os.path.dirname(self.temp_path)
+        if proc.result != 'success' or not os.path.exists(self.temp_path):
+            shutil.rmtree(temp_dir, True)
+            return ''
+
+        entry_dir = os.path.dirname(self.binary_path)
+        try:
+            os.rename(temp_dir, entry_dir)
+        except (OSError):
+            # Another build of the same fingerprint finished first
+            shutil.rmtree(temp_dir, True)
+        _evict_run_cache(os.path.dirname(entry_dir), self.budget, entry_dir)
+
+        window = self.window
+        args = [self.binary_path] + self.arguments
+        sublime.set_timeout(lambda: _set_proc(
+            window,
+            _run_process('run', window, args, proc.cwd, proc.env)
+        ), 1)
+        return ''
+
+
+def _evict_run_cache(cache_dir, budget, keep):
+    """
+    Removes the least-recently used entries of the run cache until it is no
+    larger than the budget
+
+    :param cache_dir:
+        A unicode string of the run cache directory
+
+    :param budget:
+        An integer of the number of bytes the run cache may use
+
+    :param keep:
+        A unicode string of the path of an entry that must not be removed
+    """
+
+    entries = []
+    total = 0
+    for entry in os.listdir(cache_dir):
+        entry_path = os.path.join(cache_dir, entry)
+        # Builds in progress are written to a directory with a suffix, and
+        # are only removed if they were abandoned
+        if '-' in entry and os.path.getmtime(entry_path) > time.time() - 3600:
+            continue
+        try:
+            size = 0
+            for file_name in os.listdir(entry_path):
+                size += os.path.getsize(os.path.join(entry_path, file_name))
+            entries.append((os.path.getmtime(entry_path), entry_path, size))
+        except (OSError):
+            continue
+        total += size
+
+    for _, entry_path, size in sorted(entries):
+        if total <= budget:
+            break
+        if entry_path == keep:
+            continue
+        shutil.rmtree(entry_path, True)
+        total -= size
+
+
+def _task_flaky(window, go_bin, flags, working_dir, env):
+    """
+    Runs the test function under the cursor, or all of the tests of the
+    package, a number of times in parallel to determine if they are flaky
+
+    :param window:
+        A sublime.Window object of the window to display the output panel in
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param flags:
+        A list of unicode string of flags for "go test -c"
+
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
+
+    count = _positive_int_setting('flaky:count', window) or 20
+    parallel = _positive_int_setting('flaky:parallel', window)
+    if parallel is None:
+        parallel = _cpu_count()
+
+    build_flags = list(flags) if isinstance(flags, list) else []
+    race, _ = golangconfig.setting_value('flaky:race', view=window.active_view(), window=window)
+    if race and '-race' not in build_flags:
+        build_flags.append('-race')
+
+    test_args = []
+    test_name = _function_at_cursor(window.active_view(), 'Test')
+    if test_name:
+        test_args.extend(['-test.run', '^%s$' % test_name])
+    shuffle, _ = golangconfig.setting_value('flaky:shuffle', view=window.active_view(), window=window)
+    if shuffle:
+        test_args.append('-test.shuffle=on')
+
+    binary_path = os.path.join(tempfile.mkdtemp(prefix='golang-build-flaky-'), 'pkg.test')
+    if sys.platform == 'win32':
+        binary_path += '.exe'
+
+    proc = GolangTestRepeater(go_bin, binary_path, build_flags, test_args, count, parallel, working_dir, env)
+    _print_process(window, proc)
+    _set_proc(window, proc)
+
+
+def _task_fuzz(window, go_bin, flags, working_dir, env):
+    """
+    Fuzzes the fuzz target under the cursor, or all of the fuzz targets of
+    the package at once
+
+    :param window:
+        A sublime.Window object of the window to display the output panel in
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param flags:
+        A list of unicode string of flags for "go test"
+
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
+
+    targets = _fuzz_targets(window.active_view(), working_dir)
+    if not targets:
+        message = _format_message("""
+            Golang Build
+
+            No fuzz targets were found in the _test.go files of %s
+        """)
+        sublime.error_message(message % working_dir)
+        return
+
+    fuzz_time, _ = golangconfig.setting_value('fuzz:time', view=window.active_view(), window=window)
+    workers = _positive_int_setting('fuzz:parallel', window)
+    if workers is None:
+        workers = _cpu_count()
+
+    build_flags = list(flags) if isinstance(flags, list) else []
+
+    proc = GolangFuzzer(go_bin, targets, fuzz_time or '30s', workers, build_flags, working_dir, env)
+    _print_process(window, proc)
+    _set_proc(window, proc)
+
+
+def _task_cross_compile(command, go_bin, flags, working_dir, env):
+    """
+    Prompts the user to select the OS and ARCH to use for a cross-compile
+
+    :param command:
+        A sublime_plugin.WindowCommand object
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param flags:
+        A list of unicode string of flags to pass to the "go" executable
+
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
+
+    valid_combinations = [
+        ('darwin', '386'),
+        ('darwin', 'amd64'),
+        ('darwin', 'arm'),
+        ('darwin', 'arm64'),
+        ('dragonfly', 'amd64'),
+        ('freebsd', '386'),
+        ('freebsd', 'amd64'),
+        ('freebsd', 'arm'),
+        ('linux', '386'),
+        ('linux', 'amd64'),
+        ('linux', 'arm'),
+        ('linux', 'arm64'),
+        ('linux', 'ppc64'),
+        ('linux', 'ppc64le'),
+        ('netbsd', '386'),
+        ('netbsd', 'amd64'),
+        ('netbsd', 'arm'),
+        ('openbsd', '386'),
+        ('openbsd', 'amd64'),
+        ('openbsd', 'arm'),
+        ('plan9', '386'),
+        ('plan9', 'amd64'),
+        ('solaris', 'amd64'),
+        ('windows', '386'),
+        ('windows', 'amd64'),
+    ]
+
+    def on_done(index):
+        """
+        Processes the user's input and launch the build process
+
+        :param index:
+            The index of the option the user selected, or -1 if cancelled
+        """
+
+        if index == -1:
+            return
+
+        env['GOOS'], env['GOARCH'] = valid_combinations[index]
+
+        args = [go_bin, 'build']
+        if flags and isinstance(flags, list):
+            args.extend(flags)
+        proc = _run_process(
+            'cross_compile',
+            command.window,
+            args,
+            working_dir,
+            env
+        )
+        _set_proc(command.window, proc)
+
+    quick_panel_options = []
+    for os_, arch in valid_combinations:
+        quick_panel_options.append('OS: %s, ARCH: %s' % (os_, arch))
+
+    command.window.show_quick_panel(
+        quick_panel_options,
+        on_done
+    )
+
+
+class GolangBuildCancelCommand(sublime_plugin.WindowCommand):
+
+    """
+    Terminates any existing "go" process that is running for the current window
+    """
+
+    def run(self):
+        _stop_reloader(self.window)
+        proc = _get_proc(self.window)
+        if proc and not proc.finished:
+            proc.terminate()
+        if proc is not None:
+            _set_proc(self.window, None)
+
+    def is_enabled(self):
+        if self.window.id() in _RELOADERS:
+            return True
+        proc = _get_proc(self.window)
+        if not proc:
+            return False
+        return not proc.finished
+
+
+class GolangBuildReopenCommand(sublime_plugin.WindowCommand):
+
+    """
+    Reopens the output from the last build command
+    """
+
+    def run(self):
+        self.window.run_command('show_panel', {'panel': 'output.golang_build'})
+
+
+class GolangBuildGetCommand(sublime_plugin.WindowCommand):
+
+    """
+    Prompts the use to enter the URLs of one or more Go packages to get
+    """
+
+    def run(self, url=None, flags=None, urls=None):
+        """
+        Runs the "golang_build_get" command - invoked by Sublime Text via the
+        command palette or sublime.Window.run_command()
+
+        :param url:
+            A unicode string of the URL to download, instead of prompting the
+            user
+
+        :param urls:
+            A list of unicode strings of URLs to download, instead of
+            prompting the user. The URLs are fetched concurrently.
+
+        :param flags:
+            A list of unicode strings of flags to send to the command-line go
+            tool. Execute "go help" on the command line to learn about available
+            flags.
+        """
+
+        if _yield_to_running_build(self.window):
+            return
+
+        working_dir = _determine_working_dir(self.window)
+        if working_dir is None:
+            return
+
+        go_bin, env = _get_config(
+            'go',
+            set(['GOPATH']),
+            GO_ENV_VARS - set(['GOPATH']),
+            view=self.window.active_view(),
+            window=self.window,
+        )
+        if (go_bin, env) == (None, None):
+            return
+
+        if flags is None:
+            flags, _ = golangconfig.setting_value(
+                'get:flags',
+                view=self.window.active_view(),
+                window=self.window
+            )
+
+        if flags is None:
+            flags = ['-v']
+
+        _apply_mirror(self.window, env, working_dir)
+        _CACHE_TRIMMER.schedule(self.window, go_bin, env)
+
+        def on_done(get_url):
+            """
+            Processes the user's input and launches the "go get" command
+
+            :param get_url:
+                A unicode string of one or more URLs to get, separated by
+                whitespace or commas
+            """
+
+            get_urls = [part for part in re.split('[\\s,]+', get_url) if part]
+            if len(get_urls) > 1:
+                _task_get_many(self.window, go_bin, flags, get_urls, working_dir, env)
+                return
+
+            args = [go_bin, 'get']
+            if flags and isinstance(flags, list):
+                args.extend(flags)
+            args.extend(get_urls)
+            proc = _run_process(
+                'get',
+                self.window,
+                args,
+                working_dir,
+                env
+            )
+            _set_proc(self.window, proc)
+
+        if urls:
+            on_done(' '.join(urls))
+            return
+
+        if url is not None:
+            on_done(url)
+            return
+
+        # A project may list the packages it needs, such as tools, so that
+        # they may all be fetched at once
+        initial_urls, _ = golangconfig.setting_value(
+            'get:urls',
+            view=self.window.active_view(),
+            window=self.window
+        )
+
+        self.window.show_input_panel(
+            'go get',
+            ' '.join(initial_urls) if isinstance(initial_urls, list) else '',
+            on_done,
+            None,
+            None
+        )
+
+
+def _task_get_many(window, go_bin, flags, urls, working_dir, env):
+    """
+    Runs "go get" for a number of URLs concurrently
+
+    :param window:
+        A sublime.Window object of the window to display the output panel in
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param flags:
+        A list of unicode string of flags for "go get"
+
+    :param urls:
+        A list of unicode strings of the URLs to get
+
+    :param working_dir:
+        A unicode string with the working directory for the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
+
+    parallel = _positive_int_setting('get:parallel', window) or 4
+
+    go_mod = None
+    module = _find_module(working_dir)
+    if module and _env_value(env, 'GO111MODULE') != 'off':
+        go_mod = os.path.join(module[1], 'go.mod')
+
+    proc = GolangGetGroup(
+        go_bin,
+        list(flags) if isinstance(flags, list) else [],
+        urls,
+        parallel,
+        go_mod,
+        working_dir,
+        env
+    )
+    _print_process(window, proc)
+    _set_proc(window, proc)
+
+
+class GolangBuildPrefetchListener(sublime_plugin.EventListener):
+
+    """
+    Runs "go mod download" in the background when a go.mod file is saved, if
+    the "get:prefetch" setting is enabled
+    """
+
+    def on_post_save(self, view):
+        file_name = view.file_name()
+        if not file_name or os.path.basename(file_name) != 'go.mod':
+            return
+        window = view.window()
+        prefetch, _ = golangconfig.setting_value('get:prefetch', view=view, window=window)
+        if not prefetch:
+            return
+
+        try:
+            go_bin, env = golangconfig.subprocess_info(
+                'go',
+                set([]),
+                GO_ENV_VARS,
+                view=view,
+                window=window
+            )
+        except (golangconfig.ExecutableError, golangconfig.EnvVarError):
+            return
+        _prefetch_modules(go_bin, os.path.dirname(file_name), env)
+
+
+def _prefetch_modules(go_bin, module_dir, env):
+    """
+    Runs "go mod download" for a module in a thread, displaying the result in
+    the status bar. If the module is already being downloaded, it is
+    downloaded again once finished so the latest go.mod is used.
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param module_dir:
+        A unicode string of the directory containing go.mod
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+    """
+
+    _PREFETCH_LOCK.acquire()
+    try:
+        if module_dir in _PREFETCHES:
+            _PREFETCHES[module_dir] = True
+            return
+        _PREFETCHES[module_dir] = False
+    finally:
+        _PREFETCH_LOCK.release()
+
+    def download():
+        """
+        Downloads the modules until go.mod has not been saved again
+
+        RUNS IN A THREAD
+        """
+
+        while True:
+            start = time.time()
+            returncode, output = _run_capture([go_bin, 'mod', 'download'], module_dir, env, merge_stderr=True)
+            if returncode == 0:
+                message = 'downloaded modules in %0.1fs' % (time.time() - start)
+            else:
+                lines = [line for line in output.splitlines() if line.strip()]
+                message = 'go mod download failed: %s' % (lines[-1] if lines else returncode)
+            # The message is bound now, since the loop may replace it before
+            # the callback runs
+            sublime.set_timeout(lambda text=message: sublime.status_message('Golang Build: ' + text), 1)
+
+            _PREFETCH_LOCK.acquire()
+            try:
+                if not _PREFETCHES[module_dir]:
+                    del _PREFETCHES[module_dir]
+                    return
+                _PREFETCHES[module_dir] = False
+            finally:
+                _PREFETCH_LOCK.release()
+
+    thread = threading.Thread(target=download)
+    thread.start()
+
+
+class GolangBuildMirrorUpdateCommand(sublime_plugin.WindowCommand):
+
+    """
+    Copies the modules in the module cache into the local module mirror, and
+    removes modules from the mirror that have not been used recently
+    """
+
+    def run(self):
+        go_bin, env = _get_config(
+            'go',
+            set(['GOPATH']),
+            GO_ENV_VARS - set(['GOPATH']),
+            view=self.window.active_view(),
+            window=self.window,
+        )
+        if (go_bin, env) == (None, None):
+            return
+
+        mirror_dir = _mirror_dir(self.window)
+        max_age = _positive_int_setting('mirror:max_age', self.window) or 90
+
+        def update():
+            """
+            Updates the mirror and displays the result in the status bar
+
+            RUNS IN A THREAD
+            """
+
+            download_dir = os.path.join(_module_cache_dir(go_bin, env), 'cache', 'download')
+            added, added_size, removed = _update_mirror(download_dir, mirror_dir, max_age * 86400)
+            message = 'module mirror updated, %d files (%s) added, %d versions pruned' % (
+                added,
+                _format_bytes(added_size),
+                removed
+            )
+            sublime.set_timeout(lambda: sublime.status_message('Golang Build: ' + message), 1)
+
+        thread = threading.Thread(target=update)
+        thread.start()
+
+
+def _update_mirror(download_dir, mirror_dir, max_age):
+    """
+    Adds the files of the module cache download directory to the mirror, which
+    uses the same layout as a GOPROXY, removes versions that have not been
+    used within max_age and rewrites the version lists. Removed versions are
+    kept in the usage file with a last-used time of None, so they are not
+    added back from the module cache unless a go.sum uses them again.
+
+    :param download_dir:
+        A unicode string of the "cache/download" directory of GOMODCACHE
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+
+    :param max_age:
+        An integer of the number of seconds since a version was last used
+        after which it is removed
+
+    :return:
+        A three-element tuple of (integer number of files added, integer
+        number of bytes added, integer number of versions removed)
+    """
+
+    _MIRROR_UPDATE_LOCK.acquire()
+    try:
+        _MIRROR_LOCK.acquire()
+        try:
+            pruned = set([key for key, last_used in _load_mirror_usage(mirror_dir).items() if last_used is None])
+        finally:
+            _MIRROR_LOCK.release()
+
+        added, added_size, found = _copy_to_mirror(download_dir, mirror_dir, pruned)
+
+        # The usage lock is only held while the usage file is read and
+        # written, so that builds marking versions as used never wait for
+        # copying or removing files
+        now = time.time()
+        stale = []
+        _MIRROR_LOCK.acquire()
+        try:
+            usage = _load_mirror_usage(mirror_dir)
+            for key in found:
+                usage.setdefault(key, now)
+            for key, last_used in list(usage.items()):
+                if last_used is None:
+                    # Once removed from the module cache, a version that is
+                    # downloaded again is treated as new
+                    if key not in found:
+                        del usage[key]
+                elif now - last_used > max_age:
+                    stale.append(key)
+                    usage[key] = None
+            _save_mirror_usage(mirror_dir, usage)
+        finally:
+            _MIRROR_LOCK.release()
+
+        for key in stale:
+            module, version = key.rsplit('@', 1)
+            version_dir = os.path.join(mirror_dir, module.replace('/', os.sep), '@v')
+            for extension in ['.info', '.mod', '.zip']:
+                path = os.path.join(version_dir, version + extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        _write_mirror_lists(mirror_dir)
+        return (added, added_size, len(stale))
+    finally:
+        _MIRROR_UPDATE_LOCK.release()
+
+
+def _copy_to_mirror(download_dir, mirror_dir, pruned):
+    """
+    Hard links or copies the files of the module cache download directory
+    that are missing from the mirror
+
+    :param download_dir:
+        A unicode string of the "cache/download" directory of GOMODCACHE
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+
+    :param pruned:
+        A set of unicode strings of escaped "module@version" that were pruned
+        from the mirror and should not be copied
+
+    :return:
+        A three-element tuple of (integer number of files added, integer
+        number of bytes added, set of unicode strings of escaped
+        "module@version" in the module cache)
+    """
+
+    added = 0
+    added_size = 0
+    found = set()
+
+    for root, dirs, files in os.walk(download_dir):
+        if root == download_dir and 'sumdb' in dirs:
+            dirs.remove('sumdb')
+        if os.path.basename(root) != '@v':
+            continue
+        target_dir = os.path.join(mirror_dir, os.path.relpath(root, download_dir))
+        module = os.path.dirname(os.path.relpath(root, download_dir)).replace(os.sep, '/')
+        for file_name in files:
+            # Lock files, hashes and partially-downloaded files are not
+            # part of the GOPROXY protocol
+            version, extension = os.path.splitext(file_name)
+            if extension not in set(['.info', '.mod', '.zip']):
+                continue
+            key = '%s@%s' % (module, version)
+            found.add(key)
+            if key in pruned:
+                continue
+            source = os.path.join(root, file_name)
+            target = os.path.join(target_dir, file_name)
+            size = os.path.getsize(source)
+            if os.path.exists(target) and os.path.getsize(target) == size:
+                continue
+            if not os.path.exists(target_dir):
+                os.makedirs(target_dir)
+            if os.path.exists(target):
+                os.remove(target)
+            # A hard link shares the data with the module cache, while
+            # remaining after the module cache is cleaned
+            try:
+                os.link(source, target)
+            except (AttributeError, OSError):
+                shutil.copy2(source, target)
+            added += 1
+            added_size += size
+
+    return (added, added_size, found)
+
+
+def _write_mirror_lists(mirror_dir):
+    """
+    Writes the @v/list file of each module in the mirror, and removes the
+    directories of modules with no versions left
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+    """
+
+    for root, dirs, files in os.walk(mirror_dir, topdown=False):
+        if os.path.basename(root) == '@v':
+            versions = sorted(os.path.splitext(name)[0] for name in files if name.endswith('.info'))
+            if not [name for name in files if name != 'list']:
+                shutil.rmtree(root, True)
+                continue
+            with open(os.path.join(root, 'list'), 'wb') as f:
+                f.write(''.join(version + '\n' for version in versions).encode('utf-8'))
+        elif root != mirror_dir and not os.listdir(root):
+            os.rmdir(root)
+
+
+def _apply_mirror(window, env, working_dir):
+    """
+    Points the GOPROXY of an environment at the module mirror if the
+    "mirror:use" setting is enabled, and records the modules required by the
+    current module as used
+
+    :param window:
+        A sublime.Window object to use in finding settings
+
+    :param env:
+        A dict of environment variables to modify
+
+    :param working_dir:
+        A unicode string of the working directory of the command
+    """
+
+    use, _ = golangconfig.setting_value('mirror:use', view=window.active_view(), window=window)
+    if not use:
+        return
+
+    mirror_dir = _mirror_dir(window)
+    if sys.platform == 'win32':
+        url = 'file:///' + mirror_dir.replace('\\', '/')
+    else:
+        url = 'file://' + mirror_dir
+
+    if use == 'offline':
+        # The checksum database can not be reached offline, however go.sum
+        # is still verified for modules it lists
+        _set_env_value(env, 'GOPROXY', url)
+        _set_env_value(env, 'GOSUMDB', 'off')
+    else:
+        proxy = _env_value(env, 'GOPROXY') or 'https://proxy.golang.org,direct'
+        _set_env_value(env, 'GOPROXY', '%s,%s' % (url, proxy))
+
+    flags = _env_value(env, 'GOFLAGS')
+    if '-mod=' not in flags:
+        _set_env_value(env, 'GOFLAGS', (flags + ' -mod=mod').strip())
+
+    module = _find_module(working_dir)
+    if module:
+        # Marking reads go.sum and rewrites the usage file, so is kept off
+        # of the UI thread
+        thread = threading.Thread(
+            target=_mark_mirror_usage,
+            args=(mirror_dir, os.path.join(module[1], 'go.sum'))
+        )
+        thread.daemon = True
+        thread.start()
+
+
+def _mark_mirror_usage(mirror_dir, go_sum):
+    """
+    Records the module versions listed in a go.sum file as used now, so they
+    are not pruned from the mirror. Versions that were pruned are added back
+    by the next update.
+
+    RUNS IN A THREAD
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+
+    :param go_sum:
+        A unicode string of the path to the go.sum file
+    """
+
+    if not os.path.exists(go_sum):
+        return
+
+    now = time.time()
+    keys = set()
+    with io.open(go_sum, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            version = parts[1]
+            if version.endswith('/go.mod'):
+                version = version[:-7]
+            keys.add('%s@%s' % (_escape_module_path(parts[0]), _escape_module_path(version)))
+
+    _MIRROR_LOCK.acquire()
+    try:
+        usage = _load_mirror_usage(mirror_dir)
+        for key in keys:
+            if key in usage:
+                usage[key] = now
+        _save_mirror_usage(mirror_dir, usage)
+    finally:
+        _MIRROR_LOCK.release()
+
+
+def _escape_module_path(path):
+    """
+    Escapes a module path or version the way the module cache and GOPROXY
+    protocol do, replacing each upper-case letter with "!" and the lower-case
+    letter
+
+    :param path:
+        A unicode string of the module path or version
+
+    :return:
+        A unicode string of the escaped path
+    """
+
+    return re.sub('[A-Z]', lambda match: '!' + match.group(0).lower(), path)
+
+
+def _load_mirror_usage(mirror_dir):
+    """
+    Loads the time each version in the mirror was last used
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+
+    :return:
+        A dict with unicode string keys of escaped "module@version" and
+        values of a float unix timestamp, or None if the version was pruned
+    """
+
+    path = os.path.join(mirror_dir, 'usage.json')
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+    except (ValueError, IOError, OSError):
+        return {}
+
+
+def _save_mirror_usage(mirror_dir, usage):
+    """
+    Saves the time each version in the mirror was last used
+
+    :param mirror_dir:
+        A unicode string of the mirror directory
+
+    :param usage:
+        A dict with unicode string keys of escaped "module@version" and
+        values of a float unix timestamp, or None if the version was pruned
+    """
+
+    with open(os.path.join(mirror_dir, 'usage.json'), 'wb') as f:
+        f.write(json.dumps(usage, sort_keys=True).encode('utf-8'))
+
+
+def _mirror_dir(window):
+    """
+    Returns the directory of the module mirror, creating it if necessary
+
+    :param window:
+        A sublime.Window object to use in finding settings
+
+    :return:
+        A unicode string of the path to the directory
+    """
+
+    path, _ = golangconfig.setting_value('mirror:path', view=window.active_view(), window=window)
+    if not path:
+        return _data_dir('module-mirror')
+    path = os.path.abspath(os.path.expanduser(path))
+    if not os.path.exists(path):
+        os.makedirs(path)
+    return path
+
+
+def _module_cache_dir(go_bin, env):
+    """
+    Determines the GOMODCACHE directory
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+
+    :return:
+        A unicode string of the path to the module cache
+    """
+
+    returncode, output = _run_capture([go_bin, 'env', 'GOMODCACHE'], None, env)
+    if returncode == 0 and output.strip():
+        return output.strip()
+    # Versions of Go before 1.15 always use the first GOPATH entry
+    return os.path.join(_env_value(env, 'GOPATH').split(os.pathsep)[0], 'pkg', 'mod')
+
+
+class GolangBuildCacheReportCommand(sublime_plugin.WindowCommand):
+
+    """
+    Displays the size of the build and module caches, and how long ago their
+    entries were last used
+    """
+
+    def run(self):
+        go_bin, env = _get_config(
+            'go',
+            set(['GOPATH']),
+            GO_ENV_VARS - set(['GOPATH']),
+            view=self.window.active_view(),
+            window=self.window,
+        )
+        if (go_bin, env) == (None, None):
+            return
+
+        budgets = _cache_budgets(self.window)
+        sublime.status_message('Golang Build: measuring caches')
+
+        def report():
+            """
+            Measures the caches and displays the report in a new tab
+
+            RUNS IN A THREAD
+            """
+
+            output = 'Golang Build Cache Report\n'
+            now = time.time()
+            for name, cache_dir, entries in _cache_entries(go_bin, env):
+                output += '\n%s: %s\n' % (name, cache_dir or 'disabled')
+                if entries is None:
+                    continue
+                total = sum([size for _, size, _ in entries])
+                output += '  %s in %d entries' % (_format_bytes(total), len(entries))
+                if budgets[name]:
+                    output += ', budget %s' % _format_bytes(budgets[name])
+                output += '\n  Last used:\n'
+                for label, max_age in _CACHE_AGES:
+                    bucket = [size for last_used, size, _ in entries if now - last_used < max_age]
+                    entries = [entry for entry in entries if now - entry[0] >= max_age]
+                    output += '    %-12s %10s in %d entries\n' % (label, _format_bytes(sum(bucket)), len(bucket))
+
+            def show():
+                view = self.window.new_file()
+                view.set_name('Golang Build Cache Report')
+                view.set_scratch(True)
+                view.run_command('append', {'characters': output})
+
+            sublime.set_timeout(show, 1)
+
+        thread = threading.Thread(target=report)
+        thread.start()
+
+
+class GolangBuildCacheTrimCommand(sublime_plugin.WindowCommand):
+
+    """
+    Removes the least-recently used entries of the build and module caches
+    until they fit within the "cache:gocache_size" and "cache:modcache_size"
+    settings
+    """
+
+    def run(self):
+        go_bin, env = _get_config(
+            'go',
+            set(['GOPATH']),
+            GO_ENV_VARS - set(['GOPATH']),
+            view=self.window.active_view(),
+            window=self.window,
+        )
+        if (go_bin, env) == (None, None):
+            return
+
+        budgets = _cache_budgets(self.window)
+        if not budgets['GOCACHE'] and not budgets['GOMODCACHE']:
+            sublime.status_message('Golang Build: set cache:gocache_size or cache:modcache_size to trim caches')
+            return
+
+        thread = threading.Thread(target=_CACHE_TRIMMER.trim, args=(go_bin, env, budgets))
+        thread.start()
+
+
+class GolangCacheTrimmer():
+
+    """
+    Trims the build and module caches once no build has been started for a
+    while. Entries are only removed while no build is running in any window.
+    """
+
+    # A threading.Lock() protecting the timer and trimming flag
+    _lock = None
+
+    # None or the threading.Timer() that will start trimming
+    _timer = None
+
+    # A boolean - if the caches are being trimmed
+    _trimming = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def schedule(self, window, go_bin, env):
+        """
+        Restarts the wait for the "cache:trim_idle" number of minutes, after
+        which the caches are trimmed if no other build has started
+
+        :param window:
+            A sublime.Window object to use in finding settings
+
+        :param go_bin:
+            A unicode string with the path to the "go" executable
+
+        :param env:
+            A dict of environment variables to use with the "go" executable
+        """
+
+        idle = _positive_int_setting('cache:trim_idle', window)
+        budgets = _cache_budgets(window)
+
+        self._lock.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not idle or (not budgets['GOCACHE'] and not budgets['GOMODCACHE']):
+                return
+            self._timer = threading.Timer(idle * 60, self.trim, args=(go_bin, dict(env), budgets))
+            self._timer.daemon = True
+            self._timer.start()
+        finally:
+            self._lock.release()
+
+    def trim(self, go_bin, env, budgets):
+        """
+        Trims each cache that has a budget, and displays the result in the
+        status bar
+
+        RUNS IN A THREAD
+
+        :param go_bin:
+            A unicode string with the path to the "go" executable
+
+        :param env:
+            A dict of environment variables to use with the "go" executable
+
+        :param budgets:
+            A dict with the keys "GOCACHE" and "GOMODCACHE", and values of
+            None or an integer number of bytes the cache may use
+        """
+
+        self._lock.acquire()
+        try:
+            if self._trimming:
+                return
+            self._trimming = True
+        finally:
+            self._lock.release()
+
+        try:
+            results = []
+            for name, cache_dir, entries in _cache_entries(go_bin, env):
+                if entries is None or not budgets[name]:
+                    continue
+                removed, removed_size, gave_up = _trim_cache(name, cache_dir, entries, budgets[name])
+                results.append('%s %d entries (%s)' % (name, removed, _format_bytes(removed_size)))
+                if gave_up:
+                    results.append('stopped since go commands kept running')
+                    break
+            message = 'trimmed ' + ', '.join(results)
+            sublime.set_timeout(lambda: sublime.status_message('Golang Build: ' + message), 1)
+        finally:
+            self._lock.acquire()
+            try:
+                self._trimming = False
+            finally:
+                self._lock.release()
+
+
+_CACHE_TRIMMER = GolangCacheTrimmer()
+
+# The number of seconds trimming a cache waits for running go commands to
+# finish before giving up until the next time
+_TRIM_MAX_WAIT = 600
+
+
+# A list of two-element tuples of a unicode string label and the integer
+# number of seconds that an entry was last used within
+_CACHE_AGES = [
+    ('< 1 day', 86400),
+    ('1-7 days', 7 * 86400),
+    ('7-30 days', 30 * 86400),
+    ('30-90 days', 90 * 86400),
+    ('> 90 days', float('inf')),
+]
+
+
+def _cache_budgets(window):
+    """
+    Reads the cache size settings
+
+    :param window:
+        A sublime.Window object to use in finding settings
+
+    :return:
+        A dict with the keys "GOCACHE" and "GOMODCACHE", and values of None
+        or an integer number of bytes the cache may use
+    """
+
+    budgets = {}
+    for name, setting in [('GOCACHE', 'cache:gocache_size'), ('GOMODCACHE', 'cache:modcache_size')]:
+        size = _positive_int_setting(setting, window)
+        budgets[name] = size * 1024 * 1024 if size else None
+    return budgets
+
+
+def _cache_entries(go_bin, env):
+    """
+    Finds the entries of the build and module caches
+
+    :param go_bin:
+        A unicode string with the path to the "go" executable
+
+    :param env:
+        A dict of environment variables to use with the "go" executable
+
+    :return:
+        A list of two three-element tuples of (unicode string "GOCACHE" or
+        "GOMODCACHE", None or a unicode string of the cache directory, None or
+        a list of entries). Each entry is a three-element tuple of (float
+        unix timestamp of when it was last used, integer size in bytes,
+        unicode string of the path).
+    """
+
+    returncode, output = _run_capture([go_bin, 'env', 'GOCACHE'], None, env)
+    build_cache = output.strip() if returncode == 0 else ''
+    # GOCACHE is "off" when the build cache is disabled
+    if not os.path.isabs(build_cache) or not os.path.isdir(build_cache):
+        build_cache = None
+
+    module_cache = _module_cache_dir(go_bin, env)
+    if not os.path.isdir(module_cache):
+        module_cache = None
+
+    return [
+        ('GOCACHE', build_cache, _build_cache_entries(build_cache) if build_cache else None),
+        ('GOMODCACHE', module_cache, _module_cache_entries(module_cache) if module_cache else None),
+    ]
+
+
+def _build_cache_entries(cache_dir):
+    """
+    Lists the files of the build cache. The go tool updates the modification
+    time of an entry when it is used, at most once an hour.
+
+    :param cache_dir:
+        A unicode string of the GOCACHE directory
+
+    :return:
+        A list of three-element tuples of (float unix timestamp of when the
+        file was last used, integer size in bytes, unicode string of the path)
+    """
+
+    entries = []
+    for sub_dir in os.listdir(cache_dir):
+        # Entries are stored in directories named after the first byte of
+        # their hash, the other files are used by the go tool itself
+        if not re.match('^[0-9a-f]{2}$', sub_dir):
+            continue
+        sub_dir = os.path.join(cache_dir, sub_dir)
+        try:
+            for file_name in os.listdir(sub_dir):
+                path = os.path.join(sub_dir, file_name)
+                stat = os.lstat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except (OSError):
+            continue
+    return entries
+
+
+def _module_cache_entries(cache_dir):
+    """
+    Lists the versions of modules in the module cache that have source code
+    downloaded. Each entry is the zip file and the directory it was extracted
+    to. The small .info and .mod files are not included, since they are read
+    when resolving the versions of every module in the build list.
+
+    :param cache_dir:
+        A unicode string of the GOMODCACHE directory
+
+    :return:
+        A list of three-element tuples of (float unix timestamp of when the
+        module was last used, integer size in bytes, unicode string of the
+        path to the zip file)
+    """
+
+    download_dir = os.path.join(cache_dir, 'cache', 'download')
+    entries = []
+    for root, dirs, files in os.walk(download_dir):
+        if root == download_dir and 'sumdb' in dirs:
+            dirs.remove('sumdb')
+        if os.path.basename(root) != '@v':
+            continue
+        module = os.path.dirname(os.path.relpath(root, download_dir))
+        for file_name in files:
+            if not file_name.endswith('.zip'):
+                continue
+            version = file_name[:-4]
+            zip_path = os.path.join(root, file_name)
+            paths = [zip_path, os.path.join(root, version + '.mod'), os.path.join(cache_dir, module + '@' + version)]
+            last_used = 0
+            size = 0
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                stat = os.stat(path)
+                # The access time is only updated about once a day on most
+                # systems, which is precise enough to find stale entries
+                last_used = max(last_used, stat.st_atime, stat.st_mtime)
+                if path == zip_path:
+                    size += stat.st_size
+                elif os.path.isdir(path):
+                    size += _directory_size(path)
+            entries.append((last_used, size, zip_path))
+    return entries
+
+
+def _directory_size(path):
+    """
+    Determines the total size of the files in a directory
+
+    :param path:
+        A unicode string of the directory
+
+    :return:
+        An integer number of bytes
+    """
+
+    size = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                size += os.lstat(os.path.join(root, file_name)).st_size
+            except (OSError):
+                pass
+    return size
+
+
+def _trim_cache(name, cache_dir, entries, budget):
+    """
+    Removes the least-recently used entries of a cache until it is no larger
+    than the budget, pausing whenever a build is running. Gives up if builds
+    keep running for _TRIM_MAX_WAIT seconds.
+
+    RUNS IN A THREAD
+
+    :param name:
+        A unicode string of "GOCACHE" or "GOMODCACHE"
+
+    :param cache_dir:
+        A unicode string of the cache directory
+
+    :param entries:
+        A list of entries from _cache_entries()
+
+    :param budget:
+        An integer of the number of bytes the cache may use
+
+    :return:
+        A three-element tuple of (integer number of entries removed, integer
+        number of bytes removed, boolean if trimming gave up waiting)
+    """
+
+    total = sum([size for _, size, _ in entries])
+    removed = 0
+    removed_size = 0
+    waited = 0.0
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        while _builds_running():
+            if waited >= _TRIM_MAX_WAIT:
+                return (removed, removed_size, True)
+            time.sleep(1.0)
+            waited += 1.0
+        if name == 'GOCACHE':
+            try:
+                os.remove(path)
+            except (OSError):
+                continue
+        else:
+            version = os.path.basename(path)[:-4]
+            version_dir = os.path.dirname(path)
+            module = os.path.dirname(os.path.relpath(version_dir, os.path.join(cache_dir, 'cache', 'download')))
+            _remove_read_only(os.path.join(cache_dir, module + '@' + version))
+            for extension in ['.zip', '.ziphash']:
+                if os.path.exists(os.path.join(version_dir, version + extension)):
+                    os.remove(os.path.join(version_dir, version + extension))
+        total -= size
+        removed += 1
+        removed_size += size
+    return (removed, removed_size, False)
+
+
+def _remove_read_only(path):
+    """
+    Removes a directory of the module cache, which the go tool makes read-only
+
+    :param path:
+        A unicode string of the directory
+    """
+
+    if not os.path.exists(path):
+        return
+    for root, dirs, _ in os.walk(path):
+        os.chmod(root, 0o755)
+        for dir_name in dirs:
+            os.chmod(os.path.join(root, dir_name), 0o755)
+    shutil.rmtree(path, True)
+
+
+def _builds_running():
+    """
+    Determines if any go tool invocation started by the package is running,
+    including builds in the output panel, jobs, reloader builds and module
+    prefetches
+
+    :return:
+        A boolean
+    """
+
+    _SUBPROCESSES_LOCK.acquire()
+    try:
+        return _SUBPROCESSES > 0
+    finally:
+        _SUBPROCESSES_LOCK.release()
+
+
+def _count_subprocess(args, delta):
+    """
+    Updates the number of running go tool invocations started by the package.
+    Other executables, such as a program being run, and "go run", which lasts
+    as long as the program does, are ignored.
+
+    :param args:
+        A list of strings of the process path and arguments
+
+    :param delta:
+        An integer of 1 when a subprocess is started, or -1 once it exits
+    """
+
+    global _SUBPROCESSES
+
+    executable = os.path.splitext(os.path.basename(args[0]))[0]
+    if executable != 'go' or (len(args) > 1 and args[1] == 'run'):
+        return
+
+    _SUBPROCESSES_LOCK.acquire()
+    try:
+        _SUBPROCESSES += delta
+    finally:
+        _SUBPROCESSES_LOCK.release()
+
+
+class GolangBuildTerminalCommand(sublime_plugin.WindowCommand):
+
+    """
+    Opens a terminal for the user to the directory containing the open file,
+    setting any necessary environment variables
+    """
+
+    def run(self):
+        """
+        Runs the "golang_build_terminal" command - invoked by Sublime Text via
+        the command palette or sublime.Window.run_command()
+        """
+
+        working_dir = _determine_working_dir(self.window)
+        if working_dir is None:
+            return
+
+        relevant_sources = set([
+            'project file',
+            'project file (os-specific)',
+            'golang.sublime-settings',
+            'golang.sublime-settings (os-specific)'
+        ])
+
+        env_overrides = {}
+        for var_name in GO_ENV_VARS:
+            value, source = golangconfig.setting_value(var_name, window=self.window)
+            # Only set overrides that are not coming from the user's shell
+            if source in relevant_sources:
+                env_overrides[var_name] = value
+
+        # Get the PATH from the shell environment and then prepend any custom
+        # value so the user's terminal searches all locations
+        value, source = golangconfig.setting_value('PATH', window=self.window)
+        if source in relevant_sources:
+            shell, env = shellenv.get_env()
+            env_overrides['PATH'] = value + os.pathsep + env.get('PATH', '')
+
+        newterm.launch_terminal(working_dir, env=env_overrides)
+
+
+class GolangBuildStartupReportCommand(sublime_plugin.WindowCommand):
+
+    """
+    Displays how long the package took to load, and how long each dependency
+    took to import when it was first used
+    """
+
+    def run(self):
+        # The dependencies are listed before reading the budget setting,
+        # since that imports golangconfig
+        dependencies = ''
+        for name in ['shellenv', 'golangconfig', 'newterm', 'package_events']:
+            if name in _IMPORT_TIMES:
+                dependencies += '  %s: %0.1fms\n' % (name, _IMPORT_TIMES[name] * 1000)
+            elif name in sys.modules:
+                dependencies += '  %s: already imported by another package\n' % name
+            else:
+                dependencies += '  %s: not imported\n' % name
+
+        budget = _positive_int_setting('startup:budget', self.window) or 50
+
+        module_ms = _MODULE_INITIALIZED * 1000
+        output = 'Golang Build Startup Report\n\n'
+        output += 'Module initialization: %0.1fms' % module_ms
+        if module_ms > budget:
+            output += ' (over the %dms budget)' % budget
+        output += '\n\nDependencies, imported on first use:\n'
+        output += dependencies
+
+        view = self.window.new_file()
+        view.set_name('Golang Build Startup Report')
+        view.set_scratch(True)
+        view.run_command('append', {'characters': output})
+
+
+def _yield_to_running_build(window):
+    """
+    Check if a build is already running, and if so, allow the user to stop it,
+    or cancel the new build
+
+    :param window:
+        A sublime.Window of the window the build is being run in
+
+    :return:
+        A boolean - if the new build should be abandoned
+    """
+
+    proc = _get_proc(window)
+    if proc and not proc.finished:
+        message = _format_message("""
+            Golang Build
+
+            There is already a build running. Would you like to stop it?
+        """)
+        if not sublime.ok_cancel_dialog(message, 'Stop Running Build'):
+            return True
+        proc.terminate()
+        _set_proc(window, None)
+    _stop_reloader(window)
+
+    return False
+
+
+def _determine_working_dir(window):
+    """
+    Determine the working directory for a command based on the user's open file
+    or open folders
+
+    :param window:
+        The sublime.Window object of the window the command was run on
+
+    :return:
+        A unicode string of the working directory, or None if no working
+        directory was found
+    """
+
+    view = window.active_view()
+    working_dir = None
+
+    # If a file is open, get the folder from the file, and error if the file
+    # has not been saved yet
+    if view:
+        if view.file_name():
+            working_dir = os.path.dirname(view.file_name())
+
+    # If no file is open, then get the list of folders and grab the first one
+    else:
+        folders = window.folders()
+        if len(folders) > 0:
+            working_dir = folders[0]
+
+    if working_dir is None or not os.path.exists(working_dir):
+        message = _format_message("""
+            Golang Build
+
+            No files or folders are open, or the open file or folder does not exist on disk
+        """)
+        sublime.error_message(message)
+        return None
+
+    return working_dir
+
+
+def _function_at_cursor(view, prefix):
+    """
+    Finds the name of the test function the first cursor is in
+
+    :param view:
+        None or a sublime.View object
+
+    :param prefix:
+        A unicode string the function name must start with, such as "Test"
+        or "Fuzz"
+
+    :return:
+        None if the cursor is not in such a function in a _test.go file,
+        otherwise a unicode string of the function name
+    """
+
+    if not view or not view.file_name() or not view.file_name().endswith('_test.go'):
+        return None
+    selections = view.sel()
+    if len(selections) == 0:
+        return None
+
+    point = selections[0].begin()
+    text = view.substr(sublime.Region(0, view.line(point).end()))
+    name = None
+    for match in _FUNCTION_RE.finditer(text):
+        name = match.group(1)
+    if name is None or not name.startswith(prefix):
+        return None
+    return name
+
+
+def _get_config(executable_name, required_vars, optional_vars=None, view=None, window=None):
+    """
+    :param executable_name:
+        A unicode string of the executable to locate, e.g. "go" or "gofmt"
+
+    :param required_vars:
+        A list of unicode strings of the environment variables that are
+        required, e.g. "GOPATH". Obtains values from setting_value().
+
+    :param optional_vars:
+        A list of unicode strings of the environment variables that are
+        optional, but should be pulled from setting_value() if available - e.g.
+        "GOOS", "GOARCH". Obtains values from setting_value().
+
+    :param view:
+        A sublime.View object to use in finding project-specific settings. This
+        should be passed whenever available.
+
+    :param window:
+        A sublime.Window object to use in finding project-specific settings.
+        This will only work for Sublime Text 3, and should only be passed if
+        no sublime.View object is available to pass via the view parameter.
+
+    :return:
+        A two-element tuple.
+
+        If there was an error finding the executable or required vars:
+
+         - [0] None
+         - [1] None
+
+        Otherwise:
+
+         - [0] A string of the path to the executable
+         - [1] A dict of environment variables for the executable
+    """
+
+    try:
+        return golangconfig.subprocess_info(
+            executable_name,
+            required_vars,
+            optional_vars,
+            view=view,
+            window=window
+        )
+
+    except (golangconfig.ExecutableError) as e:
+        error_message = '''
+            Golang Build
+
+            The %s executable could not be found. Please ensure it is
+            installed and available via your PATH.
+
+            Would you like to view documentation for setting a custom PATH?
+        '''
+
+        prompt = error_message % e.name
+
+        if sublime.ok_cancel_dialog(_format_message(prompt), 'Open Documentation'):
+            window.run_command(
+                'open_url',
+                {'url': 'https://github.com/golang/sublime-build/blob/master/docs/configuration.md'}
+            )
+
+    except (golangconfig.EnvVarError) as e:
+        error_message = '''
+            Golang Build
+
+            The setting%s %s could not be found in your Sublime Text
+            settings or your shell environment.
+
+            Would you like to view the configuration documentation?
+        '''
+
+        plural = 's' if len(e.missing) > 1 else ''
+        setting_names = ', '.join(e.missing)
+        prompt = error_message % (plural, setting_names)
+
+        if sublime.ok_cancel_dialog(_format_message(prompt), 'Open Documentation'):
+            window.run_command(
+                'open_url',
+                {'url': 'https://github.com/golang/sublime-build/blob/master/docs/configuration.md'}
+            )
+
+    return (None, None)
+
+
+class GolangProcess():
+
+    """
+    A wrapper around subprocess.Popen() that provides information about how
+    the process was started and finished, plus a queue.Queue of output
+    """
+
+    # A unicode string of the build task the process was started for
+    task = None
+
+    # A float of the unix timestamp of when the process was started
+    started = None
+
+    # A list of strings (unicode for Python 3, byte string for Python 2) of
+    # the process path and any arguments passed to it
+    args = None
+
+    # A unicode string of the process working directory
+    cwd = None
+
+    # A dict of the env passed to the process
+    env = None
+
+    # A subprocess.Popen() object of the running process
+    proc = None
+
+    # A queue.Queue object of output from the process
+    output = None
+
+    # The result of the process, a unicode string of "cancelled", "success" or "error"
+    result = None
+
+    # None or an integer of the exit code of the process, once it has exited
+    # without being cancelled
+    returncode = None
+
+    # None or a ResourceUsage() of the process and the processes it waited
+    # for, such as the test binary run by "go test". Only available on posix
+    # platforms, once the process has exited without being cancelled.
+    resources = None
+
+    # A float of the unix timestamp of when the process ended
+    finished = None
+
+    # A float of the unix timestamp of when output was last read from the
+    # process, or when it was started if there has been no output
+    last_output = None
+
+    # A threading.Lock() used to prevent the stdout and stderr handlers from
+    # both trying to perform process cleanup at the same time
+    _cleanup_lock = None
+
+    def __init__(self, args, cwd, env, task=None):
+        """
+        :param args:
+            A list of strings (unicode for Python 3, byte string for Python 2)
+            of the process path and any arguments passed to it
+
+        :param cwd:
+            A unicode string of the working directory for the process
+
+        :param env:
+            A dict of strings (unicode for Python 3, byte string for Python 2)
+            to pass to the process as the environment variables
+
+        :param task:
+            A unicode string of the build task the process is for
+        """
+
+        self.task = task
+        self.args = args
+        self.cwd = cwd
+        self.env = env
+
+        startupinfo = None
+        preexec_fn = None
+        if sys.platform == 'win32':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        else:
+            # On posix platforms we create a new process group by executing
+            # os.setsid() after the fork before the go binary is executed. This
+            # allows us to use os.killpg() to kill the whole process group.
+            preexec_fn = os.setsid
+
+        self._cleanup_lock = threading.Lock()
+        self.started = time.time()
+        self.last_output = self.started
+        _count_subprocess(args, 1)
+        try:
+            self.proc = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                startupinfo=startupinfo,
+                preexec_fn=preexec_fn
+            )
+        except (Exception):
+            _count_subprocess(args, -1)
+            raise
+        self.finished = False
+
+        self.output = queue.Queue()
+
+        self._stdout_thread = threading.Thread(
+            target=self._read_output,
+            args=(
+                self.output,
+                self.proc.stdout.fileno(),
+                'stdout'
+            )
+        )
+        self._stdout_thread.start()
+
+        self._stderr_thread = threading.Thread(
+            target=self._read_output,
+            args=(
+                self.output,
+                self.proc.stderr.fileno(),
+                'stderr'
+            )
+        )
+        self._stderr_thread.start()
+
+        self._cleanup_thread = threading.Thread(target=self._cleanup)
+        self._cleanup_thread.start()
+
+    def wait(self):
+        """
+        Blocks waiting for the subprocess to complete
+        """
+
+        self._cleanup_thread.join()
+
+    def terminate(self):
+        """
+        Terminates the subprocess
+        """
+
+        self._cleanup_lock.acquire()
+        try:
+            if not self.proc:
+                return
+
+            if sys.platform != 'win32':
+                # On posix platforms we send SIGTERM to the whole process
+                # group to ensure both go and the compiled temporary binary
+                # are killed.
+                os.killpg(os.getpgid(self.proc.pid), signal.SIGTERM)
+            else:
+                # On Windows, there is no API to get the child processes
+                # of a process and send signals to them all. Attempted to use
+                # startupinfo.dwFlags with CREATE_NEW_PROCESS_GROUP and then
+                # calling self.proc.send_signal(signal.CTRL_BREAK_EVENT),
+                # however that did not kill the temporary binary. taskkill is
+                # part of Windows XP and newer, so we use that.
+                startupinfo = subprocess.STARTUPINFO()
+                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                kill_proc = subprocess.Popen(
+                    ['taskkill', '/F', '/T', '/PID', str_cls(self.proc.pid)],
+                    startupinfo=startupinfo
+                )
+                kill_proc.wait()
+
+            self.result = 'cancelled'
+            self.finished = time.time()
+            self.proc = None
+        finally:
+            self._cleanup_lock.release()
+
+        # Wake up the GolangProcessPrinter() so it can discard any output that
+        # has not yet been written to the panel
+        self.output.put(('cancelled', None))
+
+    def _wait_with_resources(self):
+        """
+        Reaps the process using os.wait4() to collect its resource usage, and
+        sets the returncode of the subprocess.Popen() object
+        """
+
+        try:
+            _, status, rusage = os.wait4(self.proc.pid, 0)
+        except (OSError):
+            # The process was already reaped
+            self.proc.wait()
+            return
+
+        if os.WIFSIGNALED(status):
+            self.proc.returncode = -os.WTERMSIG(status)
+        else:
+            self.proc.returncode = os.WEXITSTATUS(status)
+
+        # Linux reports kilobytes, while macOS reports bytes
+        max_rss = rusage.ru_maxrss
+        if sys.platform != 'darwin':
+            max_rss *= 1024
+
+        self.resources = ResourceUsage(
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss=max_rss,
+            voluntary_switches=rusage.ru_nvcsw,
+            involuntary_switches=rusage.ru_nivcsw
+        )
+
+    def _read_output(self, output_queue, fileno, output_type):
+        """
+        Handler to process output from stdout/stderr
+
+        RUNS IN A THREAD
+
+        :param output_queue:
+            The queue.Queue object to add the output to
+
+        :param fileno:
+            The fileno to read output from
+
+        :param output_type:
+            A unicode string of "stdout" or "stderr"
+        """
+
+        # On posix platforms the process is not polled, since that would reap
+        # it before _cleanup() can collect its resource usage
+        while self.proc and (sys.platform != 'win32' or self.proc.poll() is None):
+            try:
+                chunk = os.read(fileno, 32768)
+            except (OSError):
+                # When cancelled, the pipe may be closed while reading
+                break
+            if len(chunk) == 0:
+                break
+            # Once cancelled, any further output is thrown away
+            if self.result == 'cancelled':
+                break
+            self.last_output = time.time()
+            output_queue.put((output_type, chunk.decode('utf-8')))
+
+    def _cleanup(self):
+        """
+        Cleans up the subprocess and marks the state of self appropriately
+
+        RUNS IN A THREAD
+        """
+
+        self._stdout_thread.join()
+        self._stderr_thread.join()
+
+        self._cleanup_lock.acquire()
+        try:
+            if not self.proc:
+                return
+            # Get the returncode to prevent a zombie/defunct child process
+            if sys.platform != 'win32':
+                self._wait_with_resources()
+            else:
+                self.proc.wait()
+            self.returncode = self.proc.returncode
+            self.result = 'success' if self.proc.returncode == 0 else 'error'
+            self.finished = time.time()
+            self.proc = None
+        finally:
+            self._cleanup_lock.release()
+            _count_subprocess(self.args, -1)
+            self.output.put(('eof', None))
+
+
+class GolangProcessPrinter():
+
+    """
+    Describes a Go process, the environment it was started in and its result
+    """
+
+    # The GolangProcess() object the printer is displaying output from
+    proc = None
+
+    # The GolangPanel() object the information is written to
+    panel = None
+
+    # None or a GolangOutputFilter() object to process output with before
+    # it is written to the panel
+    output_filter = None
+
+    # None or a GolangDiagnostics() object to add diagnostics found in the
+    # output to
+    diagnostics = None
+
+    # An integer of the number of bytes of output that were thrown away
+    # because the process was cancelled before they were written
+    discarded = 0
+
+    # A list of handler objects that are passed the output of the process
+    # and may add a section of output once the process has finished. Each
+    # handler must implement two methods:
+    #
+    #  - feed(output): called with each unicode string of output
+    #  - finish(proc): called with the GolangProcess() once it has finished,
+    #    returns a unicode string to write to the panel before the footer.
+    #    This may perform blocking work since it runs in the printer thread.
+    handlers = None
+
+    # A GolangDiagnosticParser() object used when self.diagnostics is set
+    _parser = None
+
+    def __init__(self, proc, panel, output_filter=None, diagnostics=None, handlers=None):
+        """
+        :param proc:
+            A GolangProcess() object
+
+        :param panel:
+            A GolangPanel() object to write information to
+
+        :param output_filter:
+            None or a GolangOutputFilter() object to process output with
+
+        :param diagnostics:
+            None or a GolangDiagnostics() object to add diagnostics found in
+            the output to
+
+        :param handlers:
+            None or a list of handler objects to pass the output to, see the
+            handlers attribute for details
+        """
+
+        self.proc = proc
+        self.panel = panel
+        self.output_filter = output_filter
+        self.diagnostics = diagnostics
+        self.handlers = handlers or []
+
+        _EVENTS.emit('build_started', BuildStartedEvent(
+            task=proc.task,
+            args=list(proc.args),
+            working_dir=proc.cwd,
+            env=_event_env(proc.env),
+            started=proc.started
+        ))
+
+        self.thread = threading.Thread(
+            target=self._run
+        )
+        self.thread.start()
+
+    def _run(self):
+        """
+        GolangProcess() output queue processor
+
+        RUNS IN A THREAD
+        """
+
+        self.panel.printer_lock.acquire()
+        self.panel.set_base_dir(self.proc.cwd)
+
+        try:
+            if self.diagnostics:
+                self.diagnostics.clear()
+                self._parser = GolangDiagnosticParser(
+                    self.diagnostics,
+                    self.proc.cwd,
+                    _DIAGNOSTIC_HISTORY.get(self.diagnostics.window_id, {}).get((self.proc.task, self.proc.cwd)),
+                    self.diagnostics.only_new
+                )
+
+            self._write_header()
+
+            while True:
+                # When the filter is holding output back, it needs to be
+                # periodically given a chance to release it
+                timeout = None
+                if self.output_filter and self.output_filter.pending():
+                    timeout = 0.1
+
+                try:
+                    message_type, message = self.proc.output.get(True, timeout)
+                except (queue.Empty):
+                    self._write_output(self.output_filter.tick())
+                    continue
+
+                if message_type == 'eof':
+                    if self.output_filter:
+                        self._write_output(self.output_filter.flush())
+                    if self._parser:
+                        self._parser.flush()
+                    break
+
+                if message_type == 'cancelled' or self.proc.result == 'cancelled':
+                    self._discard_output(message)
+                    break
+
+                if message_type == 'stdout':
+                    output = message
+
+                if message_type == 'stderr':
+                    output = message
+
+                if _EVENTS.wants('output_chunk'):
+                    _EVENTS.emit('output_chunk', OutputChunkEvent(
+                        task=self.proc.task,
+                        working_dir=self.proc.cwd,
+                        stream=message_type,
+                        output=output
+                    ))
+
+                for handler in self.handlers:
+                    handler.feed(output)
+
+                if self.output_filter:
+                    output = self.output_filter.feed(output)
+
+                self._write_output(output)
+
+            for handler in self.handlers:
+                section = handler.finish(self.proc)
+                if section:
+                    self.panel.write(section, content_separator='\n')
+
+            self._write_footer()
+
+        finally:
+            self.panel.printer_lock.release()
+
+    def _write_output(self, output):
+        """
+        Writes process output to the panel
+
+        :param output:
+            A unicode string of the output to write, may be empty
+        """
+
+        if output and self._parser:
+            output = self._parser.feed(output)
+        if output:
+            self.panel.write(output)
+
+    def _discard_output(self, message):
+        """
+        Throws away all output from a cancelled process that has not yet been
+        written to the panel, so that the next printer may use the panel
+        without waiting for stale output to be displayed
+
+        :param message:
+            None or a unicode string of the output that was just read from the
+            process output queue
+        """
+
+        if message is not None:
+            self.discarded += len(message.encode('utf-8'))
+
+        try:
+            while True:
+                message_type, message = self.proc.output.get(False)
+                if message_type in set(['stdout', 'stderr']):
+                    self.discarded += len(message.encode('utf-8'))
+        except (queue.Empty):
+            pass
+
+        self.discarded += self.panel.discard()
+
+    def _write_header(self):
+        """
+        Displays startup information about the process
+        """
+
+        title = ''
+
+        env_vars = []
+        for var_name in GO_ENV_VARS:
+            var_key = var_name if sys.version_info >= (3,) else var_name.encode('ascii')
+            if var_key in self.proc.env:
+                value = self.proc.env.get(var_key)
+                if sys.version_info < (3,):
+                    value = value.decode('utf-8')
+                env_vars.append((var_name, value))
+        if env_vars:
+            title += '> Environment:\n'
+            for var_name, value in env_vars:
+                title += '>   %s=%s\n' % (var_name, value)
+
+        title += '> Directory: %s\n' % self.proc.cwd
+        title += '> Command: %s\n' % subprocess.list2cmdline(self.proc.args)
+        title += '> Output:\n'
+
+        self.panel.write(title, content_separator='\n\n')
+
+    def _diagnostics_summary(self):
+        """
+        Compares the diagnostics of the process to those of the previous run
+        of the same task and records them for the next run
+
+        :return:
+            A unicode string of the summary to display in the footer
+        """
+
+        parser = self._parser
+        history = _DIAGNOSTIC_HISTORY.setdefault(self.diagnostics.window_id, {})
+        history[(self.proc.task, self.proc.cwd)] = (
+            parser.current,
+            parser.current_descriptions
+        )
+
+        if parser.previous is None:
+            return ''
+
+        fixed = parser.fixed()
+        if not parser.new and not parser.unchanged and not fixed:
+            return ''
+
+        output = '> Diagnostics: %d new, %d fixed, %d unchanged' % (
+            parser.new,
+            len(fixed),
+            parser.unchanged
+        )
+        if parser.hidden:
+            output += ' (unchanged not shown)'
+        output += '\n'
+        for description in fixed[:20]:
+            output += '>   Fixed: %s\n' % description
+        if len(fixed) > 20:
+            output += '>   ... and %d more\n' % (len(fixed) - 20)
+        return output
+
+    def _write_footer(self):
+        """
+        Displays result information about the process, blocking until the
+        write is completed
+        """
+
+        formatted_result = self.proc.result.title()
+        runtime = self.proc.finished - self.proc.started
+
+        output = ''
+        if self.discarded:
+            output += '> Cancelled: %d bytes of output discarded\n' % self.discarded
+        if self.output_filter and (self.output_filter.folded or self.output_filter.rate_limited):
+            output += '> Suppressed: %d repeated lines, %d lines over rate limit\n' % (
+                self.output_filter.folded,
+                self.output_filter.rate_limited
+            )
+        if self._parser and self.proc.result != 'cancelled':
+            output += self._diagnostics_summary()
+        if self.proc.resources:
+            output += _format_resources(self.proc.resources, runtime)
+        output += '> Elapsed: %0.3fs\n> Result: %s' % (runtime, formatted_result)
+
+        event = threading.Event()
+        self.panel.write(output, content_separator='\n', event=event)
+        event.wait()
+
+        _EVENTS.emit('build_complete', BuildCompleteEvent(
+            task=self.proc.task or '',
+            args=list(self.proc.args),
+            working_dir=self.proc.cwd,
+            env=_event_env(self.proc.env),
+            runtime=runtime,
+            result=self.proc.result,
+            resources=self.proc.resources
+        ))
+
+
+class GolangOutputFilter():
+
+    """
+    Processes the output of a GolangProcess() before it is written to the
+    output panel. Consecutive identical, or nearly identical, lines are
+    folded into a single line followed by a count, and the number of lines
+    written per second may be capped.
+    """
+
+    # A boolean - if consecutive repeated lines should be folded
+    fold_repeats = False
+
+    # None or an integer of the maximum number of lines to write per second
+    max_lines_per_second = None
+
+    # An integer of the number of lines that were folded into a repeat count
+    folded = 0
+
+    # An integer of the number of lines that were not written due to the
+    # lines per second limit
+    rate_limited = 0
+
+    # A unicode string of output that does not yet end in a newline, and a
+    # float of the unix timestamp of when it was received
+    _partial = ''
+    _partial_time = None
+
+    # The fold key of the last line written, the number of times it has been
+    # repeated since, and the unix timestamp of the last repeat count written
+    _last_key = None
+    _repeats = 0
+    _repeat_note_time = 0
+
+    # An integer of the current second, the number of lines written during
+    # it and the number of lines suppressed during it
+    _second = None
+    _second_lines = 0
+    _suppressed = 0
+
+    def __init__(self, fold_repeats=False, max_lines_per_second=None):
+        """
+        :param fold_repeats:
+            A boolean - if consecutive repeated lines should be folded
+
+        :param max_lines_per_second:
+            None or an integer of the maximum number of lines to write per
+            second
+        """
+
+        self.fold_repeats = fold_repeats
+        self.max_lines_per_second = max_lines_per_second
+
+    def pending(self):
+        """
+        :return:
+            A boolean - if output is being held back that tick() or flush()
+            may release
+        """
+
+        return bool(self._partial or self._repeats or self._suppressed)
+
+    def feed(self, chunk):
+        """
+        Processes a chunk of output from the process
+
+        :param chunk:
+            A unicode string of output
+
+        :return:
+            A unicode string of the output to write to the panel
+        """
+
+        data = self._partial + chunk
+        lines = data.split('\n')
+        self._partial = lines.pop()
+        self._partial_time = time.time()
+
+        output = []
+        for line in lines:
+            self._process_line(line + '\n', output)
+        return ''.join(output)
+
+    def tick(self):
+        """
+        Releases output that has been held back for long enough, to be called
+        periodically while pending() is True
+
+        :return:
+            A unicode string of the output to write to the panel
+        """
+
+        output = []
+        now = time.time()
+
+        if self._repeats and now - self._repeat_note_time >= 1.0:
+            self._end_repeats(output)
+
+        if self._suppressed and int(now) != self._second:
+            self._end_second(output)
+
+        # Prompts and progress output may not end in a newline, so it is
+        # written once no more output has arrived for a short while
+        if self._partial and now - self._partial_time >= 0.1:
+            self._end_repeats(output)
+            output.append(self._partial)
+            self._partial = ''
+            self._last_key = None
+
+        return ''.join(output)
+
+    def flush(self):
+        """
+        Releases all output that is being held back, to be called once the
+        process has finished
+
+        :return:
+            A unicode string of the output to write to the panel
+        """
+
+        output = []
+        self._end_repeats(output)
+        self._end_second(output)
+        if self._partial:
+            output.append(self._partial)
+            self._partial = ''
+        return ''.join(output)
+
+    def _process_line(self, line, output):
+        """
+        Applies repeat folding and rate limiting to a single line
+
+        :param line:
+            A unicode string of the line, including the trailing newline
+
+        :param output:
+            A list of unicode strings to append output to
+        """
+
+        if self.fold_repeats:
+            key = _fold_key(line)
+            if key is not None and key == self._last_key:
+                self._repeats += 1
+                self.folded += 1
+                return
+            self._end_repeats(output)
+            self._last_key = key
+
+        if self.max_lines_per_second:
+            second = int(time.time())
+            if second != self._second:
+                self._end_second(output)
+                self._second = second
+                self._second_lines = 0
+            if self._second_lines >= self.max_lines_per_second:
+                self._suppressed += 1
+                self.rate_limited += 1
+                return
+            self._second_lines += 1
+
+        output.append(line)
+
+    def _end_repeats(self, output):
+        """
+        Writes the count of repeats of the last line, if any
+
+        :param output:
+            A list of unicode strings to append output to
+        """
+
+        if self._repeats:
+            output.append('> (repeated %d\u00d7)\n' % self._repeats)
+            self._repeats = 0
+            self._repeat_note_time = time.time()
+
+    def _end_second(self, output):
+        """
+        Writes the number of lines suppressed by the rate limit, if any
+
+        :param output:
+            A list of unicode strings to append output to
+        """
+
+        if self._suppressed:
+            output.append('> (%d lines suppressed, output is limited to %d lines per second)\n' % (
+                self._suppressed,
+                self.max_lines_per_second
+            ))
+            self._suppressed = 0
+
+
+def _fold_key(line):
+    """
+    Computes the value used to determine if two lines of output are repeats.
+    Numbers, such as timestamps and counters, are ignored unless the line
+    looks like a diagnostic message with a file position.
+
+    :param line:
+        A unicode string of the line of output
+
+    :return:
+        None if the line should never be folded, otherwise a unicode string
+    """
+
+    if not line.strip():
+        return None
+    if _POSITION_RE.search(line):
+        return line
+    return _NUMBER_RE.sub('#', line)
+
+
+BuildStartedEvent = collections.namedtuple(
+    'BuildStartedEvent',
+    [
+        'task',
+        'args',
+        'working_dir',
+        'env',
+        'started',
+    ]
+)
+
+OutputChunkEvent = collections.namedtuple(
+    'OutputChunkEvent',
+    [
+        'task',
+        'working_dir',
+        'stream',
+        'output',
+    ]
+)
+
+TestEvent = collections.namedtuple(
+    'TestEvent',
+    [
+        'task',
+        'working_dir',
+        'action',
+        'package',
+        'test',
+        'elapsed',
+    ]
+)
+
+BuildCompleteEvent = collections.namedtuple(
+    'BuildCompleteEvent',
+    [
+        'task',
+        'args',
+        'working_dir',
+        'env',
+        'runtime',
+        'result',
+        'resources',
+    ]
+)
+
+ResourceUsage = collections.namedtuple(
+    'ResourceUsage',
+    [
+        'user_time',
+        'system_time',
+        'max_rss',
+        'voluntary_switches',
+        'involuntary_switches',
+    ]
+)
+
+
+def _format_resources(resources, runtime):
+    """
+    Formats the resource usage of a process for the footer
+
+    :param resources:
+        A ResourceUsage() object
+
+    :param runtime:
+        A float of the number of seconds the process ran for
+
+    :return:
+        A unicode string ending in a newline
+    """
+
+    cpu_time = resources.user_time + resources.system_time
+    return (
+        '> Resources: %0.3fs user, %0.3fs system (%d%% of elapsed), %s peak RSS, '
+        '%d voluntary and %d involuntary context switches\n'
+    ) % (
+        resources.user_time,
+        resources.system_time,
+        round(cpu_time / runtime * 100) if runtime > 0 else 0,
+        _format_bytes(resources.max_rss),
+        resources.voluntary_switches,
+        resources.involuntary_switches
+    )
+
+
+class GolangEventDispatcher():
+
+    """
+    Delivers events to subscribers from a dedicated thread, so that a slow
+    subscriber can not delay the output of a build. For compatibility with
+    listeners written before the other events existed, only "build_complete"
+    is also sent via package_events.notify().
+    """
+
+    # The maximum number of queued events before "output_chunk" events are
+    # dropped
+    max_queued = 10000
+
+    # An integer of the number of "output_chunk" events that were dropped
+    dropped = 0
+
+    # A queue.Queue() of two-element tuples of (unicode string event name,
+    # event payload)
+    _queue = None
+
+    # A list of three-element tuples of (callable, None or set of unicode
+    # string event names, None or set of unicode string task names)
+    _subscribers = None
+
+    # A threading.Lock() protecting _subscribers and _thread
+    _lock = None
+
+    # None or the threading.Thread() delivering events
+    _thread = None
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, events=None, tasks=None):
+        """
+        Registers a callback to receive events
+
+        :param callback:
+            A callable accepting two arguments: a unicode string of the event
+            name and the event payload. Called in the dispatcher thread.
+
+        :param events:
+            None for all events except "output_chunk", or a list of unicode
+            strings of the event names to receive: "build_started",
+            "output_chunk", "test_event" and "build_complete"
+
+        :param tasks:
+            None for all tasks, or a list of unicode strings of the names of
+            the tasks to receive events for
+
+        :return:
+            An opaque object to pass to unsubscribe()
+        """
+
+        if events is None:
+            events = ['build_started', 'test_event', 'build_complete']
+        subscription = (callback, set(events), set(tasks) if tasks is not None else None)
+        self._lock.acquire()
+        try:
+            self._subscribers.append(subscription)
+        finally:
+            self._lock.release()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stops delivering events to a callback
+
+        :param subscription:
+            The object returned by subscribe()
+        """
+
+        self._lock.acquire()
+        try:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+        finally:
+            self._lock.release()
+
+    def wants(self, event_name):
+        """
+        :param event_name:
+            A unicode string of an event name
+
+        :return:
+            A boolean - if any subscriber receives the event
+        """
+
+        self._lock.acquire()
+        try:
+            for _, events, _ in self._subscribers:
+                if event_name in events:
+                    return True
+            return False
+        finally:
+            self._lock.release()
+
+    def emit(self, event_name, payload):
+        """
+        Queues an event for delivery
+
+        :param event_name:
+            A unicode string of the event name
+
+        :param payload:
+            The event payload, which must have a task attribute
+        """
+
+        if event_name == 'output_chunk' and self._queue.qsize() >= self.max_queued:
+            self.dropped += 1
+            return
+
+        self._queue.put((event_name, payload))
+
+        self._lock.acquire()
+        try:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        finally:
+            self._lock.release()
+
+    def _run(self):
+        """
+        Delivers queued events
+
+        RUNS IN A THREAD
+        """
+
+        while True:
+            event_name, payload = self._queue.get()
+
+            self._lock.acquire()
+            try:
+                subscribers = list(self._subscribers)
+            finally:
+                self._lock.release()
+
+            for callback, events, tasks in subscribers:
+                if event_name not in events:
+                    continue
+                if tasks is not None and payload.task not in tasks:
+                    continue
+                try:
+                    callback(event_name, payload)
+                except (Exception):
+                    traceback.print_exc()
+
+            if event_name == 'build_complete':
+                try:
+                    package_events.notify('Golang Build', event_name, payload)
+                except (Exception):
+                    traceback.print_exc()
+
+
+# The GolangEventDispatcher() used for all builds
+_EVENTS = GolangEventDispatcher()
+
+
+def subscribe(callback, events=None, tasks=None):
+    """
+    Registers a callback to receive build events, see
+    GolangEventDispatcher.subscribe()
+    """
+
+    return _EVENTS.subscribe(callback, events, tasks)
+
+
+def unsubscribe(subscription):
+    """
+    Stops delivering build events to a callback, see
+    GolangEventDispatcher.unsubscribe()
+    """
+
+    _EVENTS.unsubscribe(subscription)
+
+
+def start_job(window, args, working_dir=None):
+    """
+    Runs the go tool in the background, without using the output panel, so
+    that other packages may run many commands concurrently
+
+    :param window:
+        A sublime.Window object used to find settings, and the working
+        directory if one is not specified
+
+    :param args:
+        A list of unicode strings of the arguments for the go tool, such as
+        ["vet", "./..."]
+
+    :param working_dir:
+        None or a unicode string of the directory to run the go tool in
+
+    :return:
+        None if the go tool could not be found, in which case the user was
+        shown an error, otherwise a GolangJob() object
+    """
+
+    if working_dir is None:
+        working_dir = _determine_working_dir(window)
+        if working_dir is None:
+            return None
+
+    go_bin, env = _get_config(
+        'go',
+        set(['GOPATH']),
+        GO_ENV_VARS - set(['GOPATH']),
+        view=window.active_view(),
+        window=window,
+    )
+    if (go_bin, env) == (None, None):
+        return None
+
+    return GolangJob(GolangProcess([go_bin] + list(args), working_dir, env, args[0] if args else None))
+
+
+class GolangJob():
+
+    """
+    A handle for a GolangProcess() started by start_job(), similar to a
+    concurrent.futures.Future. The output is collected in a background thread
+    and may be iterated over while the process is running.
+    """
+
+    # The GolangProcess() being run
+    proc = None
+
+    # A list of unicode strings of the complete lines of output so far
+    output = None
+
+    # A list of TestEvent() objects parsed from the output so far
+    events = None
+
+    # A threading.Condition() that is notified when output arrives or the
+    # job finishes
+    _condition = None
+
+    # A boolean - if all output has been collected
+    _done = False
+
+    # A list of callables to call once the job is done
+    _callbacks = None
+
+    # A unicode string of output that does not yet end in a newline
+    _partial = ''
+
+    # A GolangTestEventHandler() that parses the output
+    _test_parser = None
+
+    def __init__(self, proc):
+        """
+        :param proc:
+            A GolangProcess() object
+        """
+
+        self.proc = proc
+        self.output = []
+        self.events = []
+        self._callbacks = []
+        self._condition = threading.Condition()
+        self._test_parser = GolangTestEventHandler(proc.task, proc.cwd, self.events.append)
+
+        thread = threading.Thread(target=self._collect)
+        thread.start()
+
+    @property
+    def result(self):
+        """
+        None while running, otherwise a unicode string of "success", "error"
+        or "cancelled"
+        """
+
+        return self.proc.result if self._done else None
+
+    @property
+    def exit_code(self):
+        """
+        None while running or if cancelled, otherwise an integer
+        """
+
+        return self.proc.returncode if self._done else None
+
+    @property
+    def started(self):
+        """
+        A float of the unix timestamp of when the process was started
+        """
+
+        return self.proc.started
+
+    @property
+    def finished(self):
+        """
+        None while running, otherwise a float of the unix timestamp of when
+        the process ended
+        """
+
+        return self.proc.finished if self._done else None
+
+    @property
+    def runtime(self):
+        """
+        A float of the number of seconds the process has been, or was, running
+        """
+
+        return (self.finished or time.time()) - self.proc.started
+
+    def done(self):
+        """
+        :return:
+            A boolean - if the process has finished and all output has been
+            collected
+        """
+
+        return self._done
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the job is done
+
+        :param timeout:
+            None or a float of the maximum number of seconds to wait
+
+        :return:
+            None if the timeout expired, otherwise the result
+        """
+
+        deadline = None if timeout is None else time.time() + timeout
+        self._condition.acquire()
+        try:
+            while not self._done:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+        finally:
+            self._condition.release()
+        return self.result
+
+    def cancel(self):
+        """
+        Terminates the process and any processes it started
+        """
+
+        if not self.proc.finished:
+            self.proc.terminate()
+
+    def add_done_callback(self, callback):
+        """
+        Registers a callable to be called with the GolangJob() once it is
+        done. If the job is already done, it is called immediately, otherwise
+        it is called from the thread collecting the output.
+
+        :param callback:
+            A callable accepting one argument
+        """
+
+        self._condition.acquire()
+        try:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        finally:
+            self._condition.release()
+        callback(self)
+
+    def lines(self):
+        """
+        Iterates over the lines of output, blocking for more until the job
+        is done. May be called any number of times.
+
+        :return:
+            A generator of unicode strings, without line endings
+        """
+
+        return self._iterate(self.output)
+
+    def test_events(self):
+        """
+        Iterates over the tests that start, pass, fail or are skipped,
+        blocking for more until the job is done. May be called any number of
+        times.
+
+        :return:
+            A generator of TestEvent() objects
+        """
+
+        return self._iterate(self.events)
+
+    def _iterate(self, items):
+        """
+        :param items:
+            The list to yield the elements of as it grows
+
+        :return:
+            A generator of the elements of the list
+        """
+
+        index = 0
+        while True:
+            self._condition.acquire()
+            try:
+                while index >= len(items) and not self._done:
+                    self._condition.wait()
+                available = items[index:]
+                done = self._done
+            finally:
+                self._condition.release()
+            for item in available:
+                yield item
+            index += len(available)
+            if done and index >= len(items):
+                return
+
+    def _collect(self):
+        """
+        Reads the output of the process until it exits
+
+        RUNS IN A THREAD
+        """
+
+        while True:
+            message_type, message = self.proc.output.get()
+            if message_type == 'eof':
+                break
+            if message_type not in set(['stdout', 'stderr']) or self.proc.result == 'cancelled':
+                continue
+
+            lines = (self._partial + message).split('\n')
+            self._partial = lines.pop()
+            self._condition.acquire()
+            try:
+                self._test_parser.feed(message)
+                self.output.extend([line.rstrip('\r') for line in lines])
+                self._condition.notify_all()
+            finally:
+                self._condition.release()
+
+        self._condition.acquire()
+        try:
+            if self._partial:
+                self.output.append(self._partial)
+                self._partial = ''
+            self._test_parser.finish(self.proc)
+            self._done = True
+            callbacks = self._callbacks
+            self._callbacks = []
+            self._condition.notify_all()
+        finally:
+            self._condition.release()
+
+        for callback in callbacks:
+            try:
+                callback(self)
+            except (Exception):
+                traceback.print_exc()
+
+
+class GolangTestEventHandler():
+
+    """
+    A GolangProcessPrinter() handler that parses the output of "go test", in
+    either the -v or -json format, and emits a "test_event" for each test
+    that starts, passes, fails or is skipped, and for each package result
+    """
+
+    # A unicode string of the task the tests are run for
+    task = None
+
+    # A unicode string of the working directory of the tests
+    cwd = None
+
+    # None or a callable that is passed each TestEvent() instead of it being
+    # emitted to subscribers
+    callback = None
+
+    # A unicode string of output that does not yet end in a newline
+    _partial = ''
+
+    def __init__(self, task, cwd, callback=None):
+        """
+        :param task:
+            A unicode string of the task the tests are run for
+
+        :param cwd:
+            A unicode string of the working directory of the tests
+
+        :param callback:
+            None or a callable to pass each TestEvent() to, instead of
+            emitting a "test_event"
+        """
+
+        self.task = task
+        self.cwd = cwd
+        self.callback = callback
+
+    def feed(self, output):
+        """
+        Parses complete lines of output
+
+        :param output:
+            A unicode string of output
+        """
+
+        lines = (self._partial + output).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._parse(line.rstrip('\r'))
+
+    def finish(self, proc):
+        """
+        Parses the final line of output
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            An empty unicode string
+        """
+
+        if self._partial:
+            self._parse(self._partial)
+            self._partial = ''
+        return ''
+
+    def _parse(self, line):
+        """
+        Emits an event if the line describes a test or package result
+
+        :param line:
+            A unicode string of a line of output
+        """
+
+        if line.startswith('{'):
+            try:
+                data = json.loads(line)
+            except (ValueError):
+                return
+            if not isinstance(data, dict) or data.get('Action') not in set(['run', 'pass', 'fail', 'skip']):
+                return
+            self._emit(data['Action'], data.get('Package', ''), data.get('Test'), data.get('Elapsed'))
+            return
+
+        match = _TEST_RESULT_RE.match(line)
+        if match:
+            action, test, elapsed = match.groups()
+            self._emit(action.lower(), '', test, float(elapsed) if elapsed else None)
+            return
+
+        match = _TEST_RUN_RE.match(line)
+        if match:
+            self._emit('run', '', match.group(1), None)
+            return
+
+        match = _PACKAGE_RESULT_RE.match(line)
+        if match:
+            action, package, elapsed = match.groups()
+            action = 'pass' if action == 'ok' else action.lower()
+            self._emit(action, package, None, float(elapsed) if elapsed else None)
+
+    def _emit(self, action, package, test, elapsed):
+        """
+        Queues a "test_event", or passes it to the callback
+        """
+
+        event = TestEvent(
+            task=self.task,
+            working_dir=self.cwd,
+            action=action,
+            package=package,
+            test=test,
+            elapsed=elapsed
+        )
+        if self.callback:
+            self.callback(event)
+        else:
+            _EVENTS.emit('test_event', event)
+
+
+def _event_env(env):
+    """
+    Copies the Go-related variables of a process environment for an event
+
+    :param env:
+        A dict of the environment variables of a process
+
+    :return:
+        A dict of unicode strings of the variables named in GO_ENV_VARS
+    """
+
+    result = {}
+    for var_name in GO_ENV_VARS:
+        var_key = var_name if sys.version_info >= (3,) else var_name.encode('ascii')
+        if var_key in env:
+            result[var_name] = _env_value(env, var_name)
+    return result
+
+
+class GolangWatchdog():
+
+    """
+    A GolangProcessPrinter() handler that watches a process for hangs. If the
+    process runs longer than its timeout, or produces no output for longer
+    than its idle timeout, SIGQUIT is sent to the programs go started, such
+    as the test binary, so that Go prints the stacks of all goroutines. The
+    dump is captured from the output and summarized by grouping identical
+    stacks, and the process group is only killed if it does not exit.
+    """
+
+    # The GolangProcess() being watched
+    proc = None
+
+    # None or an integer of the number of seconds the process may run for
+    timeout = None
+
+    # None or an integer of the number of seconds the process may run for
+    # without producing output
+    idle_timeout = None
+
+    # None, or once the watchdog has tripped, a unicode string of the reason
+    reason = None
+
+    # A list of two-element tuples of (integer pid, unicode string name) of
+    # the processes SIGQUIT was sent to
+    signalled = None
+
+    # A list of unicode strings of the output received after tripping
+    _dump = None
+
+    def __init__(self, proc, timeout=None, idle_timeout=None):
+        """
+        :param proc:
+            The GolangProcess() to watch
+
+        :param timeout:
+            None or an integer of the number of seconds the process may run
+
+        :param idle_timeout:
+            None or an integer of the number of seconds the process may run
+            without producing output
+        """
+
+        self.proc = proc
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.signalled = []
+        self._dump = []
+
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def feed(self, output):
+        """
+        Captures output once the watchdog has tripped
+
+        :param output:
+            A unicode string of output
+        """
+
+        if self.reason:
+            self._dump.append(output)
+
+    def finish(self, proc):
+        """
+        Summarizes any goroutine dump that was captured
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the section to display
+        """
+
+        if not self.reason:
+            return ''
+
+        if not self.signalled:
+            return '> Watchdog: %s, killed the process\n' % self.reason
+
+        targets = ', '.join('%s (%d)' % (name, pid) for pid, name in self.signalled)
+        section = '> Watchdog: %s, sent SIGQUIT to %s\n' % (self.reason, targets)
+        return section + _summarize_goroutines(''.join(self._dump))
+
+    def _run(self):
+        """
+        Checks the process every half second until it finishes or a limit
+        is exceeded
+
+        RUNS IN A THREAD
+        """
+
+        proc = self.proc
+        while not proc.finished:
+            now = time.time()
+            if self.timeout and now - proc.started > self.timeout:
+                self._trip('still running after %ds' % self.timeout)
+                return
+            if self.idle_timeout and now - proc.last_output > self.idle_timeout:
+                self._trip('no output for %ds' % self.idle_timeout)
+                return
+            time.sleep(0.5)
+
+    def _trip(self, reason):
+        """
+        Requests a goroutine dump and kills the process group if it does not
+        exit within _WATCHDOG_GRACE seconds
+
+        RUNS IN A THREAD
+
+        :param reason:
+            A unicode string of why the watchdog tripped
+        """
+
+        popen = self.proc.proc
+        if popen is None and self.proc.finished:
+            return
+
+        self.reason = reason
+        sublime.set_timeout(lambda: sublime.status_message('Golang Build: %s, dumping goroutines' % reason), 1)
+
+        # Objects such as a GolangTestRepeater() have no single subprocess
+        # to signal, and so are only terminated
+        if sys.platform != 'win32' and popen is not None:
+            # Since go is started in a new session, the programs it runs,
+            # such as the compiled test binary, share its process group
+            members = _process_group_members(popen.pid)
+            targets = [member for member in members if member[0] != popen.pid]
+            if not targets:
+                targets = [member for member in members if member[0] == popen.pid]
+            for pid, name in targets:
+                try:
+                    os.kill(pid, signal.SIGQUIT)
+                    self.signalled.append((pid, name))
+                except (OSError):
+                    pass
+
+        if self.signalled:
+            deadline = time.time() + _WATCHDOG_GRACE
+            while not self.proc.finished and time.time() < deadline:
+                time.sleep(0.1)
+
+        if not self.proc.finished:
+            self.proc.terminate()
+
+
+def _process_group_members(pgid):
+    """
+    Finds the processes in a process group
+
+    :param pgid:
+        An integer of the process group id
+
+    :return:
+        A list of two-element tuples of (integer pid, unicode string name)
+    """
+
+    members = []
+
+    if os.path.isdir('/proc/self'):
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open('/proc/%s/stat' % entry, 'rb') as f:
+                    stat = f.read().decode('utf-8', 'replace')
+            except (IOError, OSError):
+                # The process exited while listing
+                continue
+            # The name is in parentheses and may itself contain spaces
+            name_end = stat.rfind(')')
+            fields = stat[name_end + 2:].split(' ')
+            if len(fields) > 2 and fields[2] == str_cls(pgid):
+                members.append((int(entry), stat[stat.find('(') + 1:name_end]))
+        return members
+
+    returncode, output = _run_capture(['ps', '-A', '-o', 'pid=,pgid=,comm='], None, None)
+    if returncode != 0:
+        return members
+    for line in output.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) == 3 and parts[1] == str_cls(pgid):
+            members.append((int(parts[0]), os.path.basename(parts[2])))
+    return members
+
+
+def _summarize_goroutines(dump, top=20):
+    """
+    Groups the goroutines in one or more goroutine dumps by their state and
+    stack, and formats the groups with the largest first. Each frame is
+    formatted with its file and line first so it may be navigated to.
+
+    :param dump:
+        A unicode string of output containing goroutine dumps
+
+    :param top:
+        An integer of the number of groups to display
+
+    :return:
+        A unicode string of the summary
+    """
+
+    groups = {}
+    total = 0
+    state = None
+    frames = None
+    function = None
+
+    for line in dump.splitlines() + ['']:
+        line = line.rstrip('\r')
+        match = _GOROUTINE_RE.match(line)
+        if match:
+            # The state may include how long the goroutine has been blocked
+            state = match.group(1).split(',')[0]
+            frames = []
+            function = None
+            continue
+        if frames is None:
+            continue
+
+        if not line.strip():
+            key = (state, tuple(frames))
+            groups[key] = groups.get(key, 0) + 1
+            total += 1
+            frames = None
+            continue
+
+        if line.startswith('\t'):
+            match = _GOROUTINE_LOCATION_RE.match(line)
+            if match and function:
+                frames.append((match.group(1), function))
+            function = None
+            continue
+
+        match = _GOROUTINE_FUNCTION_RE.match(line)
+        function = match.group(1) if match else line
+
+    if not total:
+        return '> Goroutines: no goroutine dump was captured\n'
+
+    section = '> Goroutines: %d in %d distinct stacks\n' % (total, len(groups))
+    ordered = sorted(groups.items(), key=lambda item: (-item[1], item[0]))
+    for (state, frames), count in ordered[:top]:
+        section += '>\n> %d %s [%s]\n' % (count, 'goroutine' if count == 1 else 'goroutines', state)
+        for location, function in frames:
+            section += '%s: %s\n' % (location, function)
+    if len(ordered) > top:
+        section += '>\n> %d more stacks not shown\n' % (len(ordered) - top)
+    return section
+
+
+class GolangProcessGroup():
+
+    """
+    Has the same interface as GolangProcess(), but runs a number of go
+    processes, so that the GolangProcessPrinter() may display them as a
+    single build. Subclasses must implement _run(), which is called in a
+    thread with no arguments and returns an integer exit code for the group,
+    and use _start() to start each GolangProcess() so that they are all
+    terminated when the group is cancelled.
+    """
+
+    # A unicode string of the build task the processes are for
+    task = None
+
+    # A float of the unix timestamp of when the group was started
+    started = None
+
+    # A list of strings describing the command, displayed in the header
+    args = None
+
+    # A unicode string of the working directory of the processes
+    cwd = None
+
+    # A dict of the env passed to the processes
+    env = None
+
+    # Always None, since there is no single subprocess to signal
+    proc = None
+
+    # A queue.Queue object of output
+    output = None
+
+    # The result, a unicode string of "cancelled", "success" or "error"
+    result = None
+
+    # None or an integer of the exit code of the group, once finished
+    returncode = None
+
+    # Always None, since the resources of the processes are not combined
+    resources = None
+
+    # False while running, then a float of the unix timestamp of when the
+    # last process ended
+    finished = None
+
+    # A float of the unix timestamp of when output was last written
+    last_output = None
+
+    # A threading.Lock() protecting the state of the group
+    _lock = None
+
+    # A set of the GolangProcess() objects currently running
+    _running = None
+
+    def __init__(self, args, cwd, env, task):
+        """
+        :param args:
+            A list of strings describing the command
+
+        :param cwd:
+            A unicode string of the working directory
+
+        :param env:
+            A dict of the environment variables for the processes
+
+        :param task:
+            A unicode string of the build task the processes are for
+        """
+
+        self.task = task
+        self.args = args
+        self.cwd = cwd
+        self.env = env
+        self.output = queue.Queue()
+        self._lock = threading.Lock()
+        self._running = set()
+
+        self.started = time.time()
+        self.last_output = self.started
+        self.finished = False
+
+        self._thread = threading.Thread(target=self._run_group)
+        self._thread.start()
+
+    def wait(self):
+        """
+        Blocks waiting for all of the processes to complete
+        """
+
+        self._thread.join()
+
+    def terminate(self):
+        """
+        Terminates the processes in progress, and prevents more from starting
+        """
+
+        self._lock.acquire()
+        try:
+            if self.finished:
+                return
+            self.result = 'cancelled'
+            self.finished = time.time()
+            running = list(self._running)
+        finally:
+            self._lock.release()
+
+        for proc in running:
+            if not proc.finished:
+                proc.terminate()
+
+        self.output.put(('cancelled', None))
+
+    def _run_group(self):
+        """
+        Calls _run() and then marks the group as finished
+
+        RUNS IN A THREAD
+        """
+
+        returncode = self._run()
+
+        self._lock.acquire()
+        try:
+            if self.result == 'cancelled':
+                return
+            self.returncode = returncode
+            self.result = 'success' if returncode == 0 else 'error'
+            self.finished = time.time()
+        finally:
+            self._lock.release()
+        self.output.put(('eof', None))
+
+    def _start(self, args):
+        """
+        Starts a process unless the group has been cancelled
+
+        :param args:
+            A list of strings of the process path and arguments
+
+        :return:
+            None if cancelled, otherwise a GolangProcess() object
+        """
+
+        self._lock.acquire()
+        try:
+            if self.result == 'cancelled':
+                return None
+            proc = GolangProcess(args, self.cwd, self.env, self.task)
+            self._running.add(proc)
+            return proc
+        finally:
+            self._lock.release()
+
+    def _read(self, proc, callback):
+        """
+        Passes each chunk of output of a process to a callback until it
+        finishes, and then stops tracking it
+
+        :param proc:
+            A GolangProcess() object returned by _start()
+
+        :param callback:
+            A callable accepting two unicode strings, the output type and
+            the output
+        """
+
+        while True:
+            message_type, message = proc.output.get()
+            if message_type in set(['eof', 'cancelled']):
+                break
+            callback(message_type, message)
+        proc.wait()
+
+        self._lock.acquire()
+        try:
+            self._running.discard(proc)
+        finally:
+            self._lock.release()
+
+    def _write(self, output, output_type='stdout'):
+        """
+        Adds output to the queue
+
+        :param output:
+            A unicode string of output
+
+        :param output_type:
+            A unicode string of "stdout" or "stderr"
+        """
+
+        self.last_output = time.time()
+        self.output.put((output_type, output))
+
+
+class GolangTestRepeater(GolangProcessGroup):
+
+    """
+    Compiles a test binary once with "go test -c" and then runs it a number
+    of times, with a limited number of runs at a time. Instead of the output
+    of each run, a line describing its result is written to the output queue,
+    followed by a summary of the pass rate, durations and failure messages.
+    """
+
+    # A unicode string of the path the test binary is written to
+    binary_path = None
+
+    # A list of strings of the arguments for the test binary
+    test_args = None
+
+    # An integer of the number of times to run the tests
+    count = None
+
+    # An integer of the number of runs to execute at once
+    parallel = None
+
+    # A list of four-element tuples of (boolean passed, float seconds,
+    # None or a unicode string of the failure message, None or a unicode
+    # string of the -test.shuffle seed) for each run
+    runs = None
+
+    # An integer of the number of runs that have been started
+    _launched = 0
+
+    def __init__(self, go_bin, binary_path, build_flags, test_args, count, parallel, cwd, env, task='flaky'):
+        """
+        :param go_bin:
+            A unicode string of the path to the "go" executable
+
+        :param binary_path:
+            A unicode string of the path to write the test binary to
+
+        :param build_flags:
+            A list of unicode strings of flags for "go test -c"
+
+        :param test_args:
+            A list of unicode strings of arguments for the test binary
+
+        :param count:
+            An integer of the number of times to run the tests
+
+        :param parallel:
+            An integer of the number of runs to execute at once
+
+        :param cwd:
+            A unicode string of the working directory
+
+        :param env:
+            A dict of the environment variables for the processes
+
+        :param task:
+            A unicode string of the build task the runs are for
+        """
+
+        self.binary_path = binary_path
+        self.test_args = test_args
+        self.count = count
+        self.parallel = parallel
+        self.runs = []
+
+        args = [go_bin, 'test', '-c', '-o', binary_path] + build_flags
+        GolangProcessGroup.__init__(self, args, cwd, env, task)
+
+    def _run(self):
+        """
+        Compiles the test binary and then runs it
+
+        RUNS IN A THREAD
+
+        :return:
+            An integer of 0 if all runs passed, otherwise 1 or the exit code
+            of "go test -c"
+        """
+
+        try:
+            returncode = self._compile()
+            if returncode is not None:
+                return returncode
+
+            threads = []
+            for _ in range(min(self.parallel, self.count)):
+                thread = threading.Thread(target=self._run_tests)
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        finally:
+            shutil.rmtree(os.path.dirname(self.binary_path), True)
+
+        if self.result == 'cancelled':
+            return 1
+        self._write(self._summary())
+        return 0 if all(run[0] for run in self.runs) else 1
+
+    def _compile(self):
+        """
+        Runs "go test -c", passing its output through
+
+        RUNS IN A THREAD
+
+        :return:
+            None if the test binary was written, otherwise an integer exit
+            code for the group
+        """
+
+        proc = self._start(self.args)
+        if proc is None:
+            return 1
+        self._read(proc, lambda message_type, message: self._write(message, message_type))
+
+        if proc.result != 'success':
+            return 1 if proc.returncode is None else proc.returncode
+        # "go test -c" does not write a binary for a package without tests
+        if not os.path.exists(self.binary_path):
+            self._write('> No tests to run\n')
+            return 0
+        return None
+
+    def _run_tests(self):
+        """
+        Runs the test binary until the required number of runs have been
+        started
+
+        RUNS IN A THREAD
+        """
+
+        while True:
+            self._lock.acquire()
+            try:
+                if self._launched >= self.count:
+                    return
+                self._launched += 1
+            finally:
+                self._lock.release()
+
+            proc = self._start([self.binary_path] + self.test_args)
+            if proc is None:
+                return
+
+            chunks = []
+            self._read(proc, lambda message_type, message: chunks.append(message))
+
+            output = ''.join(chunks)
+            passed = proc.result == 'success'
+            failure = None if passed else _test_failure(output, proc.returncode)
+            runtime = proc.finished - proc.started
+            match = _SHUFFLE_SEED_RE.search(output)
+            seed = match.group(1) if match else None
+
+            self._lock.acquire()
+            try:
+                if self.result == 'cancelled':
+                    return
+                self.runs.append((passed, runtime, failure, seed))
+                number = len(self.runs)
+            finally:
+                self._lock.release()
+
+            line = '> Run %d of %d: %s in %0.3fs' % (number, self.count, 'pass' if passed else 'FAIL', runtime)
+            if failure:
+                line += ' - %s' % failure
+            self._write(line + '\n')
+
+    def _summary(self):
+        """
+        Formats the pass rate, the spread of durations and the distinct
+        failure messages of the runs
+
+        :return:
+            A unicode string of the summary
+        """
+
+        passed = len([run for run in self.runs if run[0]])
+        total = len(self.runs)
+        durations = sorted(run[1] for run in self.runs)
+
+        output = '> Flakiness: %d of %d runs passed (%0.1f%%)\n' % (
+            passed,
+            total,
+            passed / total * 100 if total else 0
+        )
+        if durations:
+            output += '> Durations: min %0.3fs, median %0.3fs, p90 %0.3fs, max %0.3fs\n' % (
+                durations[0],
+                durations[len(durations) // 2],
+                durations[min(len(durations) - 1, int(len(durations) * 0.9))],
+                durations[-1]
+            )
+
+        # Failures with the same message, apart from any numbers in it, are
+        # grouped, with the first example displayed
+        groups = {}
+        for _, _, failure, seed in self.runs:
+            if failure is None:
+                continue
+            key = _NUMBER_RE.sub('#', failure)
+            if key not in groups:
+                groups[key] = [len(groups), failure, seed, 0]
+            groups[key][3] += 1
+
+        if groups:
+            output += '> Failures:\n'
+        for _, failure, seed, count in sorted(groups.values(), key=lambda group: (-group[3], group[0])):
+            runs = '%d of %d runs' % (count, total)
+            if seed:
+                runs += ', first with -test.shuffle %s' % seed
+            # A failure message with a file position is written first so
+            # that it may be navigated to
+            if _DIAGNOSTIC_RE.match(failure):
+                output += '%s (%s)\n' % (failure, runs)
+            else:
+                output += '>   %s: %s\n' % (runs, failure)
+        return output
+
+
+def _test_failure(output, returncode):
+    """
+    Finds the message that best describes why a run of a test binary failed
+
+    :param output:
+        A unicode string of the output of the test binary
+
+    :param returncode:
+        None or an integer of the exit code of the test binary
+
+    :return:
+        A unicode string of the failure message
+    """
+
+    lines = output.splitlines()
+    if 'WARNING: DATA RACE' in lines:
+        return 'data race detected'
+
+    for line in lines:
+        if line.startswith('panic: '):
+            return line
+
+    for index, line in enumerate(lines):
+        match = _TEST_RESULT_RE.match(line)
+        if not match or match.group(1) != 'FAIL':
+            continue
+        # The messages logged by the test are indented below the result,
+        # along with the results of any subtests
+        for message in lines[index + 1:]:
+            if not message.startswith('    '):
+                break
+            if message.strip() and not _TEST_RESULT_RE.match(message):
+                return message.strip()
+        return '%s failed' % match.group(2)
+
+    if returncode is None:
+        return 'could not be run'
+    return 'exited with code %d' % returncode
+
+
+class GolangFuzzer(GolangProcessGroup):
+
+    """
+    Runs "go test -fuzz" for one or more fuzz targets at once, dividing the
+    fuzzing workers between them. The periodic statistics lines are displayed
+    in the status bar rather than the output panel, and once done, each
+    target's executions and new corpus entries are summarized. A crash is
+    written with the file and line of the failure first, so it may be
+    navigated to, followed by the path of the failing input.
+    """
+
+    # A list of three-element tuples of (unicode string target name,
+    # unicode string file path, integer line) of the targets to fuzz
+    targets = None
+
+    # A dict with unicode string keys of target names, and values of dicts
+    # with the keys "execs", "rate", "new", "total", "workers" and "crash",
+    # only modified while holding _lock
+    stats = None
+
+    # A list of unicode strings of the flags for each "go test" process,
+    # which are followed by -fuzz and the target
+    _flags = None
+
+    def __init__(self, go_bin, targets, fuzz_time, workers, build_flags, cwd, env, task='fuzz'):
+        """
+        :param go_bin:
+            A unicode string of the path to the "go" executable
+
+        :param targets:
+            A list of three-element tuples of (unicode string target name,
+            unicode string file path, integer line)
+
+        :param fuzz_time:
+            A unicode string of the -fuzztime value for each target
+
+        :param workers:
+            An integer of the number of fuzzing workers to divide between
+            the targets
+
+        :param build_flags:
+            A list of unicode strings of flags for "go test"
+
+        :param cwd:
+            A unicode string of the working directory
+
+        :param env:
+            A dict of the environment variables for the processes
+
+        :param task:
+            A unicode string of the build task the processes are for
+        """
+
+        self.targets = targets
+        self.stats = {}
+        for name, _, _ in targets:
+            self.stats[name] = {'execs': 0, 'rate': 0, 'new': 0, 'total': 0, 'workers': 0, 'crash': None}
+
+        parallel = max(1, workers // len(targets))
+        self._flags = [go_bin, 'test', '-run', '^$', '-fuzztime', fuzz_time, '-parallel', str_cls(parallel)]
+        self._flags.extend(build_flags)
+
+        # A separate process is started for each target, since "go test"
+        # only fuzzes one target at a time
+        names = [name for name, _, _ in targets]
+        pattern = '^%s$' % (names[0] if len(names) == 1 else '(%s)' % '|'.join(names))
+        GolangProcessGroup.__init__(self, self._flags + ['-fuzz', pattern], cwd, env, task)
+
+    def _run(self):
+        """
+        Fuzzes each target in its own thread
+
+        RUNS IN A THREAD
+
+        :return:
+            An integer of 0 if no target failed, otherwise 1
+        """
+
+        results = []
+        threads = []
+        for target in self.targets:
+            thread = threading.Thread(target=self._fuzz, args=(target, results))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        if self.result == 'cancelled':
+            return 1
+        self._write(self._summary())
+        return 0 if all(results) else 1
+
+    def _fuzz(self, target, results):
+        """
+        Runs "go test -fuzz" for a target, writing its output apart from the
+        statistics lines
+
+        RUNS IN A THREAD
+
+        :param target:
+            A three-element tuple of (unicode string target name, unicode
+            string file path, integer line)
+
+        :param results:
+            A list to append a boolean to, indicating if the target passed
+        """
+
+        name = target[0]
+        proc = self._start(self._flags + ['-fuzz', '^%s$' % name])
+        if proc is None:
+            return
+
+        lines = []
+        state = {'partial': ''}
+
+        def on_output(message_type, message):
+            text = state['partial'] + message
+            complete = text.split('\n')
+            state['partial'] = complete.pop()
+            output = ''
+            for line in complete:
+                lines.append(line)
+                if self._parse_stats(name, line):
+                    continue
+                output += line + '\n'
+            if output:
+                self._write(output, message_type)
+
+        self._read(proc, on_output)
+        if state['partial']:
+            lines.append(state['partial'])
+            self._write(state['partial'] + '\n')
+
+        passed = proc.result == 'success'
+        if not passed and proc.result != 'cancelled':
+            crash = _fuzz_crash('\n'.join(lines), proc.returncode, self.cwd, target)
+            self._lock.acquire()
+            try:
+                self.stats[name]['crash'] = crash
+            finally:
+                self._lock.release()
+        results.append(passed)
+
+    def _parse_stats(self, name, line):
+        """
+        Records the statistics from a line of "go test -fuzz" output and
+        displays them in the status bar
+
+        :param name:
+            A unicode string of the target name
+
+        :param line:
+            A unicode string of a line of output
+
+        :return:
+            A boolean - if the line should not be written to the panel
+        """
+
+        if not line.startswith('fuzz: elapsed: '):
+            return False
+
+        match = _FUZZ_STATS_RE.match(line)
+        if match:
+            update = {
+                'execs': int(match.group(1)),
+                'rate': int(match.group(2)),
+                'new': int(match.group(3)),
+                'total': int(match.group(4)),
+            }
+        else:
+            match = _FUZZ_WORKERS_RE.search(line)
+            if not match:
+                return True
+            update = {'workers': int(match.group(1))}
+
+        # Each target is fuzzed in its own thread, so the statistics of the
+        # other targets may be changing
+        status = []
+        self._lock.acquire()
+        try:
+            self.stats[name].update(update)
+            for target_name, _, _ in self.targets:
+                target_stats = self.stats[target_name]
+                status.append('%s %d execs/s, %d new' % (target_name, target_stats['rate'], target_stats['new']))
+        finally:
+            self._lock.release()
+        message = 'Golang Build: fuzzing ' + '; '.join(status)
+        sublime.set_timeout(lambda: sublime.status_message(message), 1)
+        return True
+
+    def _summary(self):
+        """
+        Formats the statistics of each target and any crashes
+
+        :return:
+            A unicode string of the summary
+        """
+
+        output = ''
+        for name, _, _ in self.targets:
+            stats = self.stats[name]
+            output += '> %s: %d execs with %d workers, %d new interesting inputs (%d in corpus), %s\n' % (
+                name,
+                stats['execs'],
+                stats['workers'],
+                stats['new'],
+                stats['total'],
+                'crashed' if stats['crash'] else 'no crash found'
+            )
+        for name, _, _ in self.targets:
+            crash = self.stats[name]['crash']
+            if crash:
+                location, message, input_path = crash
+                output += '%s: %s crashed: %s' % (location, name, message)
+                if input_path:
+                    output += ', input written to %s' % input_path
+                output += '\n'
+        return output
+
+
+def _fuzz_targets(view, working_dir):
+    """
+    Finds the fuzz targets to run - the one the cursor is in, or otherwise
+    all of those in the package
+
+    :param view:
+        None or a sublime.View object
+
+    :param working_dir:
+        A unicode string of the package directory
+
+    :return:
+        A list of three-element tuples of (unicode string target name,
+        unicode string file path, integer line)
+    """
+
+    selected = _function_at_cursor(view, 'Fuzz')
+
+    targets = []
+    for file_name in sorted(os.listdir(working_dir)):
+        if not file_name.endswith('_test.go'):
+            continue
+        file_path = os.path.join(working_dir, file_name)
+        try:
+            with open(file_path, 'rb') as f:
+                source = f.read().decode('utf-8', 'replace')
+        except (IOError, OSError):
+            continue
+        for match in _FUZZ_TARGET_RE.finditer(source):
+            name = match.group(1)
+            if selected and name != selected:
+                continue
+            targets.append((name, file_path, source.count('\n', 0, match.start()) + 1))
+    return targets
+
+
+def _fuzz_crash(output, returncode, cwd, target):
+    """
+    Finds the location, message and failing input of a fuzz target failure
+
+    :param output:
+        A unicode string of the output of "go test -fuzz"
+
+    :param returncode:
+        None or an integer of the exit code of "go test -fuzz"
+
+    :param cwd:
+        A unicode string of the package directory
+
+    :param target:
+        A three-element tuple of (unicode string target name, unicode string
+        file path, integer line)
+
+    :return:
+        A three-element tuple of (unicode string file and line, unicode
+        string message, None or a unicode string of the failing input path)
+    """
+
+    message = _test_failure(output, returncode)
+    location = None
+
+    # Failures reported by the target include its position, while for
+    # panics it is found in the stack trace
+    match = _DIAGNOSTIC_RE.match(message)
+    if match:
+        message = match.group(4).strip()
+        if os.path.basename(match.group(1)) != 'testing.go':
+            location = '%s:%s' % (match.group(1), match.group(2))
+    if location is None:
+        for frame in _FUZZ_FRAME_RE.finditer(output):
+            if os.path.dirname(frame.group(1)) == cwd:
+                location = '%s:%s' % (frame.group(1), frame.group(2))
+                break
+    if location is None:
+        location = '%s:%d' % (target[1], target[2])
+
+    input_path = None
+    match = _FUZZ_INPUT_RE.search(output)
+    if match:
+        input_path = os.path.join(cwd, match.group(1))
+    return (location, message, input_path)
+
+
+class GolangGetGroup(GolangProcessGroup):
+
+    """
+    Runs "go get" for a number of targets, with a limited number at a time,
+    writing a line as each finishes and a summary once all have. Inside a
+    module, concurrent runs of "go get" would overwrite each other's changes
+    to go.mod, so each downloads into the module cache using a copy of go.mod,
+    and a final "go get" of the successful targets updates the real go.mod.
+    """
+
+    # A list of unicode strings of the targets to get
+    targets = None
+
+    # A list of unicode strings of flags for "go get"
+    flags = None
+
+    # An integer of the number of targets to get at once
+    parallel = None
+
+    # None or a unicode string of the path to the go.mod file of the module
+    # the targets are added to
+    go_mod = None
+
+    # A list of three-element tuples of (unicode string target, boolean
+    # success, None or a unicode string of the error) of each target
+    fetched = None
+
+    # A list of the unicode string targets not yet started
+    _pending = None
+
+    def __init__(self, go_bin, flags, targets, parallel, go_mod, cwd, env, task='get'):
+        """
+        :param go_bin:
+            A unicode string of the path to the "go" executable
+
+        :param flags:
+            A list of unicode strings of flags for "go get"
+
+        :param targets:
+            A list of unicode strings of the targets to get
+
+        :param parallel:
+            An integer of the number of targets to get at once
+
+        :param go_mod:
+            None or a unicode string of the path to the go.mod file of the
+            module the targets are added to
+
+        :param cwd:
+            A unicode string of the working directory
+
+        :param env:
+            A dict of the environment variables for the processes
+
+        :param task:
+            A unicode string of the build task the processes are for
+        """
+
+        self.go_bin = go_bin
+        self.flags = flags
+        self.targets = targets
+        self.parallel = parallel
+        self.go_mod = go_mod
+        self.fetched = []
+        self._pending = list(targets)
+
+        GolangProcessGroup.__init__(self, [go_bin, 'get'] + flags + targets, cwd, env, task)
+
+    def _run(self):
+        """
+        Gets the targets, and then updates go.mod if inside a module
+
+        RUNS IN A THREAD
+
+        :return:
+            An integer of 0 if all targets were fetched, otherwise 1
+        """
+
+        threads = []
+        for _ in range(min(self.parallel, len(self.targets))):
+            thread = threading.Thread(target=self._get_targets)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        if self.result == 'cancelled':
+            return 1
+
+        succeeded = [target for target, success, _ in self.fetched if success]
+        returncode = 0 if len(succeeded) == len(self.targets) else 1
+
+        if self.go_mod and succeeded:
+            # The modules are now in the module cache, so this is quick
+            proc = self._start([self.go_bin, 'get'] + self.flags + succeeded)
+            if proc is None:
+                return 1
+            self._read(proc, lambda message_type, message: self._write(message, message_type))
+            if proc.result != 'success':
+                returncode = 1
+
+        self._write(self._summary())
+        return returncode
+
+    def _get_targets(self):
+        """
+        Runs "go get" for targets until none are left
+
+        RUNS IN A THREAD
+        """
+
+        while True:
+            self._lock.acquire()
+            try:
+                if not self._pending:
+                    return
+                target = self._pending.pop(0)
+            finally:
+                self._lock.release()
+
+            args = [self.go_bin, 'get'] + self.flags
+            temp_dir = None
+            if self.go_mod:
+                temp_dir = tempfile.mkdtemp(prefix='golang-build-get-')
+                shutil.copy(self.go_mod, temp_dir)
+                go_sum = os.path.join(os.path.dirname(self.go_mod), 'go.sum')
+                if os.path.exists(go_sum):
+                    shutil.copy(go_sum, temp_dir)
+                args.append('-modfile=%s' % os.path.join(temp_dir, 'go.mod'))
+            args.append(target)
+
+            try:
+                proc = self._start(args)
+                if proc is None:
+                    return
+                chunks = []
+                self._read(proc, lambda message_type, message: chunks.append(message))
+            finally:
+                if temp_dir:
+                    shutil.rmtree(temp_dir, True)
+
+            if self.result == 'cancelled':
+                return
+
+            error = None
+            success = proc.result == 'success'
+            if not success:
+                lines = [line.strip() for line in ''.join(chunks).splitlines() if line.strip()]
+                error = lines[-1] if lines else 'exited with code %s' % proc.returncode
+
+            self._lock.acquire()
+            try:
+                self.fetched.append((target, success, error))
+                number = len(self.fetched)
+            finally:
+                self._lock.release()
+
+            line = '> [%d/%d] %s %s in %0.1fs' % (
+                number,
+                len(self.targets),
+                'Fetched' if success else 'Failed',
+                target,
+                proc.finished - proc.started
+            )
+            if error:
+                line += ': %s' % error
+            self._write(line + '\n')
+
+    def _summary(self):
+        """
+        Formats the number of targets fetched and any failures
+
+        :return:
+            A unicode string of the summary
+        """
+
+        failed = [(target, error) for target, success, error in self.fetched if not success]
+        output = '> Fetched %d of %d targets in %0.1fs\n' % (
+            len(self.fetched) - len(failed),
+            len(self.targets),
+            time.time() - self.started
+        )
+        for target, error in failed:
+            output += '>   Failed: %s: %s\n' % (target, error)
+        return output
+
+
+class GolangPanel():
+
+    """
+    Holds a reference to an output panel used by the Golang Build package,
+    and provides synchronization features to ensure output is printed in proper
+    order
+    """
+
+    # A sublime.View object of the output panel being printed to
+    panel = None
+
+    # A queue.Queue() that holds all of the info to be written to the panel
+    queue = None
+
+    # A lock used to ensure only on GolangProcessPrinter() is using the panel
+    # at any given time
+    printer_lock = None
+
+    # None or an integer of the maximum number of lines to keep in the panel
+    max_lines = None
+
+    # None or an integer of the maximum number of characters to keep in the
+    # panel
+    max_chars = None
+
+    # None or an integer of the number of characters in the panel above which
+    # syntax highlighting is disabled
+    plain_text_threshold = None
+
+    # None or a unicode string of the path to the file containing the full,
+    # untrimmed output. Only used when max_lines or max_chars is set.
+    log_path = None
+
+    # An integer of the number of lines that have been trimmed from the start
+    # of the panel
+    trimmed_lines = 0
+
+    # A file object the full output is written to, and a threading.Lock() to
+    # synchronize writes to it
+    _log_file = None
+    _log_lock = None
+
+    # A unicode string of the last characters written to the log file, used
+    # to apply content separators
+    _log_tail = ''
+
+    def __init__(self, window):
+        """
+        :param window:
+            The sublime.Window object the output panel is contained within
+        """
+
+        self.printer_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.reset(window)
+
+    def close(self):
+        """
+        Closes and removes the log file, once the window has been closed
+        """
+
+        self._log_lock.acquire()
+        try:
+            if self._log_file:
+                self._log_file.close()
+                self._log_file = None
+                try:
+                    os.remove(self.log_path)
+                except (OSError):
+                    pass
+        finally:
+            self._log_lock.release()
+
+    def reset(self, window):
+        """
+        Creates a new, fresh output panel and output Queue object
+
+        :param window:
+            The sublime.Window object the output panel is contained within
+        """
+
+        if not isinstance(threading.current_thread(), threading._MainThread):
+            raise RuntimeError('GolangPanel.reset() must be run in the UI thread')
+
+        self.queue = queue.Queue()
+        self.panel = window.get_output_panel('golang_build')
+        self.trimmed_lines = 0
+
+        self.max_lines = _positive_int_setting('output:max_lines', window)
+        self.max_chars = _positive_int_setting('output:max_chars', window)
+        self.plain_text_threshold = _positive_int_setting('output:plain_text_threshold', window)
+
+        self._log_lock.acquire()
+        try:
+            if self._log_file:
+                self._log_file.close()
+                self._log_file = None
+            self._log_tail = ''
+            if self.max_lines or self.max_chars:
+                self.log_path = os.path.join(_data_dir('logs'), '%s.log' % window.id())
+                self._log_file = io.open(self.log_path, 'w', encoding='utf-8')
+        finally:
+            self._log_lock.release()
+
+        st_settings = sublime.load_settings('Preferences.sublime-settings')
+        panel_settings = self.panel.settings()
         panel_settings.set('syntax', 'Packages/Golang Build/Golang Build Output.tmLanguage')
         panel_settings.set('color_scheme', st_settings.get('color_scheme'))
         panel_settings.set('result_file_regex', '^(.+\.go):([0-9]+):(?:([0-9]+):)?\s*(.*)')
@@ -927,74 +6129,2739 @@ class GolangPanel():
         panel_settings.set('line_numbers', False)
         panel_settings.set('gutter', False)
         panel_settings.set('scroll_past_end', False)
+        self.panel.set_scratch(True)
+
+    def set_base_dir(self, cwd):
+        """
+        Set the directory the process is being run in, for the sake of result
+        navigation
+
+        :param cwd:
+            A unicode string of the working directory
+        """
+
+        def _update_settings():
+            self.panel.settings().set('result_base_dir', cwd)
+        sublime.set_timeout(_update_settings, 1)
+
+    def write(self, string, content_separator=None, event=None):
+        """
+        Queues data to be written to the output panel. Normally this will be
+        called from a thread other than the UI thread.
+
+        :param string:
+            A unicode string to write to the output panel
+
+        :param content_separator:
+            A unicode string to prefix to the string param if there is already
+            output in the output panel. Is only prefixed if the previous number
+            of characters are not equal to this string.
+
+        :param event:
+            An optional threading.Event() object to set once the data has been
+            written to the output panel
+        """
+
+        self._log_lock.acquire()
+        try:
+            if self._log_file:
+                if content_separator is not None and self._log_tail:
+                    if self._log_tail[-len(content_separator):] != content_separator:
+                        string = content_separator + string
+                        content_separator = None
+                self._log_file.write(string)
+                self._log_tail = (self._log_tail + string)[-16:]
+        finally:
+            self._log_lock.release()
+
+        self.queue.put((string, content_separator, event))
+        sublime.set_timeout(self._process_queue, 1)
+
+    def flush_log(self):
+        """
+        Ensures all output written so far is present in the file at
+        self.log_path
+        """
+
+        self._log_lock.acquire()
+        try:
+            if self._log_file:
+                self._log_file.flush()
+        finally:
+            self._log_lock.release()
+
+    def discard(self):
+        """
+        Throws away all data that has been queued but not yet written to the
+        output panel. Any events attached to the data are set.
+
+        :return:
+            An integer of the number of bytes that were discarded
+        """
+
+        discarded = 0
+        try:
+            while True:
+                chars, _, event = self.queue.get(False)
+                discarded += len(chars.encode('utf-8'))
+                if event:
+                    event.set()
+        except (queue.Empty):
+            pass
+        return discarded
+
+    def _process_queue(self):
+        """
+        A callback that is run in the UI thread to actually perform writes to
+        the output panel. Reads from the queue until it is empty, combining all
+        of the data into a single edit to reduce the work performed by the
+        text and syntax highlighting engines.
+        """
+
+        chars = ''
+        events = []
+        try:
+            while True:
+                string, content_separator, event = self.queue.get(False)
+
+                if content_separator is not None:
+                    if chars:
+                        if chars[-len(content_separator):] != content_separator:
+                            string = content_separator + string
+                    elif self.panel.size() > 0:
+                        end = self.panel.size()
+                        start = end - len(content_separator)
+                        if self.panel.substr(sublime.Region(start, end)) != content_separator:
+                            string = content_separator + string
+
+                chars += string
+                if event:
+                    events.append(event)
+
+        except (queue.Empty):
+            pass
+
+        if chars:
+            # In Sublime Text 2, the "insert" command does not handle newlines
+            if sys.version_info < (3,):
+                edit = self.panel.begin_edit('golang_panel_print', [])
+                self.panel.insert(edit, self.panel.size(), chars)
+                self.panel.end_edit(edit)
+
+            else:
+                self.panel.run_command('insert', {'characters': chars})
+
+            self._trim()
+
+            if self.plain_text_threshold and self.panel.size() > self.plain_text_threshold:
+                panel_settings = self.panel.settings()
+                if panel_settings.get('syntax') != 'Packages/Text/Plain text.tmLanguage':
+                    panel_settings.set('syntax', 'Packages/Text/Plain text.tmLanguage')
+
+        for event in events:
+            event.set()
+
+    def _trim(self):
+        """
+        Removes lines from the start of the output panel when it contains more
+        than self.max_lines lines or self.max_chars characters. To prevent
+        trimming on every write, the panel is trimmed to 75% of the limit.
+        """
+
+        size = self.panel.size()
+        num_lines = self.panel.rowcol(size)[0] + 1
+
+        trim_to = None
+        if self.max_lines and num_lines > self.max_lines:
+            line = num_lines - int(self.max_lines * 0.75)
+            trim_to = self.panel.text_point(line, 0)
+        if self.max_chars and size > self.max_chars:
+            offset = size - int(self.max_chars * 0.75)
+            point = self.panel.line(offset).begin()
+            # A single line longer than the limit is cut part way through,
+            # otherwise the panel would never be trimmed
+            if size - point > self.max_chars:
+                point = offset
+            if trim_to is None or point > trim_to:
+                trim_to = point
+        if not trim_to:
+            return
+
+        removed_lines = self.panel.rowcol(trim_to)[0]
+        # A line that was cut part way through is counted as trimmed
+        if self.panel.line(trim_to).begin() != trim_to:
+            removed_lines += 1
+        # After the first trim, the first line is the note about the trimmed
+        # output, which is replaced instead of counted
+        if self.trimmed_lines:
+            removed_lines -= 1
+        self.trimmed_lines += removed_lines
+        note = '> %d earlier lines trimmed, use "Go: Open Full Build Output" to view them\n' % self.trimmed_lines
+
+        if sys.version_info < (3,):
+            edit = self.panel.begin_edit('golang_panel_trim', [])
+            _replace_panel_start(self.panel, edit, trim_to, note)
+            self.panel.end_edit(edit)
+
+        else:
+            self.panel.run_command('golang_build_panel_trim', {'size': trim_to, 'note': note})
+
+
+class GolangBuildPanelTrimCommand(sublime_plugin.TextCommand):
+
+    """
+    Replaces the start of the output panel with a note about trimmed output.
+    Used internally by GolangPanel() on Sublime Text 3.
+    """
+
+    def run(self, edit, size, note):
+        """
+        :param edit:
+            The sublime.Edit object for the modification
+
+        :param size:
+            An integer of the number of characters to remove from the start
+            of the panel
+
+        :param note:
+            A unicode string to insert in place of the removed content
+        """
+
+        _replace_panel_start(self.view, edit, size, note)
+
+
+def _replace_panel_start(view, edit, size, note):
+    """
+    Removes content from the start of a view and inserts a note in its place
+
+    :param view:
+        The sublime.View object to modify
+
+    :param edit:
+        The sublime.Edit object for the modification
+
+    :param size:
+        An integer of the number of characters to remove
+
+    :param note:
+        A unicode string to insert at the start of the view
+    """
+
+    view.erase(edit, sublime.Region(0, size))
+    view.insert(edit, 0, note)
+
+
+class GolangBuildOpenFullOutputCommand(sublime_plugin.WindowCommand):
+
+    """
+    Opens the file containing the complete output of the last build, for when
+    the output panel has been trimmed
+    """
+
+    def run(self):
+        panel = _PANELS.get(self.window.id())
+        if not panel or not panel.log_path:
+            return
+        panel.flush_log()
+        self.window.open_file(panel.log_path)
+
+    def is_enabled(self):
+        panel = _PANELS.get(self.window.id())
+        return bool(panel and panel.log_path and os.path.exists(panel.log_path))
+
+
+class GolangDiagnostics():
+
+    """
+    An index of the diagnostics - compiler errors, vet warnings and test
+    failures - parsed from the output of the builds run in a window. Used to
+    display annotations in views and to navigate between errors without
+    scanning the output panel.
+    """
+
+    # A unicode string of the key used for regions and phantoms in views
+    key = 'golang_build.diagnostics'
+
+    # A unicode string of the scope used to color the regions in views
+    scope = 'invalid'
+
+    # A unicode string of the gutter icon for regions in views
+    icon = 'dot'
+
+    # A unicode string of the minihtml color variable for phantoms
+    color = 'redish'
+
+    # A boolean - if phantoms with the messages should be displayed in views
+    show_phantoms = True
+
+    # A boolean - if output of diagnostics that were present in the previous
+    # run of the same task should be hidden
+    only_new = False
+
+    # A dict with keys that are normalized file paths and values that are
+    # dicts mapping line numbers to a list of (column, message) tuples
+    files = None
+
+    # A list of (file path, line, column) tuples in the order they were
+    # added, used for navigation
+    ordered = None
+
+    # An integer of the index in self.ordered of the diagnostic last
+    # navigated to
+    position = -1
+
+    # A threading.Lock() protecting all of the above
+    lock = None
+
+    # A set of normalized file paths that have changed since the views were
+    # last updated, and a boolean if an update is scheduled
+    _dirty = None
+    _update_scheduled = False
+
+    # An integer of the sublime.Window.id() the diagnostics are displayed in
+    window_id = None
+
+    # The sublime.Window object the diagnostics are displayed in
+    _window = None
+
+    def __init__(self, window):
+        """
+        :param window:
+            The sublime.Window object the diagnostics are displayed in
+        """
+
+        self._window = window
+        self.window_id = window.id()
+        self.lock = threading.Lock()
+        self.files = {}
+        self.ordered = []
+        self._dirty = set()
+
+    def clear(self, directory=None):
+        """
+        Removes diagnostics, along with their annotations in views
+
+        :param directory:
+            None to remove all diagnostics, otherwise a unicode string of the
+            directory of the package to remove the diagnostics of
+        """
+
+        self.lock.acquire()
+        try:
+            if directory is None:
+                self._dirty.update(self.files.keys())
+                self.files = {}
+                self.ordered = []
+            else:
+                directory = _normalize_path(directory)
+                for normalized in list(self.files.keys()):
+                    if os.path.dirname(normalized) == directory:
+                        self._dirty.add(normalized)
+                        del self.files[normalized]
+                self.ordered = [
+                    location for location in self.ordered
+                    if os.path.dirname(_normalize_path(location[0])) != directory
+                ]
+            self.position = -1
+        finally:
+            self.lock.release()
+        self._schedule_update()
+
+    def add(self, file_path, line, column, message):
+        """
+        Adds a diagnostic to the index and schedules the annotations for the
+        file to be updated
+
+        :param file_path:
+            A unicode string of the absolute path to the file
+
+        :param line:
+            An integer of the line number, starting at 1
+
+        :param column:
+            None or an integer of the column, starting at 1
+
+        :param message:
+            A unicode string of the message
+        """
+
+        normalized = _normalize_path(file_path)
+        self.lock.acquire()
+        try:
+            lines = self.files.setdefault(normalized, {})
+            lines.setdefault(line, []).append((column, message))
+            self.ordered.append((file_path, line, column))
+            self._dirty.add(normalized)
+        finally:
+            self.lock.release()
+        self._schedule_update()
+
+    def lookup(self, file_path):
+        """
+        Returns the diagnostics for a file
+
+        :param file_path:
+            A unicode string of the path to the file
+
+        :return:
+            A dict mapping line numbers to a list of (column, message) tuples
+        """
+
+        self.lock.acquire()
+        try:
+            return dict(self.files.get(_normalize_path(file_path), {}))
+        finally:
+            self.lock.release()
+
+    def navigate(self, step):
+        """
+        Moves the current position in the list of diagnostics
+
+        :param step:
+            An integer of 1 to move forward, or -1 to move backward
+
+        :return:
+            None if there are no diagnostics, otherwise a (file path, line,
+            column) tuple
+        """
+
+        self.lock.acquire()
+        try:
+            if not self.ordered:
+                return None
+            if self.position == -1 and step < 0:
+                self.position = 0
+            self.position = (self.position + step) % len(self.ordered)
+            return self.ordered[self.position]
+        finally:
+            self.lock.release()
+
+    def render(self, view):
+        """
+        Displays the annotations for a view. MUST BE CALLED IN THE UI THREAD.
+
+        :param view:
+            The sublime.View object to update
+        """
+
+        if not view.file_name():
+            return
+
+        lines = self.lookup(view.file_name())
+
+        regions = []
+        phantoms = []
+        for line in sorted(lines.keys()):
+            region = view.line(view.text_point(line - 1, 0))
+            regions.append(region)
+            if self.show_phantoms and _PHANTOMS_SUPPORTED:
+                content = '<br>'.join([_html_escape(message) for _, message in lines[line]])
+                phantoms.append(sublime.Phantom(
+                    sublime.Region(region.end()),
+                    _PHANTOM_TEMPLATE % (self.color, content),
+                    sublime.LAYOUT_BELOW
+                ))
+
+        view.add_regions(self.key, regions, self.scope, self.icon, _ANNOTATION_FLAGS)
+
+        if _PHANTOMS_SUPPORTED:
+            phantom_key = (view.id(), self.key)
+            if phantom_key not in _PHANTOM_SETS:
+                if not phantoms:
+                    return
+                _PHANTOM_SETS[phantom_key] = sublime.PhantomSet(view, self.key)
+            _PHANTOM_SETS[phantom_key].update(phantoms)
+
+    def _schedule_update(self):
+        """
+        Schedules an update of the views for all changed files, coalescing
+        multiple changes into a single callback in the UI thread
+        """
+
+        self.lock.acquire()
+        try:
+            if self._update_scheduled:
+                return
+            self._update_scheduled = True
+        finally:
+            self.lock.release()
+        sublime.set_timeout(self._update_views, 50)
+
+    def _update_views(self):
+        """
+        Updates the annotations in open views of the files that have changed.
+        RUNS IN THE UI THREAD.
+        """
+
+        self.lock.acquire()
+        try:
+            dirty = self._dirty
+            self._dirty = set()
+            self._update_scheduled = False
+        finally:
+            self.lock.release()
+
+        for view in self._window.views():
+            file_name = view.file_name()
+            if file_name and _normalize_path(file_name) in dirty:
+                self.render(view)
+
+
+class GolangOptimizations(GolangDiagnostics):
+
+    """
+    An index of the inlining and escape analysis decisions reported by the
+    compiler when run with "-gcflags=-m -m", displayed as gutter icons
+    """
+
+    key = 'golang_build.optimizations'
+    scope = 'comment'
+    icon = 'circle'
+    color = 'bluish'
+    show_phantoms = False
+
+
+class GolangOptimizationHandler():
+
+    """
+    A GolangProcessPrinter() handler that parses the optimization decisions
+    from compiler output as it streams and adds them to a
+    GolangOptimizations() index. The decisions for the files of the package
+    being built are replaced on each run.
+    """
+
+    # The GolangOptimizations() object to add the decisions to
+    optimizations = None
+
+    # A unicode string of the directory relative paths are resolved against
+    cwd = None
+
+    # A dict mapping kinds of decisions to the number found
+    counts = None
+
+    # A unicode string of output that does not yet end in a newline
+    _partial = ''
+
+    # A set of (file path, line, column, message) tuples already added
+    _seen = None
+
+    def __init__(self, optimizations, cwd):
+        """
+        :param optimizations:
+            The GolangOptimizations() object to add the decisions to
+
+        :param cwd:
+            A unicode string of the directory of the package being built
+        """
+
+        self.optimizations = optimizations
+        self.cwd = cwd
+        self.counts = {}
+        self._seen = set()
+        self.optimizations.clear(cwd)
+
+    def feed(self, output):
+        """
+        Parses optimization decisions from output of the compiler
+
+        :param output:
+            A unicode string of output
+        """
+
+        data = self._partial + output
+        lines = data.split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+
+    def finish(self, proc):
+        """
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of a summary of the decisions found
+        """
+
+        self._parse_line(self._partial)
+        self._partial = ''
+        if not self.counts:
+            return ''
+        return '> Optimizations: %s\n' % ', '.join(
+            '%d %s' % (self.counts[kind], kind) for kind in sorted(self.counts.keys())
+        )
+
+    def _parse_line(self, line):
+        """
+        Adds the optimization decision in a line of output, if any, to the
+        index
+
+        :param line:
+            A unicode string of a line of output
+        """
+
+        match = _DIAGNOSTIC_RE.match(line.rstrip('\r'))
+        if not match:
+            return
+        file_path, line_num, column, message = match.groups()
+
+        # The detailed explanations from "-m -m" are indented
+        if message.startswith('  '):
+            return
+        kind_match = _OPTIMIZATION_RE.search(message)
+        if not kind_match:
+            return
+
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(self.cwd, file_path)
+        file_path = os.path.normpath(file_path)
+
+        # With "-m -m" a decision may be reported both before and after the
+        # explanation of it
+        message = message.strip().rstrip(':')
+        if (file_path, line_num, column, message) in self._seen:
+            return
+        self._seen.add((file_path, line_num, column, message))
+
+        kind = kind_match.group(0)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.optimizations.add(
+            file_path,
+            int(line_num),
+            int(column) if column else None,
+            message
+        )
+
+
+class GolangDiagnosticParser():
+
+    """
+    Parses diagnostics from the output of a GolangProcess() as it streams and
+    adds them to a GolangDiagnostics() index. Each diagnostic is also compared
+    to those from the previous run of the same task in the same directory.
+    """
+
+    # The GolangDiagnostics() object to add the diagnostics to
+    diagnostics = None
+
+    # A unicode string of the directory relative paths are resolved against
+    cwd = None
+
+    # A boolean - if output lines of diagnostics that were present in the
+    # previous run should be removed from the output
+    only_new = False
+
+    # None if there was no previous run, otherwise a dict with fingerprint
+    # keys and values of the number of matching diagnostics from the previous
+    # run that have not yet been seen in this run
+    previous = None
+
+    # A dict mapping the fingerprints of the diagnostics from the previous run
+    # to a unicode string describing the diagnostic
+    previous_descriptions = None
+
+    # A dict with fingerprint keys and values of the number of occurrences in
+    # this run, plus a dict of fingerprints to descriptions
+    current = None
+    current_descriptions = None
+
+    # Integers of the number of new diagnostics, the number of diagnostics
+    # also present in the previous run and the number of lines not written
+    # due to self.only_new
+    new = 0
+    unchanged = 0
+    hidden = 0
+
+    # A unicode string of output that does not yet end in a newline, and an
+    # integer of the number of characters of it that have been returned from
+    # feed()
+    _partial = ''
+    _emitted = 0
+
+    # A dict mapping file paths to a list of the stripped lines of the file,
+    # used as context for fingerprints
+    _file_lines = None
+
+    def __init__(self, diagnostics, cwd, previous=None, only_new=False):
+        """
+        :param diagnostics:
+            The GolangDiagnostics() object to add the diagnostics to
+
+        :param cwd:
+            A unicode string of the working directory of the process
+
+        :param previous:
+            None, or a two-element tuple of the (current, current_descriptions)
+            attributes of the parser from the previous run
+
+        :param only_new:
+            A boolean - if output lines of diagnostics present in the previous
+            run should be removed from the output
+        """
+
+        self.diagnostics = diagnostics
+        self.cwd = cwd
+        self.only_new = only_new
+        if previous is not None:
+            self.previous = dict(previous[0])
+            self.previous_descriptions = previous[1]
+        self.current = {}
+        self.current_descriptions = {}
+        self._file_lines = {}
+
+    def feed(self, output):
+        """
+        Processes a chunk of output
+
+        :param output:
+            A unicode string of output from the process
+
+        :return:
+            A unicode string of the output to write to the panel
+        """
+
+        data = self._partial + output
+        lines = data.split('\n')
+        self._partial = lines.pop()
+
+        if not self.only_new or self.previous is None:
+            for line in lines:
+                self._parse_line(line)
+            return output
+
+        result = []
+        for line in lines:
+            unchanged = self._parse_line(line)
+            # The start of a line that was written as a partial line can not
+            # be taken back, so the rest is always written
+            if self._emitted:
+                result.append(line[self._emitted:] + '\n')
+                self._emitted = 0
+            elif unchanged:
+                self.hidden += 1
+            else:
+                result.append(line + '\n')
+
+        # Partial lines are written right away so that prompts are displayed
+        result.append(self._partial[self._emitted:])
+        self._emitted = len(self._partial)
+        return ''.join(result)
+
+    def flush(self):
+        """
+        Processes any remaining partial line once the process has finished
+        """
+
+        if self._partial:
+            self._parse_line(self._partial)
+            self._partial = ''
+            self._emitted = 0
+
+    def fixed(self):
+        """
+        :return:
+            A list of unicode strings describing the diagnostics from the
+            previous run that were not present in this run
+        """
+
+        if self.previous is None:
+            return []
+        output = []
+        for fingerprint in sorted(self.previous.keys()):
+            description = self.previous_descriptions[fingerprint]
+            output.extend([description] * self.previous[fingerprint])
+        return output
+
+    def _parse_line(self, line):
+        """
+        Adds the diagnostic in a line of output, if any, to the index
+
+        :param line:
+            A unicode string of a line of output
+
+        :return:
+            A boolean - if the line contained a diagnostic that was present in
+            the previous run
+        """
+
+        match = _DIAGNOSTIC_RE.match(line.rstrip('\r'))
+        if not match:
+            return False
+
+        file_path, line_num, column, message = match.groups()
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(self.cwd, file_path)
+        file_path = os.path.normpath(file_path)
+        if not os.path.isfile(file_path):
+            return False
+
+        line_num = int(line_num)
+        message = message.strip()
+
+        self.diagnostics.add(
+            file_path,
+            line_num,
+            int(column) if column else None,
+            message
+        )
+
+        fingerprint = self._fingerprint(file_path, line_num, message)
+        self.current[fingerprint] = self.current.get(fingerprint, 0) + 1
+        self.current_descriptions[fingerprint] = '%s: %s' % (os.path.basename(file_path), message)
+
+        if self.previous is None:
+            return False
+        if self.previous.get(fingerprint):
+            self.previous[fingerprint] -= 1
+            if not self.previous[fingerprint]:
+                del self.previous[fingerprint]
+            self.unchanged += 1
+            return True
+        self.new += 1
+        return False
+
+    def _fingerprint(self, file_path, line_num, message):
+        """
+        Constructs a value identifying a diagnostic that does not change when
+        lines are added or removed elsewhere in the file
+
+        :param file_path:
+            A unicode string of the absolute path to the file
+
+        :param line_num:
+            An integer of the line number the diagnostic is on
+
+        :param message:
+            A unicode string of the diagnostic message
+
+        :return:
+            A tuple of the normalized file path, the message with any line
+            numbers removed and the contents of the line
+        """
+
+        if file_path not in self._file_lines:
+            try:
+                with io.open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    self._file_lines[file_path] = [line.strip() for line in f]
+            except (IOError, OSError):
+                self._file_lines[file_path] = []
+
+        lines = self._file_lines[file_path]
+        context = lines[line_num - 1] if 0 < line_num <= len(lines) else ''
+        return (
+            _normalize_path(file_path),
+            _LINE_NUMBER_RE.sub(':#', message),
+            context
+        )
+
+
+class GolangBuildDiagnosticsListener(sublime_plugin.EventListener):
+
+    """
+    Displays the annotations for diagnostics when a file is opened or focused
+    """
+
+    def on_load(self, view):
+        _render_annotations(view)
+
+    def on_activated(self, view):
+        _render_annotations(view)
+
+    def on_hover(self, view, point, hover_zone):
+        """
+        Displays the messages for a line when hovering over its gutter icon,
+        on Sublime Text 3 build 3124 and newer
+        """
+
+        if hover_zone != getattr(sublime, 'HOVER_GUTTER', None):
+            return
+        window = view.window()
+        if not window or not view.file_name():
+            return
+
+        line = view.rowcol(point)[0] + 1
+        messages = []
+        for index in (_DIAGNOSTICS.get(window.id()), _OPTIMIZATIONS.get(window.id())):
+            if index:
+                messages.extend([message for _, message in index.lookup(view.file_name()).get(line, [])])
+        if not messages:
+            return
+
+        view.show_popup(
+            '<br>'.join([_html_escape(message) for message in messages]),
+            sublime.HIDE_ON_MOUSE_MOVE_AWAY,
+            point,
+            max_width=800
+        )
+
+
+def _render_annotations(view):
+    """
+    Displays all of the annotations for a view from the indexes of the
+    view's window
+
+    :param view:
+        The sublime.View object to display the annotations in
+    """
+
+    window = view.window()
+    if not window or not view.file_name():
+        return
+    diagnostics = _DIAGNOSTICS.get(window.id())
+    if diagnostics:
+        diagnostics.render(view)
+    optimizations = _OPTIMIZATIONS.get(window.id())
+    if optimizations:
+        optimizations.render(view)
+    coverage = _COVERAGE.get(window.id())
+    if coverage:
+        coverage.render(view)
+
+
+class GolangBuildNextErrorCommand(sublime_plugin.WindowCommand):
+
+    """
+    Opens the file and line of the next diagnostic from the last build
+    """
+
+    def run(self):
+        _navigate_diagnostics(self.window, 1)
+
+    def is_enabled(self):
+        diagnostics = _DIAGNOSTICS.get(self.window.id())
+        return bool(diagnostics and diagnostics.ordered)
+
+
+class GolangBuildPrevErrorCommand(sublime_plugin.WindowCommand):
+
+    """
+    Opens the file and line of the previous diagnostic from the last build
+    """
+
+    def run(self):
+        _navigate_diagnostics(self.window, -1)
+
+    def is_enabled(self):
+        diagnostics = _DIAGNOSTICS.get(self.window.id())
+        return bool(diagnostics and diagnostics.ordered)
+
+
+def _navigate_diagnostics(window, step):
+    """
+    Opens the file and line of a diagnostic relative to the current one
+
+    :param window:
+        The sublime.Window object to open the file in
+
+    :param step:
+        An integer of 1 for the next diagnostic, or -1 for the previous
+    """
+
+    diagnostics = _DIAGNOSTICS.get(window.id())
+    location = diagnostics.navigate(step) if diagnostics else None
+    if location is None:
+        sublime.status_message('Golang Build: no errors')
+        return
+
+    file_path, line, column = location
+    window.open_file(
+        '%s:%d:%d' % (file_path, line, column or 1),
+        sublime.ENCODED_POSITION
+    )
+    sublime.status_message('Golang Build: error %d of %d' % (
+        diagnostics.position + 1,
+        len(diagnostics.ordered)
+    ))
+
+
+class GolangBenchmarkHandler():
+
+    """
+    A GolangProcessPrinter() handler that parses the results of "go test
+    -bench" as they stream, stores them keyed by the git commit of the
+    working directory, and compares them to a baseline once finished
+    """
+
+    # None or a unicode string of the key of the stored results to compare
+    # against. If None, the most recent results for a different key are used.
+    baseline = None
+
+    # A dict with benchmark name keys and values that are dicts of unit to a
+    # list of float samples
+    results = None
+
+    # A unicode string of output that does not yet end in a newline
+    _partial = ''
+
+    def __init__(self, baseline=None):
+        """
+        :param baseline:
+            None or a unicode string of the key, or key prefix, of the stored
+            results to compare against
+        """
+
+        self.baseline = baseline
+        self.results = {}
+
+    def feed(self, output):
+        """
+        Parses benchmark results from output of the process
+
+        :param output:
+            A unicode string of output
+        """
+
+        data = self._partial + output
+        lines = data.split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+
+    def finish(self, proc):
+        """
+        Stores the results and compares them to the baseline
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the comparison to display
+        """
+
+        self._parse_line(self._partial)
+        self._partial = ''
+
+        if proc.result != 'success' or not self.results:
+            return ''
+
+        key = _git_revision(proc.cwd, proc.env)
+        runs = _load_benchmark_runs(proc.cwd)
+
+        baseline = None
+        for run in reversed(runs):
+            if self.baseline is not None:
+                if run['key'].startswith(self.baseline):
+                    baseline = run
+                    break
+            elif run['key'] != key:
+                baseline = run
+                break
+        # Without results for another commit, re-running the benchmarks is
+        # compared against the previous results for the same commit
+        if baseline is None and self.baseline is None:
+            for run in runs:
+                if run['key'] == key:
+                    baseline = run
+
+        runs = [run for run in runs if run['key'] != key]
+        runs.append({'key': key, 'time': time.time(), 'results': self.results})
+        _save_benchmark_runs(proc.cwd, runs[-_BENCHMARK_RUNS_KEPT:])
+
+        if baseline is None:
+            return '> Benchmarks: results stored for %s, no baseline to compare against\n' % key
+        return _format_benchmark_comparison(baseline['key'], baseline['results'], key, self.results)
+
+    def _parse_line(self, line):
+        """
+        Records the measurements from a line of benchmark output
+
+        :param line:
+            A unicode string of a line of output
+        """
+
+        match = _BENCHMARK_RE.match(line.strip())
+        if not match:
+            return
+
+        name, measurements = match.groups()
+        benchmark = self.results.setdefault(name, {})
+        for value, unit in _BENCHMARK_MEASUREMENT_RE.findall(measurements):
+            benchmark.setdefault(unit, []).append(float(value))
+
+
+class GolangBuildBenchBaselineCommand(sublime_plugin.WindowCommand):
+
+    """
+    Prompts the user to select the stored benchmark results that new results
+    for the current package are compared against
+    """
+
+    def run(self):
+        """
+        Runs the "golang_build_bench_baseline" command - invoked by Sublime Text
+        via the command palette or sublime.Window.run_command()
+        """
+
+        working_dir = _determine_working_dir(self.window)
+        if working_dir is None:
+            return
+
+        runs = list(reversed(_load_benchmark_runs(working_dir)))
+
+        options = [['Most Recent', 'Compare against the most recent results for another commit']]
+        for run in runs:
+            options.append([
+                run['key'],
+                '%s, %d benchmarks' % (
+                    time.strftime('%Y-%m-%d %H:%M', time.localtime(run['time'])),
+                    len(run['results'])
+                )
+            ])
+
+        def on_done(index):
+            """
+            Records the user's selection
+
+            :param index:
+                The index of the option the user selected, or -1 if cancelled
+            """
+
+            if index == -1:
+                return
+            baselines = _BENCHMARK_BASELINES.setdefault(self.window.id(), {})
+            if index == 0:
+                baselines.pop(working_dir, None)
+            else:
+                baselines[working_dir] = runs[index - 1]['key']
+
+        self.window.show_quick_panel(options, on_done)
+
+
+class GolangProfileHandler():
+
+    """
+    A GolangProcessPrinter() handler that, once "go test" has written a
+    profile, runs "go tool pprof" on it and displays the top entries. Each
+    entry is formatted with its file and line first so it may be navigated to.
+    """
+
+    # A unicode string of the path to the "go" executable
+    go_bin = None
+
+    # Unicode strings of the paths to the test binary and the profile
+    binary_path = None
+    profile_path = None
+
+    # None or a unicode string of the pprof sample index to display
+    sample_index = None
+
+    # An integer of the number of entries to display
+    top = 20
+
+    def __init__(self, go_bin, binary_path, profile_path, sample_index=None, top=20):
+        """
+        :param go_bin:
+            A unicode string of the path to the "go" executable
+
+        :param binary_path:
+            A unicode string of the path the test binary is written to
+
+        :param profile_path:
+            A unicode string of the path the profile is written to
+
+        :param sample_index:
+            None or a unicode string of the pprof sample index to display
+
+        :param top:
+            An integer of the number of entries to display
+        """
+
+        self.go_bin = go_bin
+        self.binary_path = binary_path
+        self.profile_path = profile_path
+        self.sample_index = sample_index
+        self.top = top
+
+    def feed(self, output):
+        """
+        The output of the tests is not used
+
+        :param output:
+            A unicode string of output
+        """
+
+        pass
+
+    def finish(self, proc):
+        """
+        Runs "go tool pprof" and formats the top entries
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the section to display
+        """
+
+        if proc.result == 'cancelled' or not os.path.exists(self.profile_path):
+            return ''
+
+        args = [self.go_bin, 'tool', 'pprof', '-top', '-cum', '-lines', '-nodecount=%d' % self.top]
+        if self.sample_index:
+            args.append('-sample_index=%s' % self.sample_index)
+        args.extend([self.binary_path, self.profile_path])
+
+        returncode, output = _run_capture(args, proc.cwd, proc.env)
+        if returncode != 0:
+            return '> Profile: "go tool pprof" failed for %s\n' % self.profile_path
+
+        section = '> Profile: %s\n' % self.profile_path
+        for line in output.splitlines():
+            match = _PPROF_LINE_RE.match(line)
+            if match:
+                stats, function, file_path, line_num = match.groups()
+                section += '%s:%s: %s  %s\n' % (file_path, line_num, stats, function)
+            elif line.strip():
+                section += '>   %s\n' % line.strip()
+        return section
+
+
+def _new_profile_dir(name, window):
+    """
+    Creates a directory to write a profile and test binary to, removing the
+    oldest such directories so only a limited number are retained
+
+    :param name:
+        A unicode string to include in the directory name
+
+    :param window:
+        A sublime.Window object to use in finding project-specific settings
+
+    :return:
+        A unicode string of the path to the new directory
+    """
+
+    base_dir = _data_dir('profiles')
+    retain = _positive_int_setting('profile:retain', window) or 10
+
+    existing = sorted(os.listdir(base_dir))
+    for entry in existing[:max(len(existing) - retain + 1, 0)]:
+        shutil.rmtree(os.path.join(base_dir, entry), ignore_errors=True)
+
+    path = os.path.join(base_dir, '%s-%s' % (time.strftime('%Y%m%d-%H%M%S'), name))
+    suffix = 1
+    while os.path.exists(path + ('' if suffix == 1 else '-%d' % suffix)):
+        suffix += 1
+    path += '' if suffix == 1 else '-%d' % suffix
+    os.makedirs(path)
+    return path
+
+
+class GolangCoverage():
+
+    """
+    An index of coverage blocks from one or more coverage profiles, mapping
+    each source file to the blocks in it. Profiles are parsed as a stream and
+    merged into the index, so results from multiple packages, shards or
+    concurrent runs may be combined. Used to display covered and uncovered
+    regions in views.
+    """
+
+    # Unicode strings of the keys used for regions in views
+    covered_key = 'golang_build.coverage.covered'
+    uncovered_key = 'golang_build.coverage.uncovered'
+
+    # None or a unicode string of the coverage mode: "set", "count" or
+    # "atomic". With "set", merged counts are combined using max() instead of
+    # being added together.
+    mode = None
+
+    # A dict with keys that are normalized file paths and values that are
+    # dicts mapping (start line, start column, end line, end column) tuples
+    # to two-element lists of [number of statements, count]
+    files = None
+
+    # A threading.Lock() protecting all of the above
+    lock = None
+
+    # The sublime.Window object the coverage is displayed in
+    _window = None
+
+    def __init__(self, window):
+        """
+        :param window:
+            The sublime.Window object the coverage is displayed in
+        """
+
+        self._window = window
+        self.lock = threading.Lock()
+        self.files = {}
+
+    def clear(self):
+        """
+        Removes all coverage information, along with the regions in views
+        """
+
+        self.lock.acquire()
+        try:
+            self.files = {}
+            self.mode = None
+        finally:
+            self.lock.release()
+        sublime.set_timeout(self._update_views, 1)
+
+    def load(self, profile_path, cwd, gopaths):
+        """
+        Parses a coverage profile line-by-line and merges it into the index
+
+        :param profile_path:
+            A unicode string of the path to the coverage profile
+
+        :param cwd:
+            A unicode string of the directory used to find the go.mod file
+            when resolving module import paths
+
+        :param gopaths:
+            A list of unicode strings of the GOPATH entries used to resolve
+            import paths
+
+        :return:
+            A two-element tuple of integers, the number of blocks loaded and the
+            number of blocks for files that could not be found
+        """
+
+        resolver = _ImportPathResolver(cwd, gopaths)
+        loaded = 0
+        unresolved = 0
+
+        # Blocks are collected per file and merged into the index one file at
+        # a time, to keep the time the lock is held short
+        current_name = None
+        current_path = None
+        current_blocks = []
+
+        with io.open(profile_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if line.startswith('mode:'):
+                    self._set_mode(line[5:].strip())
+                    continue
+
+                match = _COVER_LINE_RE.match(line)
+                if not match:
+                    continue
+                name, start_line, start_col, end_line, end_col, num_stmt, count = match.groups()
+
+                if name != current_name:
+                    if current_path:
+                        self._merge(current_path, current_blocks)
+                    current_name = name
+                    current_path = resolver.resolve(name)
+                    current_blocks = []
+
+                if current_path is None:
+                    unresolved += 1
+                    continue
+
+                current_blocks.append((
+                    (int(start_line), int(start_col), int(end_line), int(end_col)),
+                    int(num_stmt),
+                    int(count)
+                ))
+                loaded += 1
+
+        if current_path:
+            self._merge(current_path, current_blocks)
+
+        sublime.set_timeout(self._update_views, 1)
+        return (loaded, unresolved)
+
+    def lookup(self, file_path):
+        """
+        Returns the coverage blocks for a file
+
+        :param file_path:
+            A unicode string of the path to the file
+
+        :return:
+            A dict mapping (start line, start column, end line, end column)
+            tuples to two-element lists of [number of statements, count]
+        """
+
+        self.lock.acquire()
+        try:
+            return dict(self.files.get(_normalize_path(file_path), {}))
+        finally:
+            self.lock.release()
+
+    def summary(self):
+        """
+        :return:
+            A three-element tuple of integers: the number of files, the number
+            of statements and the number of covered statements
+        """
+
+        total = 0
+        covered = 0
+        self.lock.acquire()
+        try:
+            for blocks in self.files.values():
+                for num_stmt, count in blocks.values():
+                    total += num_stmt
+                    if count > 0:
+                        covered += num_stmt
+            return (len(self.files), total, covered)
+        finally:
+            self.lock.release()
+
+    def render(self, view):
+        """
+        Displays the covered and uncovered regions for a view. MUST BE CALLED
+        IN THE UI THREAD.
+
+        :param view:
+            The sublime.View object to update
+        """
+
+        if not view.file_name():
+            return
+
+        covered = []
+        uncovered = []
+        for block, (num_stmt, count) in self.lookup(view.file_name()).items():
+            start_line, start_col, end_line, end_col = block
+            region = sublime.Region(
+                view.text_point(start_line - 1, start_col - 1),
+                view.text_point(end_line - 1, end_col - 1)
+            )
+            if count > 0:
+                covered.append(region)
+            else:
+                uncovered.append(region)
+
+        flags = getattr(sublime, 'DRAW_NO_OUTLINE', 0)
+        view.add_regions(self.covered_key, covered, 'markup.inserted', '', flags)
+        view.add_regions(self.uncovered_key, uncovered, 'markup.deleted', '', flags)
+
+    def _set_mode(self, mode):
+        """
+        :param mode:
+            A unicode string of the mode from a coverage profile header
+        """
+
+        self.lock.acquire()
+        try:
+            if self.mode is None or self.mode == 'set':
+                self.mode = mode
+        finally:
+            self.lock.release()
+
+    def _merge(self, file_path, blocks):
+        """
+        Merges the blocks for a file into the index
+
+        :param file_path:
+            A unicode string of the path to the file
+
+        :param blocks:
+            A list of (block tuple, number of statements, count) tuples
+        """
+
+        self.lock.acquire()
+        try:
+            existing = self.files.setdefault(_normalize_path(file_path), {})
+            use_max = self.mode == 'set'
+            for block, num_stmt, count in blocks:
+                if block not in existing:
+                    existing[block] = [num_stmt, count]
+                elif use_max:
+                    existing[block][1] = max(existing[block][1], count)
+                else:
+                    existing[block][1] += count
+        finally:
+            self.lock.release()
+
+    def _update_views(self):
+        """
+        Updates the regions in all open views. RUNS IN THE UI THREAD.
+        """
+
+        for view in self._window.views():
+            if view.file_name():
+                self.render(view)
+
+
+class _ImportPathResolver():
+
+    """
+    Resolves the import-path-based file names used in coverage profiles to
+    file paths on disk, using the GOPATH and the go.mod file of a module
+    """
+
+    # A list of unicode strings of GOPATH entries
+    gopaths = None
+
+    # None, or a two-element tuple of the unicode strings of the module path
+    # and the directory containing the go.mod file
+    module = None
+
+    # A dict mapping import path directories to resolved directories, or None
+    _cache = None
+
+    def __init__(self, cwd, gopaths):
+        """
+        :param cwd:
+            A unicode string of the directory to search for a go.mod file from
+
+        :param gopaths:
+            A list of unicode strings of the GOPATH entries
+        """
+
+        self.gopaths = gopaths
+        self.module = _find_module(cwd)
+        self._cache = {}
+
+    def resolve(self, name):
+        """
+        :param name:
+            A unicode string of the file name from a coverage profile
+
+        :return:
+            None if the file could not be found, otherwise a unicode string of
+            the path to the file
+        """
+
+        import_dir, file_name = name.rsplit('/', 1) if '/' in name else ('', name)
+        if import_dir not in self._cache:
+            self._cache[import_dir] = self._resolve_dir(import_dir)
+        resolved_dir = self._cache[import_dir]
+        if resolved_dir is None:
+            return None
+        return os.path.join(resolved_dir, file_name)
+
+    def _resolve_dir(self, import_dir):
+        """
+        :param import_dir:
+            A unicode string of the import path of a package
+
+        :return:
+            None if the package could not be found, otherwise a unicode string
+            of the directory containing it
+        """
+
+        # Packages outside of the GOPATH are prefixed with an underscore
+        if import_dir.startswith('_/') or re.match('^_[a-zA-Z]:', import_dir):
+            path = import_dir[1:]
+            if re.match('^/[a-zA-Z]:', path):
+                path = path[1:]
+            return path if os.path.isdir(path) else None
+
+        if self.module:
+            module_path, module_dir = self.module
+            if import_dir == module_path:
+                return module_dir
+            if import_dir.startswith(module_path + '/'):
+                path = os.path.join(module_dir, *import_dir[len(module_path) + 1:].split('/'))
+                if os.path.isdir(path):
+                    return path
+
+        for gopath in self.gopaths:
+            path = os.path.join(gopath, 'src', *import_dir.split('/'))
+            if os.path.isdir(path):
+                return path
+
+        return None
+
+
+def _find_module(cwd):
+    """
+    Finds the Go module containing a directory
+
+    :param cwd:
+        A unicode string of the directory to start searching from
+
+    :return:
+        None if no go.mod file was found, otherwise a two-element tuple of the
+        unicode strings of the module path and the directory containing the
+        go.mod file
+    """
+
+    path = os.path.abspath(cwd)
+    while True:
+        go_mod = os.path.join(path, 'go.mod')
+        if os.path.isfile(go_mod):
+            with io.open(go_mod, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = re.match('^\\s*module\\s+"?([^"\\s]+)"?', line)
+                    if match:
+                        return (match.group(1), path)
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+class GolangCoverageHandler():
+
+    """
+    A GolangProcessPrinter() handler that loads the coverage profile written
+    by "go test" into the window's GolangCoverage() index
+    """
+
+    # The GolangCoverage() object to load the profile into
+    coverage = None
+
+    # A unicode string of the path the coverage profile is written to
+    profile_path = None
+
+    # A boolean - if the profile should be merged with the existing coverage
+    # instead of replacing it
+    merge = False
+
+    def __init__(self, coverage, profile_path, merge=False):
+        """
+        :param coverage:
+            The GolangCoverage() object to load the profile into
+
+        :param profile_path:
+            A unicode string of the path the coverage profile is written to
+
+        :param merge:
+            A boolean - if the profile should be merged with the existing
+            coverage instead of replacing it
+        """
+
+        self.coverage = coverage
+        self.profile_path = profile_path
+        self.merge = merge
+
+    def feed(self, output):
+        """
+        The output of the tests is not used
+
+        :param output:
+            A unicode string of output
+        """
+
+        pass
+
+    def finish(self, proc):
+        """
+        Loads the coverage profile into the index
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the coverage summary to display
+        """
+
+        if proc.result == 'cancelled' or not os.path.exists(self.profile_path):
+            return ''
+
+        if not self.merge:
+            self.coverage.clear()
+        _, unresolved = self.coverage.load(
+            self.profile_path,
+            proc.cwd,
+            _env_value(proc.env, 'GOPATH').split(os.pathsep)
+        )
+        return _format_coverage_summary(self.coverage, unresolved)
+
+
+class GolangBuildCoverageLoadCommand(sublime_plugin.WindowCommand):
+
+    """
+    Loads one or more existing coverage profiles, such as those from sharded
+    test runs, merging them into the coverage displayed in the window
+    """
+
+    def run(self, paths=None):
+        """
+        Runs the "golang_build_coverage_load" command - invoked by Sublime Text
+        via the command palette or sublime.Window.run_command()
+
+        :param paths:
+            A list of unicode strings of the paths to coverage profiles,
+            instead of prompting the user
+        """
+
+        working_dir = _determine_working_dir(self.window)
+        if working_dir is None:
+            return
+
+        _, env = _get_config(
+            'go',
+            set(['GOPATH']),
+            GO_ENV_VARS - set(['GOPATH']),
+            view=self.window.active_view(),
+            window=self.window,
+        )
+        if env is None:
+            return
+
+        coverage = _get_coverage(self.window)
+        gopaths = _env_value(env, 'GOPATH').split(os.pathsep)
+
+        def _load(profile_paths):
+            """
+            Loads the profiles and displays a summary in the status bar
+
+            RUNS IN A THREAD
+
+            :param profile_paths:
+                A list of unicode strings of the paths to the profiles
+            """
+
+            unresolved = 0
+            for profile_path in profile_paths:
+                if not os.path.isfile(profile_path):
+                    sublime.set_timeout(lambda: sublime.status_message(
+                        'Golang Build: coverage profile %s not found' % profile_path
+                    ), 1)
+                    return
+                unresolved += coverage.load(profile_path, working_dir, gopaths)[1]
+            summary = _format_coverage_summary(coverage, unresolved).strip().lstrip('> ')
+            sublime.set_timeout(lambda: sublime.status_message('Golang Build: ' + summary), 1)
+
+        def on_done(paths_string):
+            """
+            Processes the user's input and loads the profiles
+
+            :param paths_string:
+                A unicode string of the profile paths, separated by the OS path
+                list separator
+            """
+
+            profile_paths = [p.strip() for p in paths_string.split(os.pathsep) if p.strip()]
+            profile_paths = [os.path.join(working_dir, p) for p in profile_paths]
+            threading.Thread(target=_load, args=(profile_paths,)).start()
+
+        if paths is not None:
+            on_done(os.pathsep.join(paths))
+            return
+
+        self.window.show_input_panel(
+            'Coverage profiles',
+            '',
+            on_done,
+            None,
+            None
+        )
+
+
+class GolangBuildCoverageClearCommand(sublime_plugin.WindowCommand):
+
+    """
+    Removes the coverage displayed in the window
+    """
+
+    def run(self):
+        coverage = _COVERAGE.get(self.window.id())
+        if coverage:
+            coverage.clear()
+
+    def is_enabled(self):
+        coverage = _COVERAGE.get(self.window.id())
+        return bool(coverage and coverage.files)
+
+
+def _format_coverage_summary(coverage, unresolved):
+    """
+    :param coverage:
+        A GolangCoverage() object
+
+    :param unresolved:
+        An integer of the number of blocks for files that could not be found
+
+    :return:
+        A unicode string of a summary of the coverage
+    """
+
+    num_files, total, covered = coverage.summary()
+    percent = covered * 100.0 / total if total else 0.0
+    output = '> Coverage: %.1f%% of %d statements in %d files' % (percent, total, num_files)
+    if unresolved:
+        output += ', %d blocks in files that could not be found' % unresolved
+    return output + '\n'
+
+
+class GolangActionGraphHandler():
+
+    """
+    A GolangProcessPrinter() handler that parses the action graph written by
+    "go build -debug-actiongraph" and displays the slowest actions and the
+    critical path through the graph. Compile times are stored for each
+    package so that regressions may be highlighted.
+    """
+
+    # A unicode string of the path the action graph is written to
+    graph_path = None
+
+    # An integer of the number of slowest actions to display
+    top = 20
+
+    def __init__(self, graph_path, top=20):
+        """
+        :param graph_path:
+            A unicode string of the path the action graph is written to
+
+        :param top:
+            An integer of the number of slowest actions to display
+        """
+
+        self.graph_path = graph_path
+        self.top = top
+
+    def feed(self, output):
+        """
+        The output of the build is not used
+
+        :param output:
+            A unicode string of output
+        """
+
+        pass
+
+    def finish(self, proc):
+        """
+        Analyzes the action graph
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the analysis to display
+        """
+
+        if proc.result == 'cancelled' or not os.path.exists(self.graph_path):
+            return ''
+
+        try:
+            with io.open(self.graph_path, 'r', encoding='utf-8') as f:
+                actions = json.load(f)
+        except (ValueError, IOError, OSError):
+            return '> Build Profile: unable to parse %s\n' % self.graph_path
+
+        durations = {}
+        start = None
+        end = None
+        for action in actions:
+            if not action.get('TimeStart') or not action.get('TimeDone'):
+                continue
+            # An action with a timestamp that can not be parsed is left out
+            # of the timings, rather than losing the whole profile
+            try:
+                action_start = _parse_rfc3339(action['TimeStart'])
+                action_end = _parse_rfc3339(action['TimeDone'])
+            except (ValueError):
+                continue
+            durations[action['ID']] = max(action_end - action_start, 0.0)
+            start = action_start if start is None else min(start, action_start)
+            end = action_end if end is None else max(end, action_end)
+
+        if not durations:
+            return ''
+
+        by_id = dict((action['ID'], action) for action in actions)
+
+        # The longest path by duration ending at each action, computed in
+        # dependency order. Deps always have higher IDs than their
+        # dependents, but a memoized traversal does not rely on that.
+        longest = {}
+        for action_id in sorted(by_id.keys(), reverse=True):
+            stack = [action_id]
+            while stack:
+                current = stack[-1]
+                if current in longest:
+                    stack.pop()
+                    continue
+                pending = [dep for dep in by_id[current].get('Deps') or [] if dep not in longest]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                best_dep = None
+                best_length = 0.0
+                for dep in by_id[current].get('Deps') or []:
+                    if longest[dep][0] > best_length:
+                        best_dep = dep
+                        best_length = longest[dep][0]
+                longest[current] = (best_length + durations.get(current, 0.0), best_dep)
+                stack.pop()
+
+        output = '> Build Profile: %0.3fs wall time, %d actions\n' % (end - start, len(actions))
+
+        compiled = []
+        for action in actions:
+            if action['Mode'] in set(['build', 'link']) and action.get('Cmd'):
+                compiled.append((durations.get(action['ID'], 0.0), action['Mode'], action['Package']))
+        compiled.sort(reverse=True)
+
+        history = _load_build_times(proc.cwd)
+        output += '>   Slowest actions:\n'
+        for duration, mode, package in compiled[:self.top]:
+            line = '>     %8.3fs  %-5s  %s' % (duration, mode, package)
+            previous = history.get('%s %s' % (mode, package))
+            if previous:
+                median = sorted(previous)[len(previous) // 2]
+                if median > 0 and duration > median * 1.25 and duration - median > 0.05:
+                    line += '  (+%.0f%% vs median %0.3fs)' % ((duration - median) / median * 100, median)
+            output += line + '\n'
+        if not compiled:
+            output += '>     No packages were compiled, use the -a flag to rebuild all packages\n'
+
+        root = max(longest.keys(), key=lambda action_id: longest[action_id][0])
+        output += '>   Critical path: %0.3fs\n' % longest[root][0]
+        path = []
+        current = root
+        while current is not None:
+            path.append(current)
+            current = longest[current][1]
+        for action_id in reversed(path):
+            action = by_id[action_id]
+            if durations.get(action_id, 0.0) < 0.001 and not action.get('Cmd'):
+                continue
+            output += '>     %8.3fs  %-5s  %s\n' % (
+                durations.get(action_id, 0.0),
+                action['Mode'],
+                action['Package'] or '-'
+            )
+
+        for duration, mode, package in compiled:
+            key = '%s %s' % (mode, package)
+            history[key] = (history.get(key, []) + [duration])[-_BUILD_TIMES_KEPT:]
+        _save_build_times(proc.cwd, history)
+
+        return output
+
+
+def _parse_rfc3339(value):
+    """
+    Parses an RFC 3339 timestamp, as written by Go, with up to nanosecond
+    precision
+
+    :param value:
+        A unicode string such as "2016-01-02T15:04:05.999999999Z" or
+        "2016-01-02T15:04:05.9+07:00"
+
+    :return:
+        A float of the unix timestamp
+    """
+
+    match = re.match(
+        '^(\\d{4})-(\\d{2})-(\\d{2})T(\\d{2}):(\\d{2}):(\\d{2})(\\.\\d+)?(Z|([+-])(\\d{2}):(\\d{2}))$',
+        value
+    )
+    if not match:
+        raise ValueError('Invalid timestamp %s' % value)
+    parts = match.groups()
+    timestamp = calendar.timegm(tuple(int(part) for part in parts[0:6]))
+    if parts[6]:
+        timestamp += float(parts[6])
+    if parts[7] != 'Z':
+        offset = int(parts[9]) * 3600 + int(parts[10]) * 60
+        timestamp -= offset if parts[8] == '+' else -offset
+    return timestamp
+
+
+def _load_build_times(cwd):
+    """
+    Loads the stored compile and link times for builds run in a directory
+
+    :param cwd:
+        A unicode string of the directory the builds were run in
+
+    :return:
+        A dict with keys of the action mode and package, separated by a space,
+        and values that are lists of floats of the durations, oldest first
+    """
+
+    path = _build_times_path(cwd)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with io.open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, IOError, OSError):
+        return {}
+
+
+def _save_build_times(cwd, times):
+    """
+    Stores the compile and link times for builds run in a directory
+
+    :param cwd:
+        A unicode string of the directory the builds were run in
+
+    :param times:
+        A dict in the format returned by _load_build_times()
+    """
+
+    with io.open(_build_times_path(cwd), 'w', encoding='utf-8') as f:
+        f.write(str_cls(json.dumps(times)))
+
+
+def _build_times_path(cwd):
+    """
+    :param cwd:
+        A unicode string of the directory the builds were run in
+
+    :return:
+        A unicode string of the path to the file the build times are stored in
+    """
+
+    digest = hashlib.sha1(_normalize_path(cwd).encode('utf-8')).hexdigest()
+    return os.path.join(_data_dir('build-times'), '%s.json' % digest)
+
+
+class GolangBinarySizeHandler():
+
+    """
+    A GolangProcessPrinter() handler that, once "go build" or "go install" has
+    finished, runs "go tool nm -size" on the binaries that were produced and
+    displays the size contributed by each package, along with the change since
+    the previous build of the same binary
+    """
+
+    # A unicode string of the path to the "go" executable
+    go_bin = None
+
+    # A unicode string of "build" or "install"
+    task = None
+
+    # A list of unicode strings of the flags passed to the go tool
+    flags = None
+
+    # An integer of the number of packages to display
+    top = 20
+
+    def __init__(self, go_bin, task, flags, top=20):
+        """
+        :param go_bin:
+            A unicode string of the path to the "go" executable
+
+        :param task:
+            A unicode string of "build" or "install"
+
+        :param flags:
+            A list of unicode strings of the flags passed to the go tool
+
+        :param top:
+            An integer of the number of packages to display
+        """
+
+        self.go_bin = go_bin
+        self.task = task
+        self.flags = flags if isinstance(flags, list) else []
+        self.top = top
+
+    def feed(self, output):
+        """
+        The output of the build is not used
+
+        :param output:
+            A unicode string of output
+        """
+
+        pass
+
+    def finish(self, proc):
+        """
+        Measures the binaries that were produced
+
+        :param proc:
+            The GolangProcess() that has finished
+
+        :return:
+            A unicode string of the section to display
+        """
+
+        if proc.result != 'success':
+            return ''
+
+        output = ''
+        for binary_path in _built_binaries(self.go_bin, self.task, self.flags, proc.cwd, proc.env):
+            if not os.path.isfile(binary_path):
+                continue
+            sizes = _binary_package_sizes(self.go_bin, binary_path, proc.cwd, proc.env)
+            if sizes is None:
+                output += (
+                    '> Binary Size: "go tool nm" failed for %s, which may have been linked with -ldflags=-s\n'
+                ) % binary_path
+                continue
+
+            store_path = os.path.join(
+                _data_dir('binary-sizes'),
+                '%s.json' % hashlib.sha1(_normalize_path(binary_path).encode('utf-8')).hexdigest()
+            )
+            previous = None
+            if os.path.exists(store_path):
+                try:
+                    with io.open(store_path, 'r', encoding='utf-8') as f:
+                        previous = json.load(f)
+                except (ValueError, IOError, OSError):
+                    pass
+            with io.open(store_path, 'w', encoding='utf-8') as f:
+                f.write(str_cls(json.dumps(sizes)))
+
+            output += _format_binary_sizes(binary_path, sizes, previous, self.top)
+        return output
+
+
+def _built_binaries(go_bin, task, flags, cwd, env):
+    """
+    Determines the paths of the executables written by "go build" or
+    "go install"
+
+    :param go_bin:
+        A unicode string of the path to the "go" executable
+
+    :param task:
+        A unicode string of "build" or "install"
+
+    :param flags:
+        A list of unicode strings of the flags passed to the go tool
+
+    :param cwd:
+        A unicode string of the directory the build was run in
+
+    :param env:
+        A dict of the environment variables the build was run with
+
+    :return:
+        A list of unicode strings of the paths of the executables
+    """
+
+    options, output, packages = _split_build_flags(flags)
+
+    returncode, stdout = _run_capture(
+        [go_bin, 'list', '-f', '{{if eq .Name "main"}}{{.Target}}{{end}}'] + options + packages,
+        cwd,
+        env
+    )
+    if returncode != 0:
+        return []
+    targets = [line.strip() for line in stdout.splitlines() if line.strip()]
+
+    if task == 'install':
+        return targets
+
+    if output is not None:
+        output = os.path.join(cwd, output)
+        if os.path.isdir(output) or output.endswith(os.sep) or output.endswith('/'):
+            return [os.path.join(output, os.path.basename(target)) for target in targets]
+        return [output] if len(targets) == 1 else []
+
+    # Without -o, "go build" only writes an executable for a single package
+    if len(packages) > 1 or len(targets) != 1:
+        return []
+    return [os.path.join(cwd, os.path.basename(targets[0]))]
+
+
+def _split_build_flags(flags):
+    """
+    Splits the flags for "go build" into options, the value of -o and the
+    packages being built
+
+    :param flags:
+        A list of unicode strings of the flags passed to the go tool
+
+    :return:
+        A three-element tuple of (list of unicode string options other than
+        -o, None or a unicode string of the -o value, list of unicode string
+        package paths)
+    """
+
+    options = []
+    output = None
+    index = 0
+    while index < len(flags):
+        flag = flags[index]
+        if flag == '--':
+            index += 1
+            break
+        if not flag.startswith('-'):
+            break
+        name = flag.lstrip('-')
+        value = None
+        if '=' in name:
+            name, value = name.split('=', 1)
+        elif name not in _BOOLEAN_BUILD_FLAGS and index + 1 < len(flags):
+            index += 1
+            value = flags[index]
+        if name == 'o':
+            output = value
+        elif value is not None:
+            options.append('-%s=%s' % (name, value))
+        else:
+            options.append(flag)
+        index += 1
+    return (options, output, flags[index:])
+
+
+def _binary_package_sizes(go_bin, binary_path, cwd, env):
+    """
+    Runs "go tool nm -size" on a binary and totals the size of the symbols
+    for each package. The output is processed one line at a time so that
+    large binaries do not need to be held in memory.
+
+    :param go_bin:
+        A unicode string of the path to the "go" executable
+
+    :param binary_path:
+        A unicode string of the path to the binary
+
+    :param cwd:
+        A unicode string of the working directory for "go tool nm"
+
+    :param env:
+        A dict of environment variables for "go tool nm"
+
+    :return:
+        None if "go tool nm" failed, otherwise a dict with the keys "total",
+        "symbols" and "packages", the last being a dict of unicode string
+        package names to integer sizes in bytes
+    """
+
+    startupinfo = None
+    if sys.platform == 'win32':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+    args = [go_bin, 'tool', 'nm', '-size', '-sort', 'size', binary_path]
+    devnull = open(os.devnull, 'wb')
+    _count_subprocess(args, 1)
+    try:
+        try:
+            proc = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=devnull,
+                cwd=cwd,
+                env=env,
+                startupinfo=startupinfo
+            )
+        except (OSError):
+            return None
+
+        total = 0
+        symbols = 0
+        packages = {}
+        known = set()
+        for line in iter(proc.stdout.readline, b''):
+            parts = line.decode('utf-8', 'replace').split(None, 3)
+            # Undefined symbols have no address
+            if len(parts) == 3:
+                parts.insert(0, '')
+            if len(parts) != 4 or not parts[1].isdigit():
+                continue
+            # Uninitialized data does not take up space in the binary
+            if parts[2] in set(['B', 'b', 'U']):
+                continue
+            size = int(parts[1])
+            package = _symbol_package(parts[3].rstrip(), known)
+            packages[package] = packages.get(package, 0) + size
+            total += size
+            symbols += 1
+        proc.stdout.close()
+        if proc.wait() != 0:
+            return None
+    finally:
+        devnull.close()
+        _count_subprocess(args, -1)
+
+    return {'total': total, 'symbols': symbols, 'packages': packages}
+
+
+def _symbol_package(name, known=None):
+    """
+    Determines the package a symbol from "go tool nm" belongs to
+
+    :param name:
+        A unicode string of the symbol name, such as "net/http.(*Server).Serve",
+        "type:*os.File" or "go:itab.*os.File,io.Writer"
+
+    :param known:
+        None or a set of unicode strings of package paths containing a "." in
+        their last element, such as "gopkg.in/yaml.v2". Packages found in
+        escaped symbol names are added to it, and it is used to find the
+        package of symbols where the "." is not escaped.
+
+    :return:
+        A unicode string of the package name
+    """
+
+    if name.startswith('go:') or name.startswith('go.'):
+        return 'go:' + name[3:].split('.', 1)[0]
+    if name.startswith('type:') or name.startswith('type.'):
+        name = name[5:]
+    name = name.lstrip('*[]')
+
+    # Receivers and type parameters may contain other package paths
+    end = len(name)
+    for char in '([':
+        position = name.find(char)
+        if position > 0:
+            end = min(end, position)
+    slash = name.rfind('/', 0, end)
+    dot = name.find('.', slash + 1, end)
+    if dot <= 0:
+        return '(other)'
+    package = name[:dot]
+
+    # The linker escapes "." in the last element of a package path as "%2e",
+    # so the first "." is the end of the package
+    if '%' in package:
+        package = _unescape_symbol_path(package)
+        if known is not None and '.' in package[package.rfind('/') + 1:]:
+            known.add(package)
+        return package
+
+    for path in known or ():
+        if len(path) > len(package) and name.startswith(path + '.'):
+            return path
+    # Versioned import paths, as used by gopkg.in, for symbols where the "."
+    # was not escaped. These always have a "/" before the version.
+    match = re.match('v\\d+\\.', name[dot + 1:end])
+    if match and slash > 0:
+        return name[:dot + match.end()]
+    return package
+
+
+def _unescape_symbol_path(path):
+    """
+    Reverses the escaping the linker applies to package paths in symbol names
+
+    :param path:
+        A unicode string of the escaped package path, such as
+        "gopkg.in/yaml%2ev2"
+
+    :return:
+        A unicode string of the package path
+    """
+
+    def _unescape(match):
+        data = bytearray([int(code, 16) for code in match.group(0).split('%')[1:]])
+        return data.decode('utf-8', 'replace')
+
+    return re.sub('(?:%[0-9a-fA-F]{2})+', _unescape, path)
+
+
+def _format_binary_sizes(binary_path, sizes, previous, top):
+    """
+    Formats the package sizes of a binary for display
+
+    :param binary_path:
+        A unicode string of the path to the binary
+
+    :param sizes:
+        A dict in the format returned by _binary_package_sizes()
+
+    :param previous:
+        None or a dict of the sizes from the previous build of the binary
+
+    :param top:
+        An integer of the number of packages to display
+
+    :return:
+        A unicode string of the section to display
+    """
+
+    total = sizes['total']
+    output = '> Binary Size: %s: %s in %d symbols' % (binary_path, _format_bytes(total), sizes['symbols'])
+    old_packages = {}
+    if previous:
+        old_packages = previous.get('packages', {})
+        output += ' (%s since the previous build)' % _format_bytes(total - previous.get('total', 0), True)
+    output += '\n>   Largest packages:\n'
+
+    packages = sorted(sizes['packages'].items(), key=lambda item: (-item[1], item[0]))
+    for package, size in packages[:top]:
+        line = '>     %10s  %5.1f%%  %s' % (_format_bytes(size), size * 100.0 / max(total, 1), package)
+        if previous and package not in old_packages:
+            line += '  (new)'
+        elif previous and size != old_packages[package]:
+            line += '  (%s)' % _format_bytes(size - old_packages[package], True)
+        output += line + '\n'
+
+    if previous:
+        changes = []
+        for package in set(sizes['packages'].keys()) | set(old_packages.keys()):
+            delta = sizes['packages'].get(package, 0) - old_packages.get(package, 0)
+            if delta != 0:
+                changes.append((-abs(delta), package, delta))
+        changes.sort()
+        if changes:
+            output += '>   Largest changes:\n'
+        for _, package, delta in changes[:top]:
+            note = ''
+            if package not in old_packages:
+                note = '  (new)'
+            elif package not in sizes['packages']:
+                note = '  (removed)'
+            output += '>     %10s  %s%s\n' % (_format_bytes(delta, True), package, note)
+    return output
+
+
+def _format_bytes(size, signed=False):
+    """
+    Formats a number of bytes for display
+
+    :param size:
+        An integer of the number of bytes
+
+    :param signed:
+        If a "+" should be prefixed to positive numbers
+
+    :return:
+        A unicode string such as "1.5 MB"
+    """
+
+    sign = ''
+    if size < 0:
+        sign = '-'
+    elif signed:
+        sign = '+'
+    size = abs(size)
+    if size < 1024:
+        return '%s%d B' % (sign, size)
+    for unit in ['KB', 'MB']:
+        size /= 1024.0
+        if size < 1024:
+            return '%s%0.1f %s' % (sign, size, unit)
+    return '%s%0.1f GB' % (sign, size / 1024.0)
+
+
+def _load_benchmark_runs(cwd):
+    """
+    Loads the stored benchmark results for a directory
+
+    :param cwd:
+        A unicode string of the directory the benchmarks were run in
+
+    :return:
+        A list of dicts, oldest first, each with the keys "key", "time" and
+        "results"
+    """
+
+    path = _benchmark_store_path(cwd)
+    if not os.path.exists(path):
+        return []
+    try:
+        with io.open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, IOError, OSError):
+        return []
+
+
+def _save_benchmark_runs(cwd, runs):
+    """
+    Stores the benchmark results for a directory
+
+    :param cwd:
+        A unicode string of the directory the benchmarks were run in
+
+    :param runs:
+        A list of dicts, in the format returned by _load_benchmark_runs()
+    """
+
+    with io.open(_benchmark_store_path(cwd), 'w', encoding='utf-8') as f:
+        f.write(str_cls(json.dumps(runs)))
+
+
+def _benchmark_store_path(cwd):
+    """
+    :param cwd:
+        A unicode string of the directory the benchmarks were run in
+
+    :return:
+        A unicode string of the path to the file the results are stored in
+    """
+
+    digest = hashlib.sha1(_normalize_path(cwd).encode('utf-8')).hexdigest()
+    return os.path.join(_data_dir('benchmarks'), '%s.json' % digest)
+
+
+def _format_benchmark_comparison(old_key, old_results, new_key, new_results):
+    """
+    Formats a comparison of two sets of benchmark results, in the style of
+    benchstat
+
+    :param old_key:
+        A unicode string of the key of the baseline results
+
+    :param old_results:
+        A dict of the baseline results, in the format of
+        GolangBenchmarkHandler().results
+
+    :param new_key:
+        A unicode string of the key of the new results
+
+    :param new_results:
+        A dict of the new results
+
+    :return:
+        A unicode string of the comparison
+    """
+
+    rows = []
+    for name in sorted(new_results.keys()):
+        for unit in sorted(new_results[name].keys()):
+            new = new_results[name][unit]
+            old = old_results.get(name, {}).get(unit)
+            new_summary = _format_samples(new, unit)
+            if not old:
+                rows.append((name, unit, '', new_summary, '(no baseline)'))
+                continue
+
+            old_summary = _format_samples(old, unit)
+            old_mean = _mean(old)
+            p_value = _mann_whitney_u_test(old, new)
+            if p_value >= 0.05 or old_mean == 0:
+                delta = '~'
+            else:
+                delta = '%+.2f%%' % ((_mean(new) - old_mean) / old_mean * 100)
+            delta += ' (p=%.3f n=%d+%d)' % (p_value, len(old), len(new))
+            rows.append((name, unit, old_summary, new_summary, delta))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    output = '> Benchmarks: %s vs %s, mean \u00b1 95%% confidence interval\n' % (old_key, new_key)
+    for row in rows:
+        output += '>   %s  %s  %s  %s  %s\n' % (
+            row[0].ljust(widths[0]),
+            row[1].ljust(widths[1]),
+            row[2].rjust(widths[2]),
+            row[3].rjust(widths[3]),
+            row[4]
+        )
+    return output
+
+
+def _format_samples(samples, unit):
+    """
+    :param samples:
+        A list of floats
+
+    :param unit:
+        A unicode string of the unit of the samples, e.g. "ns/op"
+
+    :return:
+        A unicode string of the mean and confidence interval of the samples
+    """
+
+    mean = _mean(samples)
+    interval = _confidence_interval(samples)
+    if mean:
+        return '%.4g \u00b1 %.1f%%' % (mean, interval / mean * 100)
+    return '%.4g' % mean
+
+
+def _mean(samples):
+    """
+    :param samples:
+        A list of floats
+
+    :return:
+        A float of the arithmetic mean
+    """
+
+    return sum(samples) / len(samples)
+
+
+def _confidence_interval(samples):
+    """
+    Computes the half-width of the 95% confidence interval of the mean, using
+    the Student's t-distribution
+
+    :param samples:
+        A list of floats
+
+    :return:
+        A float
+    """
+
+    n = len(samples)
+    if n < 2:
+        return 0.0
+    mean = _mean(samples)
+    variance = sum((sample - mean) ** 2 for sample in samples) / (n - 1)
+    t = _T_DISTRIBUTION_975[n - 2] if n - 2 < len(_T_DISTRIBUTION_975) else 1.96
+    return t * (variance / n) ** 0.5
+
+
+def _mann_whitney_u_test(xs, ys):
+    """
+    Performs a two-sided Mann-Whitney U-test, as used by benchstat, to
+    determine if two sets of samples come from the same distribution. The
+    exact distribution of U is used for small samples without ties, otherwise
+    the normal approximation with a tie correction is used.
+
+    :param xs:
+        A list of floats
+
+    :param ys:
+        A list of floats
+
+    :return:
+        A float of the p-value
+    """
+
+    n1 = len(xs)
+    n2 = len(ys)
+    combined = sorted([(value, 0) for value in xs] + [(value, 1) for value in ys])
+
+    # Assign ranks, averaging the ranks of tied values
+    rank_sum = 0.0
+    tie_correction = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j < len(combined) and combined[j][0] == combined[i][0]:
+            j += 1
+        rank = (i + 1 + j) / 2.0
+        for k in range(i, j):
+            if combined[k][1] == 0:
+                rank_sum += rank
+        tie_correction += (j - i) ** 3 - (j - i)
+        i = j
+
+    u1 = rank_sum - n1 * (n1 + 1) / 2.0
+    u = min(u1, n1 * n2 - u1)
+
+    if tie_correction == 0 and n1 * n2 <= 400:
+        counts = _u_distribution(n1, n2)
+        total = float(sum(counts))
+        p_value = 2 * sum(counts[:int(u) + 1]) / total
+        return min(p_value, 1.0)
+
+    n = n1 + n2
+    mean_u = n1 * n2 / 2.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - mean_u) - 0.5) / variance ** 0.5
+    return min(2 * _normal_sf(max(z, 0)), 1.0)
+
+
+def _normal_sf(z):
+    """
+    Computes the survival function of the standard normal distribution
+
+    :param z:
+        A float
+
+    :return:
+        A float of the probability of a value greater than z
+    """
+
+    if hasattr(math, 'erfc'):
+        return math.erfc(z / 2 ** 0.5) / 2
+
+    # Python 2.6 on Sublime Text 2 does not have math.erfc(), so the
+    # Abramowitz and Stegun approximation 26.2.17 is used
+    t = 1 / (1 + 0.2316419 * abs(z))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    p = math.exp(-z * z / 2) / (2 * math.pi) ** 0.5 * poly
+    return p if z >= 0 else 1 - p
+
+
+def _u_distribution(n1, n2):
+    """
+    Computes the number of orderings of two samples that produce each value
+    of the Mann-Whitney U statistic
 
-    def set_base_dir(self, cwd):
-        """
-        Set the directory the process is being run in, for the sake of result
-        navigation
+    :param n1:
+        An integer of the size of the first sample
 
-        :param cwd:
-            A unicode string of the working directory
-        """
+    :param n2:
+        An integer of the size of the second sample
 
-        def _update_settings():
-            self.panel.settings().set('result_base_dir', cwd)
-        sublime.set_timeout(_update_settings, 1)
+    :return:
+        A list of integers, where the index is the value of U
+    """
 
-    def write(self, string, content_separator=None, event=None):
-        """
-        Queues data to be written to the output panel. Normally this will be
-        called from a thread other than the UI thread.
+    # counts[i][j] is the distribution for samples of size i and j
+    counts = [[None] * (n2 + 1) for _ in range(n1 + 1)]
+    for i in range(n1 + 1):
+        for j in range(n2 + 1):
+            if i == 0 or j == 0:
+                counts[i][j] = [1]
+                continue
+            size = i * j + 1
+            dist = [0] * size
+            # The largest value is either from the first sample, adding j to U,
+            # or from the second sample, adding nothing
+            for u, count in enumerate(counts[i - 1][j]):
+                dist[u + j] += count
+            for u, count in enumerate(counts[i][j - 1]):
+                dist[u] += count
+            counts[i][j] = dist
+    return counts[n1][n2]
+
+
+def _git_revision(cwd, env):
+    """
+    Determines the git commit of a working directory
 
-        :param string:
-            A unicode string to write to the output panel
+    :param cwd:
+        A unicode string of the directory
 
-        :param content_separator:
-            A unicode string to prefix to the string param if there is already
-            output in the output panel. Is only prefixed if the previous number
-            of characters are not equal to this string.
+    :param env:
+        A dict of environment variables to run git with
 
-        :param event:
-            An optional threading.Event() object to set once the data has been
-            written to the output panel
-        """
+    :return:
+        A unicode string of the abbreviated commit hash. If there are
+        uncommitted changes, "-dirty-" and a hash of the changes is appended,
+        so that results from each state of the working tree are kept apart.
+        "unknown" if the directory is not part of a git repository.
+    """
 
-        self.queue.put((string, content_separator, event))
-        sublime.set_timeout(self._process_queue, 1)
+    returncode, output = _run_capture(['git', 'rev-parse', '--short', 'HEAD'], cwd, env)
+    if returncode != 0 or not output.strip():
+        return 'unknown'
+    revision = output.strip()
+    returncode, output = _run_capture(['git', 'diff', 'HEAD'], cwd, env)
+    if returncode == 0 and output.strip():
+        revision += '-dirty-' + hashlib.sha1(output.encode('utf-8')).hexdigest()[:7]
+    return revision
 
-    def _process_queue(self):
-        """
-        A callback that is run in the UI thread to actually perform writes to
-        the output panel. Reads from the queue until it is empty.
-        """
 
-        try:
-            while True:
-                chars, content_separator, event = self.queue.get(False)
+def _run_capture(args, cwd, env, merge_stderr=False):
+    """
+    Runs a short-lived helper process and captures its output
 
-                if content_separator is not None and self.panel.size() > 0:
-                    end = self.panel.size()
-                    start = end - len(content_separator)
-                    if self.panel.substr(sublime.Region(start, end)) != content_separator:
-                        chars = content_separator + chars
+    :param args:
+        A list of strings of the process path and arguments
 
-                # In Sublime Text 2, the "insert" command does not handle newlines
-                if sys.version_info < (3,):
-                    edit = self.panel.begin_edit('golang_panel_print', [])
-                    self.panel.insert(edit, self.panel.size(), chars)
-                    self.panel.end_edit(edit)
+    :param cwd:
+        A unicode string of the working directory for the process
 
-                else:
-                    self.panel.run_command('insert', {'characters': chars})
+    :param env:
+        A dict of environment variables for the process
 
-                if event:
-                    event.set()
+    :param merge_stderr:
+        If stderr should be included in the captured output
 
-        except (queue.Empty):
-            pass
+    :return:
+        A two-element tuple of (integer return code, unicode string of stdout).
+        If the executable could not be found, the return code is None.
+    """
+
+    startupinfo = None
+    if sys.platform == 'win32':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+    _count_subprocess(args, 1)
+    try:
+        try:
+            proc = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                startupinfo=startupinfo
+            )
+        except (OSError):
+            return (None, '')
+        stdout, _ = proc.communicate()
+        return (proc.returncode, stdout.decode('utf-8', 'replace'))
+    finally:
+        _count_subprocess(args, -1)
 
 
-def _run_process(task, window, args, cwd, env):
+def _run_process(task, window, args, cwd, env, handlers=None, index_diagnostics=True):
     """
     Starts a GolangProcess() and creates a GolangProcessPrinter() for it
 
@@ -1016,24 +8883,93 @@ def _run_process(task, window, args, cwd, env):
         A dict of strings (unicode for Python 3, byte string for Python 2)
         to pass to the process as the environment variables
 
+    :param handlers:
+        None or a list of handler objects for the GolangProcessPrinter()
+
+    :param index_diagnostics:
+        A boolean - if diagnostics in the output should be added to the
+        window's GolangDiagnostics() index
+
     :return:
         A GolangProcess() object
     """
 
+    proc = GolangProcess(args, cwd, env, task)
+    _print_process(window, proc, handlers, index_diagnostics)
+    return proc
+
+
+def _print_process(window, proc, handlers=None, index_diagnostics=True):
+    """
+    Creates a GolangProcessPrinter() to display the output of a process in
+    the output panel of a window
+
+    :param window:
+        A sublime.Window object of the window to display the output panel in
+
+    :param proc:
+        A GolangProcess() object, or an object with the same interface, such
+        as a GolangTestRepeater()
+
+    :param handlers:
+        None or a list of handler objects for the GolangProcessPrinter()
+
+    :param index_diagnostics:
+        A boolean - if diagnostics in the output should be added to the
+        window's GolangDiagnostics() index
+    """
+
+    _prune_windows()
+
+    task = proc.task
     panel = _get_panel(window)
 
-    proc = GolangProcess(args, cwd, env)
+    if task in _TEST_TASKS:
+        handlers = [GolangTestEventHandler(task, proc.cwd)] + (handlers or [])
+
+    timeout = _positive_int_setting('%s:timeout' % task, window)
+    idle_timeout = _positive_int_setting('%s:idle_timeout' % task, window)
+    if timeout or idle_timeout:
+        handlers = (handlers or []) + [GolangWatchdog(proc, timeout, idle_timeout)]
 
     # If there is no printer using the panel, reset it
     if panel.printer_lock.acquire(False):
         panel.reset(window)
         panel.printer_lock.release()
 
-    GolangProcessPrinter(proc, panel)
+    GolangProcessPrinter(
+        proc,
+        panel,
+        _create_output_filter(window),
+        _get_diagnostics(window) if index_diagnostics else None,
+        handlers
+    )
 
     window.run_command('show_panel', {'panel': 'output.golang_build'})
 
-    return proc
+
+def _create_output_filter(window):
+    """
+    Creates a GolangOutputFilter() based on the user's settings
+
+    :param window:
+        A sublime.Window object to use in finding project-specific settings
+
+    :return:
+        None if no output processing is enabled, otherwise a
+        GolangOutputFilter() object
+    """
+
+    fold_repeats, _ = golangconfig.setting_value(
+        'output:fold_repeats',
+        view=window.active_view(),
+        window=window
+    )
+    max_lines_per_second = _positive_int_setting('output:max_lines_per_second', window)
+
+    if not fold_repeats and not max_lines_per_second:
+        return None
+    return GolangOutputFilter(bool(fold_repeats), max_lines_per_second)
 
 
 def _set_proc(window, proc):
@@ -1085,6 +9021,214 @@ def _get_panel(window):
         _PANEL_LOCK.release()
 
 
+def _get_diagnostics(window):
+    """
+    Returns the GolangDiagnostics() object associated with a sublime.Window,
+    updated with the user's current settings. MUST BE CALLED IN THE UI THREAD.
+
+    :param window:
+        A sublime.Window object
+
+    :return:
+        A GolangDiagnostics() object
+    """
+
+    if window.id() not in _DIAGNOSTICS:
+        _DIAGNOSTICS[window.id()] = GolangDiagnostics(window)
+    diagnostics = _DIAGNOSTICS[window.id()]
+
+    show_phantoms, _ = golangconfig.setting_value(
+        'diagnostics:phantoms',
+        view=window.active_view(),
+        window=window
+    )
+    diagnostics.show_phantoms = show_phantoms is not False
+
+    only_new, _ = golangconfig.setting_value(
+        'diagnostics:only_new',
+        view=window.active_view(),
+        window=window
+    )
+    diagnostics.only_new = bool(only_new)
+    return diagnostics
+
+
+def _get_optimizations(window):
+    """
+    Returns the GolangOptimizations() object associated with a sublime.Window,
+    updated with the user's current settings. MUST BE CALLED IN THE UI THREAD.
+
+    :param window:
+        A sublime.Window object
+
+    :return:
+        A GolangOptimizations() object
+    """
+
+    if window.id() not in _OPTIMIZATIONS:
+        _OPTIMIZATIONS[window.id()] = GolangOptimizations(window)
+    optimizations = _OPTIMIZATIONS[window.id()]
+
+    show_phantoms, _ = golangconfig.setting_value(
+        'optimizations:phantoms',
+        view=window.active_view(),
+        window=window
+    )
+    optimizations.show_phantoms = bool(show_phantoms)
+    return optimizations
+
+
+def _get_coverage(window):
+    """
+    Returns the GolangCoverage() object associated with a sublime.Window
+
+    :param window:
+        A sublime.Window object
+
+    :return:
+        A GolangCoverage() object
+    """
+
+    if window.id() not in _COVERAGE:
+        _COVERAGE[window.id()] = GolangCoverage(window)
+    return _COVERAGE[window.id()]
+
+
+def _env_value(env, name):
+    """
+    Returns the value of an environment variable from a dict prepared for a
+    subprocess
+
+    :param env:
+        A dict of strings (unicode for Python 3, byte string for Python 2)
+
+    :param name:
+        A unicode string of the variable name
+
+    :return:
+        A unicode string of the value, or an empty string if not set
+    """
+
+    key = name if sys.version_info >= (3,) else name.encode('ascii')
+    value = env.get(key, '')
+    if sys.version_info < (3,):
+        value = value.decode('utf-8')
+    return value
+
+
+def _set_env_value(env, name, value):
+    """
+    Sets an environment variable in a dict prepared for a subprocess
+
+    :param env:
+        A dict of strings (unicode for Python 3, byte string for Python 2)
+
+    :param name:
+        A unicode string of the variable name
+
+    :param value:
+        A unicode string of the value
+    """
+
+    if sys.version_info < (3,):
+        env[name.encode('ascii')] = value.encode('utf-8')
+    else:
+        env[name] = value
+
+
+def _cpu_count():
+    """
+    :return:
+        An integer of the number of CPUs, or 2 if it can not be determined
+    """
+
+    # Imported here since it is only needed by a few tasks, and adds to the
+    # time taken to load the package
+    import multiprocessing
+
+    try:
+        return multiprocessing.cpu_count()
+    except (NotImplementedError):
+        return 2
+
+
+def _positive_int_setting(name, window):
+    """
+    Reads a setting that should contain a positive integer
+
+    :param name:
+        A unicode string of the setting name
+
+    :param window:
+        A sublime.Window object to use in finding project-specific settings
+
+    :return:
+        None if the setting is not set, or is not a positive integer,
+        otherwise an integer
+    """
+
+    value, _ = golangconfig.setting_value(name, view=window.active_view(), window=window)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    if value <= 0:
+        return None
+    return value
+
+
+def _data_dir(name):
+    """
+    Returns a directory the package may store data in, creating it if
+    necessary. Uses the Sublime Text cache directory when available, otherwise
+    the system temp directory.
+
+    :param name:
+        A unicode string of the name of the sub-directory
+
+    :return:
+        A unicode string of the path to the directory
+    """
+
+    if hasattr(sublime, 'cache_path'):
+        base_dir = os.path.join(sublime.cache_path(), 'Golang Build')
+    else:
+        base_dir = os.path.join(tempfile.gettempdir(), 'Golang Build')
+    path = os.path.join(base_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(path)
+    return path
+
+
+def _normalize_path(path):
+    """
+    Normalizes a file path so it may be used as a dict key
+
+    :param path:
+        A unicode string of a file path
+
+    :return:
+        A unicode string of the absolute, case-normalized path
+    """
+
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _html_escape(string):
+    """
+    Escapes a string for inclusion in minihtml
+
+    :param string:
+        A unicode string
+
+    :return:
+        A unicode string with &, <, > and " escaped
+    """
+
+    string = string.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return string.replace('"', '&quot;')
+
+
 def _format_message(string):
     """
     Takes a multi-line string and does the following:
@@ -1108,3 +9252,190 @@ def _format_message(string):
         output = re.sub('(?<=\\S)\n(?=[^ \n\t\\d\\*\\-=])', ' ', output)
 
     return output.strip()
+
+
+class GolangBuildWindowListener(sublime_plugin.EventListener):
+
+    """
+    Releases the state held for windows and views once they are closed
+    """
+
+    def on_pre_close_window(self, window):
+        """
+        Called by Sublime Text 4 before a window is closed
+        """
+
+        _release_window(window.id())
+
+    def on_close(self, view):
+        view_id = view.id()
+        for key in list(_PHANTOM_SETS.keys()):
+            if key[0] == view_id:
+                _PHANTOM_SETS.pop(key, None)
+
+        # Sublime Text 2 and 3 do not report windows closing, but do close
+        # each view of a window that is closed
+        sublime.set_timeout(_prune_windows, 1000)
+
+
+def _release_window(window_id):
+    """
+    Releases the state held for a window that has been closed, stopping any
+    process that is running for it
+
+    :param window_id:
+        An integer of the sublime.Window.id()
+    """
+
+    reloader = _RELOADERS.pop(window_id, None)
+    if reloader:
+        reloader.stop()
+
+    proc = _PROCS.pop(window_id, None)
+    if proc and not proc.finished:
+        proc.terminate()
+
+    _PANEL_LOCK.acquire()
+    try:
+        panel = _PANELS.pop(window_id, None)
+    finally:
+        _PANEL_LOCK.release()
+    if panel:
+        panel.close()
+
+    for state in (_DIAGNOSTICS, _DIAGNOSTIC_HISTORY, _OPTIMIZATIONS, _COVERAGE, _BENCHMARK_BASELINES):
+        state.pop(window_id, None)
+
+
+def _prune_windows():
+    """
+    Releases the state held for all windows that are no longer open
+    """
+
+    open_windows = set([window.id() for window in sublime.windows()])
+    tracked = set()
+    for state in (_PROCS, _PANELS, _DIAGNOSTICS, _DIAGNOSTIC_HISTORY, _OPTIMIZATIONS, _COVERAGE, _RELOADERS,
+                  _BENCHMARK_BASELINES):
+        tracked.update(state.keys())
+    for window_id in tracked - open_windows:
+        _release_window(window_id)
+
+
+class GolangBuildMemoryReportCommand(sublime_plugin.WindowCommand):
+
+    """
+    Displays the state held by the package: windows, running processes,
+    output waiting to be displayed, threads and, when tracing is enabled,
+    the lines of the package that hold the most memory
+    """
+
+    def run(self, trace=None):
+        """
+        :param trace:
+            None to report, True to start tracing allocations with
+            tracemalloc before reporting, or False to stop tracing
+        """
+
+        _prune_windows()
+
+        output = 'Golang Build Memory Report\n\n'
+        output += 'Windows: %d open, %d with build output, %d with diagnostics\n' % (
+            len(sublime.windows()),
+            len(_PANELS),
+            len(_DIAGNOSTICS)
+        )
+        output += 'Phantom sets: %d\n\n' % len(_PHANTOM_SETS)
+
+        output += 'Processes:\n'
+        running = 0
+        for window_id, proc in list(_PROCS.items()):
+            if proc and not proc.finished:
+                running += 1
+                output += '  window %s: %s (running for %0.1fs)\n' % (
+                    window_id,
+                    subprocess.list2cmdline(proc.args),
+                    time.time() - proc.started
+                )
+        for window_id, reloader in list(_RELOADERS.items()):
+            output += '  window %s: reloading %s\n' % (window_id, ' '.join(reloader.sources))
+        if not running and not _RELOADERS:
+            output += '  None\n'
+
+        output += '\nQueued output:\n'
+        for window_id, panel in list(_PANELS.items()):
+            writes = _queued(panel.queue)
+            output += '  panel of window %s: %d writes, %s\n' % (
+                window_id,
+                len(writes),
+                _format_bytes(sum([len(string.encode('utf-8')) for string, _, _ in writes]))
+            )
+        for window_id, proc in list(_PROCS.items()):
+            if proc:
+                chunks = [message for _, message in _queued(proc.output) if message]
+                output += '  process of window %s: %d chunks, %s\n' % (
+                    window_id,
+                    len(chunks),
+                    _format_bytes(sum([len(chunk.encode('utf-8')) for chunk in chunks]))
+                )
+        output += '  events: %d queued, %d output chunks dropped\n' % (
+            _EVENTS._queue.qsize(),
+            _EVENTS.dropped
+        )
+
+        output += '\nThreads: %d\n' % threading.active_count()
+
+        output += '\nAllocations:\n'
+        try:
+            import tracemalloc
+        except (ImportError):
+            tracemalloc = None
+        if tracemalloc is None:
+            output += '  tracemalloc requires Python 3.4 or newer\n'
+        else:
+            if trace is True and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            elif trace is False and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+            if not tracemalloc.is_tracing():
+                output += '  Not tracing, use Go: Memory Report (Trace Allocations) to start\n'
+            else:
+                snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, __file__)])
+                stats = snapshot.statistics('lineno')
+                for stat in stats[:15]:
+                    frame = stat.traceback[0]
+                    output += '  %s:%d: %s in %d blocks\n' % (
+                        os.path.basename(frame.filename),
+                        frame.lineno,
+                        _format_bytes(stat.size),
+                        stat.count
+                    )
+                if not stats:
+                    output += '  No allocations traced yet\n'
+
+        view = self.window.new_file()
+        view.set_name('Golang Build Memory Report')
+        view.set_scratch(True)
+        view.run_command('append', {'characters': output})
+
+
+def _queued(queue_):
+    """
+    Returns the items waiting in a queue.Queue() without removing them
+
+    :param queue_:
+        A queue.Queue() object
+
+    :return:
+        A list of the items
+    """
+
+    queue_.mutex.acquire()
+    try:
+        return list(queue_.queue)
+    finally:
+        queue_.mutex.release()
+
+
+# Recorded last, once everything in the module has been defined
+_MODULE_INITIALIZED = time.time() - _MODULE_STARTED